@@ -1,10 +1,49 @@
 #!/usr/bin/env python3
+import io
+import os
+import ast
+import sys
+import gzip
+import hashlib
 import json
+import math
+import mmap
+import queue
 import random
+import re
+import textwrap
+import time
+import uuid
+import asyncio
+import csv
+import importlib
+import inspect
+import threading
+import tracemalloc
 import requests
 from faker import Faker
 from datetime import datetime, timedelta
 import argparse
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager, redirect_stdout
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from itertools import count as counter, islice, repeat
+from math import gcd
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import numpy as np
+    import pyarrow as pa
+except ImportError:  # Only needed for --backend columnar
+    np = pa = None
+
+try:
+    import orjson
+except ImportError:  # Optional; records are encoded with json instead, several times slower
+    orjson = None
 
 # Initialize Faker
 fake = Faker()
@@ -12,206 +51,3469 @@ fake = Faker()
 # API endpoint (adjust this to your actual API endpoint)
 API_URL = "http://localhost:3000/api/individuals"  # Update with your actual API URL
 
-def generate_fake_individual():
-    """Generate fake data for all fields in the individual form"""
+# Records per seeded shard in --seed/--workers mode. Shards, not workers, own
+# the seeds, so the output only depends on --seed.
+SHARD_SIZE = 1000
+
+# Schema files whose CHECK constraints drive --strict generation and validation
+SCHEMA_FILES = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "db", "schemas", "02_individuals.sql"),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "db", "schemas", "03_families.sql"),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "supabase", "childrenSchema.sql"),
+]
+
+# Numeric district codes drawn when the schema only allows digits
+DISTRICT_CODES = 14
+
+# Generator values the database knows under another name
+VALUE_ALIASES = {"employment_status": {"with_salary": "has_salary"}}
+
+EPOCH = datetime(1970, 1, 1).date()
+
+# Categorical values shared by the record and columnar generators
+GENDERS = ["male", "female"]
+MARITAL_STATUSES = ["single", "married", "widowed"]
+EMPLOYMENT_STATUSES = ["no_salary", "with_salary", "social_support"]
+NEED_CATEGORIES = ["medical", "financial", "food", "shelter", "clothing", "education", "employment", "transportation", "other"]
+NEED_PRIORITIES = ["low", "medium", "high", "urgent"]
+MEDICAL_ASSISTANCE_TYPES = ["Medical Checkup", "Lab Tests", "X-rays/Scans", "Surgeries"]
+MEDICATION_FREQUENCIES = ["", "Monthly", "Intermittent"]
+TREATMENT_COST_ABILITIES = ["", "Able", "Unable", "Partially"]
+FOOD_ASSISTANCE_TYPES = ["Ready-made meals", "Non-ready meals"]
+EDUCATION_LEVELS = ["", "Higher Education", "Intermediate Education", "Literate", "Illiterate"]
+CHILDREN_EDUCATIONAL_NEEDS = ["Tuition Fees", "School Uniforms", "Books", "Supplies", "Tutoring"]
+HOUSING_TYPES = ["", "Owned", "New Rental", "Old Rental"]
+HOUSING_CONDITIONS = ["", "Healthy", "Moderate", "Unhealthy"]
+HOUSEHOLD_APPLIANCES = ["Stove", "Manual Washing Machine", "Automatic Washing Machine", "Refrigerator", "Fan"]
+CHILD_GENDERS = ["boy", "girl"]
+SCHOOL_STAGES = ["kindergarten", "primary", "preparatory", "secondary"]
+MEMBER_ROLES = ["spouse", "sibling", "grandparent", "other"]
+FEMALE_RELATIONS = ["wife", "sister", "mother", "mother_in_law"]
+MALE_RELATIONS = ["husband", "brother", "father", "father_in_law"]
+
+class RecordStruct:
+    """Dict-style access to the fields of a slotted record struct.
+
+    Lets code written against the plain dict records (record["id_number"],
+    record.get("children"), "table" in record) take structs unchanged.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if key not in self.__dataclass_fields__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__dataclass_fields__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.__dataclass_fields__
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.__dataclass_fields__ else default
+
+    def keys(self):
+        return self.__dataclass_fields__.keys()
+
+@dataclass(slots=True)
+class Need(RecordStruct):
+    category: str
+    priority: str
+    description: str
+    status: str
+
+@dataclass(slots=True)
+class MedicalHelp(RecordStruct):
+    type_of_medical_assistance_needed: list
+    medication_distribution_frequency: str
+    estimated_cost_of_treatment: str
+    health_insurance_coverage: bool
+    additional_details: str
+
+@dataclass(slots=True)
+class FoodAssistance(RecordStruct):
+    type_of_food_assistance_needed: list
+    food_supply_card: bool
+
+@dataclass(slots=True)
+class MarriageAssistance(RecordStruct):
+    marriage_support_needed: bool
+    wedding_contract_signed: bool
+    wedding_date: str
+    specific_needs: str
+
+@dataclass(slots=True)
+class DebtAssistance(RecordStruct):
+    needs_debt_assistance: bool
+    debt_amount: int
+    household_appliances: bool
+    hospital_bills: bool
+    education_fees: bool
+    business_debt: bool
+    other_debt: bool
+
+@dataclass(slots=True)
+class EducationAssistance(RecordStruct):
+    family_education_level: str
+    desire_for_education: str
+    children_educational_needs: list
+
+@dataclass(slots=True)
+class ShelterAssistance(RecordStruct):
+    type_of_housing: str
+    housing_condition: str
+    number_of_rooms: int
+    household_appliances: list
+
+@dataclass(slots=True)
+class Child(RecordStruct):
+    first_name: str
+    last_name: str
+    date_of_birth: str
+    gender: str
+    description: str
+    school_stage: str
+
+@dataclass(slots=True)
+class Member(RecordStruct):
+    name: str
+    date_of_birth: str
+    gender: str
+    role: str
+    job_title: str
+    phone_number: str
+    relation: str
+    id_number: str | None = None  # set by conform_individual() when the member becomes an individuals row
+
+@dataclass(slots=True)
+class Individual(RecordStruct):
+    first_name: str
+    last_name: str
+    id_number: int | str
+    date_of_birth: str
+    gender: str
+    marital_status: str
+    phone: str | None
+    district: str
+    family_id: str | None
+    new_family_name: str
+    address: str
+    description: str
+    job: str
+    employment_status: str
+    salary: int | None
+    needs: list
+    additional_members: list
+    children: list
+    medical_help: MedicalHelp
+    food_assistance: FoodAssistance
+    marriage_assistance: MarriageAssistance
+    debt_assistance: DebtAssistance
+    education_assistance: EducationAssistance
+    shelter_assistance: ShelterAssistance
+
+def record_fields(value):
+    """Encoder hook turning a record struct into a dict of its fields; nested structs go through it in turn"""
+    if isinstance(value, RecordStruct):
+        return {name: getattr(value, name) for name in value.__dataclass_fields__}
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+def encode_json(value):
+    """Compact UTF-8 JSON of a record, a table row or a list of them, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(value, default=record_fields)
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=record_fields).encode()
+
+def decode_json(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def record_encoder(fmt):
+    """The bytes encoder of an output format: MessagePack for msgpack, compact JSON otherwise"""
+    if fmt == 'msgpack':
+        msgpack = require_module('msgpack', 'msgpack output')
+        return msgpack.Packer(default=record_fields).pack
+    return encode_json
+
+def generate_fake_individual(fake=fake, rng=random, *, id_number):
+    """Generate fake data for all fields in the individual form, as an Individual struct.
+
+    `fake` and `rng` default to the module-level Faker and `random`; worker
+    processes pass their own seeded instances. `id_number` is drawn by the
+    caller from a UniqueNumbers, so ids never repeat.
+    """
     
     # Generate random date of birth (18-80 years old)
     dob = fake.date_of_birth(minimum_age=18, maximum_age=80).strftime("%Y-%m-%d")
     
     # Generate gender
-    gender = random.choice(["male", "female"])
+    gender = rng.choice(GENDERS)
     
     # Generate marital status
-    marital_status = random.choice(["single", "married", "widowed"])
+    marital_status = rng.choice(MARITAL_STATUSES)
     
     # Employment status
-    employment_status = random.choice(["no_salary", "with_salary", "social_support"])
+    employment_status = rng.choice(EMPLOYMENT_STATUSES)
     
     # Salary only if employed
     salary = None
     if employment_status == "with_salary":
-        salary = random.randint(500, 5000)
+        salary = rng.randint(500, 5000)
     
     # Generate random needs
     needs = []
-    if random.random() > 0.5:  # 50% chance to have needs
-        num_needs = random.randint(1, 3)
+    if rng.random() > 0.5:  # 50% chance to have needs
+        num_needs = rng.randint(1, 3)
         for _ in range(num_needs):
-            needs.append({
-                "category": random.choice(["medical", "financial", "food", "shelter", "clothing", "education", "employment", "transportation", "other"]),
-                "priority": random.choice(["low", "medium", "high", "urgent"]),
-                "description": fake.text(max_nb_chars=100),
-                "status": "pending"
-            })
+            needs.append(Need(
+                category=rng.choice(NEED_CATEGORIES),
+                priority=rng.choice(NEED_PRIORITIES),
+                description=fake.text(max_nb_chars=100),
+                status="pending"
+            ))
     
     # Generate medical help data
-    medical_help = {
-        "type_of_medical_assistance_needed": random.sample(["Medical Checkup", "Lab Tests", "X-rays/Scans", "Surgeries"], k=random.randint(0, 4)),
-        "medication_distribution_frequency": random.choice(["", "Monthly", "Intermittent"]),
-        "estimated_cost_of_treatment": random.choice(["", "Able", "Unable", "Partially"]),
-        "health_insurance_coverage": random.choice([True, False]),
-        "additional_details": fake.text(max_nb_chars=100) if random.random() > 0.7 else ""
-    }
+    medical_help = MedicalHelp(
+        type_of_medical_assistance_needed=rng.sample(MEDICAL_ASSISTANCE_TYPES, k=rng.randint(0, 4)),
+        medication_distribution_frequency=rng.choice(MEDICATION_FREQUENCIES),
+        estimated_cost_of_treatment=rng.choice(TREATMENT_COST_ABILITIES),
+        health_insurance_coverage=rng.choice([True, False]),
+        additional_details=fake.text(max_nb_chars=100) if rng.random() > 0.7 else ""
+    )
     
     # Generate food assistance data
-    food_assistance = {
-        "type_of_food_assistance_needed": random.sample(["Ready-made meals", "Non-ready meals"], k=random.randint(0, 2)),
-        "food_supply_card": random.choice([True, False])
-    }
+    food_assistance = FoodAssistance(
+        type_of_food_assistance_needed=rng.sample(FOOD_ASSISTANCE_TYPES, k=rng.randint(0, 2)),
+        food_supply_card=rng.choice([True, False])
+    )
     
     # Generate marriage assistance data
-    marriage_assistance = {
-        "marriage_support_needed": random.choice([True, False]),
-        "wedding_contract_signed": random.choice([True, False]),
-        "wedding_date": fake.date_this_decade().strftime("%Y-%m-%d") if random.random() > 0.5 else "",
-        "specific_needs": fake.text(max_nb_chars=100) if random.random() > 0.7 else ""
-    }
+    marriage_assistance = MarriageAssistance(
+        marriage_support_needed=rng.choice([True, False]),
+        wedding_contract_signed=rng.choice([True, False]),
+        wedding_date=fake.date_this_decade().strftime("%Y-%m-%d") if rng.random() > 0.5 else "",
+        specific_needs=fake.text(max_nb_chars=100) if rng.random() > 0.7 else ""
+    )
     
     # Generate debt assistance data
-    debt_assistance = {
-        "needs_debt_assistance": random.choice([True, False]),
-        "debt_amount": random.randint(500, 10000),
-        "household_appliances": random.choice([True, False]),
-        "hospital_bills": random.choice([True, False]),
-        "education_fees": random.choice([True, False]),
-        "business_debt": random.choice([True, False]),
-        "other_debt": random.choice([True, False])
-    }
+    debt_assistance = DebtAssistance(
+        needs_debt_assistance=rng.choice([True, False]),
+        debt_amount=rng.randint(500, 10000),
+        household_appliances=rng.choice([True, False]),
+        hospital_bills=rng.choice([True, False]),
+        education_fees=rng.choice([True, False]),
+        business_debt=rng.choice([True, False]),
+        other_debt=rng.choice([True, False])
+    )
     
     # Generate education assistance data
-    education_assistance = {
-        "family_education_level": random.choice(["", "Higher Education", "Intermediate Education", "Literate", "Illiterate"]),
-        "desire_for_education": fake.text(max_nb_chars=100) if random.random() > 0.7 else "",
-        "children_educational_needs": random.sample(["Tuition Fees", "School Uniforms", "Books", "Supplies", "Tutoring"], k=random.randint(0, 5))
-    }
+    education_assistance = EducationAssistance(
+        family_education_level=rng.choice(EDUCATION_LEVELS),
+        desire_for_education=fake.text(max_nb_chars=100) if rng.random() > 0.7 else "",
+        children_educational_needs=rng.sample(CHILDREN_EDUCATIONAL_NEEDS, k=rng.randint(0, 5))
+    )
     
     # Generate shelter assistance data
-    shelter_assistance = {
-        "type_of_housing": random.choice(["", "Owned", "New Rental", "Old Rental"]),
-        "housing_condition": random.choice(["", "Healthy", "Moderate", "Unhealthy"]),
-        "number_of_rooms": random.randint(1, 5),
-        "household_appliances": random.sample(["Stove", "Manual Washing Machine", "Automatic Washing Machine", "Refrigerator", "Fan"], k=random.randint(0, 5))
-    }
+    shelter_assistance = ShelterAssistance(
+        type_of_housing=rng.choice(HOUSING_TYPES),
+        housing_condition=rng.choice(HOUSING_CONDITIONS),
+        number_of_rooms=rng.randint(1, 5),
+        household_appliances=rng.sample(HOUSEHOLD_APPLIANCES, k=rng.randint(0, 5))
+    )
     
     # Generate children data
     children = []
-    if random.random() > 0.5:  # 50% chance to have children
-        num_children = random.randint(1, 4)
+    if rng.random() > 0.5:  # 50% chance to have children
+        num_children = rng.randint(1, 4)
         for _ in range(num_children):
             child_dob = fake.date_of_birth(minimum_age=1, maximum_age=17).strftime("%Y-%m-%d")
-            gender = random.choice(["boy", "girl"])
-            children.append({
-                "first_name": fake.first_name_male() if gender == "boy" else fake.first_name_female(),
-                "last_name": fake.last_name(),
-                "date_of_birth": child_dob,
-                "gender": gender,
-                "description": fake.text(max_nb_chars=50) if random.random() > 0.7 else "",
-                "school_stage": random.choice(["kindergarten", "primary", "preparatory", "secondary"])
-            })
+            child_gender = rng.choice(CHILD_GENDERS)
+            children.append(Child(
+                first_name=fake.first_name_male() if child_gender == "boy" else fake.first_name_female(),
+                last_name=fake.last_name(),
+                date_of_birth=child_dob,
+                gender=child_gender,
+                description=fake.text(max_nb_chars=50) if rng.random() > 0.7 else "",
+                school_stage=rng.choice(SCHOOL_STAGES)
+            ))
     
     # Generate additional members data
     additional_members = []
-    if random.random() > 0.6:  # 40% chance to have additional members
-        num_members = random.randint(1, 2)
+    if rng.random() > 0.6:  # 40% chance to have additional members
+        num_members = rng.randint(1, 2)
         for _ in range(num_members):
-            member_gender = random.choice(["male", "female"])
+            member_gender = rng.choice(GENDERS)
             relation = ""
             if member_gender == "female":
-                relation = random.choice(["wife", "sister", "mother", "mother_in_law"])
+                relation = rng.choice(FEMALE_RELATIONS)
             else:
-                relation = random.choice(["husband", "brother", "father", "father_in_law"])
+                relation = rng.choice(MALE_RELATIONS)
                 
-            additional_members.append({
-                "name": fake.name_male() if member_gender == "male" else fake.name_female(),
-                "date_of_birth": fake.date_of_birth(minimum_age=18, maximum_age=80).strftime("%Y-%m-%d"),
-                "gender": member_gender,
-                "role": random.choice(["spouse", "sibling", "grandparent", "other"]),
-                "job_title": fake.job() if random.random() > 0.5 else "",
-                "phone_number": fake.phone_number() if random.random() > 0.5 else "",
-                "relation": relation
-            })
+            additional_members.append(Member(
+                name=fake.name_male() if member_gender == "male" else fake.name_female(),
+                date_of_birth=fake.date_of_birth(minimum_age=18, maximum_age=80).strftime("%Y-%m-%d"),
+                gender=member_gender,
+                role=rng.choice(MEMBER_ROLES),
+                job_title=fake.job() if rng.random() > 0.5 else "",
+                phone_number=fake.phone_number() if rng.random() > 0.5 else "",
+                relation=relation
+            ))
 
     # Main individual data
-    individual = {
-        "first_name": fake.first_name_male() if gender == "male" else fake.first_name_female(),
-        "last_name": fake.last_name(),
-        "id_number": fake.unique.random_number(digits=10),
-        "date_of_birth": dob,
-        "gender": gender,
-        "marital_status": marital_status,
-        "phone": fake.phone_number(),
-        "district": fake.city(),
-        "family_id": None,  # Not setting a family ID as we're creating new individuals
-        "new_family_name": fake.last_name() if children and random.random() > 0.5 else "",
-        "address": fake.address(),
-        "description": fake.text(max_nb_chars=200) if random.random() > 0.7 else "",
-        "job": fake.job() if random.random() > 0.5 else "",
-        "employment_status": employment_status,
-        "salary": salary,
-        "needs": needs,
-        "additional_members": additional_members,
-        "children": children,
-        "medical_help": medical_help,
-        "food_assistance": food_assistance,
-        "marriage_assistance": marriage_assistance,
-        "debt_assistance": debt_assistance,
-        "education_assistance": education_assistance,
-        "shelter_assistance": shelter_assistance
-    }
+    individual = Individual(
+        first_name=fake.first_name_male() if gender == "male" else fake.first_name_female(),
+        last_name=fake.last_name(),
+        id_number=id_number,
+        date_of_birth=dob,
+        gender=gender,
+        marital_status=marital_status,
+        phone=fake.phone_number(),
+        district=fake.city(),
+        family_id=None,  # Not setting a family ID as we're creating new individuals
+        new_family_name=fake.last_name() if children and rng.random() > 0.5 else "",
+        address=fake.address(),
+        description=fake.text(max_nb_chars=200) if rng.random() > 0.7 else "",
+        job=fake.job() if rng.random() > 0.5 else "",
+        employment_status=employment_status,
+        salary=salary,
+        needs=needs,
+        additional_members=additional_members,
+        children=children,
+        medical_help=medical_help,
+        food_assistance=food_assistance,
+        marriage_assistance=marriage_assistance,
+        debt_assistance=debt_assistance,
+        education_assistance=education_assistance,
+        shelter_assistance=shelter_assistance
+    )
     
     return individual
 
-def submit_individual(individual_data, api_url, headers=None):
+@lru_cache(maxsize=None)
+def _permutation(key, space):
+    """Pick a seeded affine permutation (a, b) of range(space): x -> (a * x + b) % space"""
+    rng = random.Random(key)
+    a = rng.randrange(1, space)
+    while gcd(a, space) != 1:
+        a = rng.randrange(1, space)
+    return a, rng.randrange(space)
+
+def _id_permutation(seed, digits):
+    """The permutation of the `digits`-wide id_number space"""
+    return _permutation(f"{seed}:id_number", 9 * 10 ** (digits - 1))
+
+# Width of individuals.id_number, which the schema fixes with length(id_number) = 14
+ID_NUMBER_DIGITS = 14
+
+def sequence_id_number(index, seed, digits=ID_NUMBER_DIGITS):
+    """Map a global record index to a unique `digits`-wide id_number.
+
+    The map is a bijection, so distinct indices never collide and no worker
+    needs to know which ids the others have issued.
+    """
+    a, b = _id_permutation(seed, digits)
+    return 10 ** (digits - 1) + (a * index + b) % (9 * 10 ** (digits - 1))
+
+# Mobile prefixes of the phones drawn for digits-only phone columns
+MOBILE_PREFIXES = ["010", "011", "012", "015"]
+
+# Commands that draw id_numbers and phones, each from its own share of the permutation positions
+ID_STREAMS = ("records", "households", "churn", "churn_members")
+
+# Values tried per index when a taken filter is in use: its own, then spares, the first free one issued
+TAKEN_CANDIDATES = 4
+
+TAKEN_MAGIC = b"FAKETAKEN1"
+
+def taken_key(value):
+    """Digits of an id_number or phone, so '010-1234 5678' and '01012345678' match"""
+    return re.sub(r"\D", "", str(value))
+
+class BloomFilter:
+    """Set membership in a fixed bit array: no false negatives, false positives at about the sized rate"""
+
+    def __init__(self, bits, hashes, buffer):
+        self.bits = bits
+        self.hashes = hashes
+        self.buffer = buffer
+
+    @staticmethod
+    def sized(count, error_rate):
+        """An empty filter for `count` values at `error_rate` false positives"""
+        bits = max(64, int(-max(count, 1) * math.log(error_rate) / math.log(2) ** 2))
+        bits += -bits % 64
+        hashes = max(1, round(bits / max(count, 1) * math.log(2)))
+        return BloomFilter(bits, hashes, bytearray(bits // 8))
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.bits for i in range(self.hashes))
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.buffer[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self.buffer[position >> 3] >> (position & 7) & 1 for position in self._positions(key))
+
+def write_taken_filters(path, sources, error_rate=0.001):
+    """Write one Bloom filter per source, {name: (count, values)}, to a taken filter file.
+
+    Like the pool cache, the file is renamed into place once complete and is
+    memory-mapped by open_taken(), so worker processes share its pages.
+    """
+    filters = {}
+    for name, (count, values) in sources.items():
+        bloom = BloomFilter.sized(count, error_rate)
+        added = 0
+        for value in values:
+            key = taken_key(value)
+            if key:
+                bloom.add(key)
+                added += 1
+        filters[name] = (bloom, added)
+    header = {"filters": {}}
+    offset = 0
+    for name, (bloom, added) in filters.items():
+        header["filters"][name] = {"offset": offset, "bits": bloom.bits, "hashes": bloom.hashes, "count": added}
+        offset += len(bloom.buffer)
+    encoded = json.dumps(header).encode()
+    encoded += b" " * (-(len(TAKEN_MAGIC) + 4 + len(encoded)) % 8)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'wb') as f:
+        f.write(TAKEN_MAGIC)
+        f.write(len(encoded).to_bytes(4, 'little'))
+        f.write(encoded)
+        for bloom, _ in filters.values():
+            f.write(bloom.buffer)
+    os.replace(temporary, path)
+    return {name: added for name, (_, added) in filters.items()}
+
+@lru_cache(maxsize=None)
+def open_taken(path):
+    """Map a taken filter file once per process; returns {name: BloomFilter}"""
+    with open(path, 'rb') as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    start = len(TAKEN_MAGIC)
+    if data[:start] != TAKEN_MAGIC:
+        raise ValueError(f"{path} is not a taken filter file")
+    header_length = int.from_bytes(data[start:start + 4], 'little')
+    header = json.loads(data[start + 4:start + 4 + header_length])
+    body = memoryview(data)[start + 4 + header_length:]
+    return {name: BloomFilter(info["bits"], info["hashes"], body[info["offset"]:info["offset"] + info["bits"] // 8])
+            for name, info in header["filters"].items()}
+
+class UniqueNumbers:
+    """Collision-free id_numbers and phones from seeded permutations of a counter.
+
+    Index i is mapped through a bijection of the id_number (or mobile phone)
+    space, so distinct indices never share a value and nothing issued has to
+    be remembered. Callers add `offset` to their record indices, so machines
+    that share a `seed` draw disjoint values from disjoint offsets. Each
+    command draws from its own `stream` of ID_STREAMS, at permutation position
+    i * len(ID_STREAMS) + stream, so records, households and churn rows
+    generated with one seed never share a value either.
+
+    With `taken_path`, a file from the taken command, a value found in the
+    filter is replaced by one of the index's spares. The spares are positions
+    of the last three quarters of the permutation, which no index reaches, so
+    they are never issued to anyone else. A false positive only skips a free
+    value. With `phones`, assign_phones() gives records distinct mobile numbers.
+    """
+
+    def __init__(self, seed, offset=0, taken_path=None, phones=False, stream="records"):
+        self.seed = seed
+        self.offset = offset
+        self.taken_path = taken_path
+        self.phones = phones
+        self.stream = stream
+        self.candidates = TAKEN_CANDIDATES if taken_path else 1
+
+    def _draw(self, kind, index, space, render):
+        index = index * len(ID_STREAMS) + ID_STREAMS.index(self.stream)
+        if index >= space // self.candidates:
+            raise ValueError(f"The {kind} space is exhausted at index {index}")
+        a, b = _permutation(f"{self.seed}:{kind}", space)
+        value = render((a * index + b) % space)
+        if not self.taken_path:
+            return value
+        taken = open_taken(self.taken_path).get(kind)
+        spares = space // self.candidates + index * (self.candidates - 1)
+        for position in range(spares, spares + self.candidates - 1):
+            if taken is None or str(value) not in taken:
+                return value
+            value = render((a * position + b) % space)
+        if str(value) not in taken:
+            return value
+        raise ValueError(f"All {self.candidates} {kind} candidates of index {index} are taken")
+
+    def id_number(self, index, digits=ID_NUMBER_DIGITS):
+        """The `digits`-wide id_number of `index`; without a filter, sequence_id_number() of its position"""
+        return self._draw("id_number", index, 9 * 10 ** (digits - 1), lambda value: 10 ** (digits - 1) + value)
+
+    def phone(self, index):
+        """The mobile number of `index`, e.g. 01012345678"""
+        return self._draw("phone", index, len(MOBILE_PREFIXES) * 10 ** 8,
+                          lambda value: f"{MOBILE_PREFIXES[value // 10 ** 8]}{value % 10 ** 8:08d}")
+
+    def assign_member_ids(self, individual, index, digits=ID_NUMBER_DIGITS):
+        """Give the additional members of individual `index` the id_numbers of its slots 1 and 2"""
+        for slot, member in enumerate(individual["additional_members"], 1):
+            member["id_number"] = str(self.id_number(3 * index + slot, digits))
+        return individual
+
+    def assign_phones(self, individual, index):
+        """With phones on, replace the phone of individual `index` and its members' by unique ones; empty phones stay empty"""
+        if not self.phones:
+            return individual
+        if individual["phone"]:
+            individual["phone"] = self.phone(3 * index)
+        for slot, member in enumerate(individual["additional_members"], 1):
+            if member["phone_number"]:
+                member["phone_number"] = self.phone(3 * index + slot)
+        return individual
+
+_shard_fake = None
+
+def today_date():
+    """Today's date; both the columnar and record backends draw dates relative to it"""
+    return datetime.now().date()
+
+def generate_shard(seed, shard, start, count, spec=None, pool_path=None, numbers=None):
+    """Generate records [start, start + count) with Faker and random seeded from (seed, shard).
+
+    With `pool_path`, text fields are sampled from that pool cache instead.
+    id_numbers (and phones) come from `numbers`, by default UniqueNumbers(seed).
+    """
+    global _shard_fake
+    if _shard_fake is None:
+        _shard_fake = Faker()
+    _shard_fake.seed_instance(f"{seed}:{shard}:faker")
+    rng = random.Random(f"{seed}:{shard}:random")
+    shard_fake = PooledFaker(_shard_fake, open_text_pools(pool_path), rng) if pool_path else _shard_fake
+    numbers = numbers or UniqueNumbers(seed)
+    indices = range(start + numbers.offset, start + numbers.offset + count)
+    # Each record reserves three slots of the id permutation: the head and up to two members
+    if spec is None:
+        return [
+            numbers.assign_phones(numbers.assign_member_ids(
+                generate_fake_individual(shard_fake, rng, id_number=numbers.id_number(3 * index)), index), index)
+            for index in indices
+        ]
+    digits = id_number_digits(spec["individuals"]["id_number"]) or ID_NUMBER_DIGITS
+    records = []
+    for index in indices:
+        id_numbers = (str(numbers.id_number(3 * index + slot, digits)) for slot in range(3))
+        individual = generate_fake_individual(shard_fake, rng, id_number=next(id_numbers))
+        records.append(numbers.assign_phones(conform_individual(individual, spec, rng, id_numbers), index))
+    return records
+
+def generate_individuals(count, spec=None, pool_path=None, numbers=None):
+    """Yield `count` individuals from the module-level Faker, conformed to `spec` if given.
+
+    id_numbers come from `numbers`, by default a UniqueNumbers with a random
+    seed. Nothing issued is kept, where fake.unique would hold a set of them all.
+    """
+    numbers = numbers or UniqueNumbers(random.randrange(2 ** 32))
+    digits = (id_number_digits(spec["individuals"]["id_number"]) or ID_NUMBER_DIGITS) if spec is not None else None
+    source = PooledFaker(fake, open_text_pools(pool_path), random) if pool_path else fake
+    for index in range(numbers.offset, numbers.offset + count):
+        if spec is None:
+            individual = numbers.assign_member_ids(generate_fake_individual(source, id_number=numbers.id_number(3 * index)), index)
+        else:
+            id_numbers = (str(numbers.id_number(3 * index + slot, digits)) for slot in range(3))
+            individual = conform_individual(generate_fake_individual(source, id_number=next(id_numbers)), spec, random, id_numbers)
+        yield numbers.assign_phones(individual, index)
+
+def generate_individuals_parallel(count, seed, workers=1, shard_size=SHARD_SIZE, spec=None, pool_path=None, numbers=None):
+    """Yield `count` seeded individuals, generated shard by shard across `workers` processes.
+
+    Shards are yielded in order and at most two per worker are in flight, so the
+    output is the same for any worker count and memory stays bounded.
+    Dates are relative to today, so reruns match only on the same day.
+    """
+    shards = ((seed, shard, start, min(shard_size, count - start), spec, pool_path, numbers)
+              for shard, start in enumerate(range(0, count, shard_size)))
+    yield from run_shards(generate_shard, shards, workers)
+
+def run_shards(function, shards, workers=1):
+    """Yield the items of function(*args) for each args tuple in `shards`, in order.
+
+    With more than one worker the shards run in a process pool with at most
+    two per worker in flight.
+    """
+    if workers <= 1:
+        for shard_args in shards:
+            yield from function(*shard_args)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        try:
+            for shard_args in shards:
+                pending.append(executor.submit(function, *shard_args))
+                if len(pending) >= workers * 2:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            # The consumer stopped early: drop the shards that have not started
+            executor.shutdown(cancel_futures=True)
+
+# Relative weights of household sizes (people, children included) for the households command
+HOUSEHOLD_SIZES = {1: 22, 2: 20, 3: 18, 4: 16, 5: 12, 6: 7, 7: 5}
+FAMILY_STATUSES = ["green", "yellow", "red"]
+
+def parse_weights(text, key=str):
+    """Parse 'name:weight,...' into a {key(name): weight} dict; a missing weight counts as 1"""
+    weights = {}
+    for item in text.split(','):
+        name, _, weight = item.partition(':')
+        weights[key(name.strip())] = float(weight or 1)
+    if min(weights.values()) < 0 or not sum(weights.values()):
+        raise ValueError("weights must be non-negative with a positive total")
+    return weights
+
+def seeded_uuid(rng):
+    """A version 4 UUID drawn from `rng`, so seeded runs reproduce their row ids"""
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+def school_stage(age):
+    """School stage of a child of `age` years"""
+    if age < 6:
+        return "kindergarten"
+    if age < 12:
+        return "primary"
+    if age < 15:
+        return "preparatory"
+    return "secondary"
+
+def _conform_row(row, rules, rng):
+    """Conform the columns of one table row to that table's spec rules"""
+    for column, column_rules in rules.items():
+        if column in row:
+            row[column] = _conform(row[column], column_rules, rng)
+    return row
+
+def generate_household_shard(seed, shard, start, count, sizes, spec, pool_path=None, numbers=None):
+    """Generate households [start, start + count) as table rows, each household in foreign-key order.
+
+    A household is a families row, then the individuals in it (head, spouse and
+    adult relatives, all sharing family_id, address and district), their
+    family_members links, and the head's children. family_members roles are
+    only 'parent' or 'child', so only the head and spouse are linked, as
+    parents; relatives belong to the family through family_id alone. Children
+    rows carry no created_by, so `load` needs --created-by. Ages are consistent: a
+    spouse is within 8 years of the head and children were born while the head
+    was between 18 and 45. Row ids are seeded UUIDs and the id_number (and,
+    with phones on, the phone) of slot k in household h is drawn from
+    `numbers` (default the households stream of UniqueNumbers(seed)) at index
+    (h + offset) * max(sizes) + k.
+    """
+    global _shard_fake
+    if _shard_fake is None:
+        _shard_fake = Faker()
+    _shard_fake.seed_instance(f"{seed}:{shard}:households")
+    rng = random.Random(f"{seed}:{shard}:households")
+    faker = PooledFaker(_shard_fake, open_text_pools(pool_path), rng) if pool_path else _shard_fake
+    size_choices, size_weights = list(sizes), list(sizes.values())
+    slots = max(sizes)
+    numbers = numbers or UniqueNumbers(seed, stream="households")
+    digits = id_number_digits(spec.get("individuals", {}).get("id_number", {})) or ID_NUMBER_DIGITS
+    today = today_date()
+
+    def birth_date(age):
+        return (today - timedelta(days=365 * age + rng.randrange(365))).isoformat()
+
+    def person(household, slot, gender, age, last_name, marital_status):
+        index = (household + numbers.offset) * slots + slot
+        employment_status = rng.choice(EMPLOYMENT_STATUSES)
+        employment_status = VALUE_ALIASES["employment_status"].get(employment_status, employment_status)
+        row = _conform_row({
+            "table": "individuals",
+            "id": seeded_uuid(rng),
+            "first_name": faker.first_name_male() if gender == "male" else faker.first_name_female(),
+            "last_name": last_name,
+            "id_number": str(numbers.id_number(index, digits)),
+            "date_of_birth": birth_date(age),
+            "gender": gender,
+            "marital_status": marital_status,
+            "phone": faker.phone_number() if rng.random() > 0.3 else None,
+            "district": district,
+            "family_id": family_id,
+            "address": address,
+            "description": None,
+            "job": faker.job() if age < 65 and rng.random() > 0.4 else None,
+            "employment_status": employment_status,
+            "salary": rng.randint(500, 5000) if employment_status == "has_salary" else None,
+            "list_status": "whitelist",
+            "created_by": None,
+        }, spec.get("individuals", {}), rng)
+        if numbers.phones and row["phone"]:
+            row["phone"] = numbers.phone(index)
+        return row
+
+    rows = []
+    for household in range(start, start + count):
+        size = rng.choices(size_choices, size_weights)[0]
+        family_id = seeded_uuid(rng)
+        last_name = faker.last_name()
+        district = _conform(faker.city(), spec.get("individuals", {}).get("district", {}), rng)
+        address = faker.address()
+        head_age = rng.randint(20, 80)
+        head_gender = rng.choice(GENDERS)
+        married = size > 1 and rng.random() < 0.75
+        if married:
+            head_status = "married"
+        else:
+            head_status = "widowed" if head_age > 50 and rng.random() < 0.4 else "single"
+        head = person(household, 0, head_gender, head_age, last_name, head_status)
+        adults = [head]
+        if married:
+            spouse_gender = "female" if head_gender == "male" else "male"
+            spouse_age = max(18, head_age + rng.randint(-8, 8))
+            adults.append(person(household, 1, spouse_gender, spouse_age, last_name, "married"))
+        parents = list(adults)
+        # Children were born while the head was 18 to 45 (one year of margin for the days drawn within each age)
+        youngest, oldest = max(0, head_age - 45), min(17, head_age - 19)
+        children = []
+        for slot in range(len(adults), size):
+            if youngest <= oldest and rng.random() < 0.9:
+                age = rng.randint(youngest, oldest)
+                gender = rng.choice(CHILD_GENDERS)
+                children.append(_conform_row({
+                    "table": "children",
+                    "id": seeded_uuid(rng),
+                    "first_name": faker.first_name_male() if gender == "boy" else faker.first_name_female(),
+                    "last_name": last_name,
+                    "date_of_birth": birth_date(age),
+                    "gender": gender,
+                    "school_stage": school_stage(age) if age >= 4 else None,
+                    "description": None,
+                    "parent_id": head["id"],
+                    "family_id": family_id,
+                    "created_by": None,
+                }, spec.get("children", {}), rng))
+            else:
+                # An adult relative: the head's widowed parent or a sibling
+                if rng.random() < 0.5 and head_age <= 70:
+                    age, status = min(100, head_age + rng.randint(20, 35)), "widowed"
+                else:
+                    age, status = max(18, head_age + rng.randint(-10, 10)), "single"
+                adults.append(person(household, slot, rng.choice(GENDERS), age, last_name, status))
+        rows.append(_conform_row({
+            "table": "families",
+            "id": family_id,
+            "name": last_name,
+            "status": rng.choices(FAMILY_STATUSES, [70, 20, 10])[0],
+            "district": district,
+            "phone": head["phone"],
+            "address": address,
+        }, spec.get("families", {}), rng))
+        rows.extend(adults)
+        rows.extend({"table": "family_members", "family_id": family_id, "individual_id": parent["id"], "role": "parent"}
+                    for parent in parents)
+        rows.extend(children)
+    return rows
+
+def generate_households(count, seed, sizes=HOUSEHOLD_SIZES, spec=None, workers=1, shard_size=SHARD_SIZE, pool_path=None, numbers=None):
+    """Yield the table rows of `count` seeded households in foreign-key order; see generate_household_shard()"""
+    spec = spec if spec is not None else {}
+    shards = ((seed, shard, start, min(shard_size, count - start), sizes, spec, pool_path, numbers)
+              for shard, start in enumerate(range(0, count, shard_size)))
+    yield from run_shards(generate_household_shard, shards, workers)
+
+# Per aid type: relative frequency, recipients per distribution, units per recipient and unit value
+AID_PROFILES = {
+    "food":      {"weight": 40, "recipients": (50, 400), "units": (1, 5), "unit_value": (15, 60)},
+    "financial": {"weight": 18, "recipients": (10, 120), "units": (1, 1), "unit_value": (100, 1000)},
+    "clothing":  {"weight": 12, "recipients": (20, 200), "units": (1, 4), "unit_value": (10, 40)},
+    "medical":   {"weight": 10, "recipients": (5, 60), "units": (1, 3), "unit_value": (20, 300)},
+    "education": {"weight": 10, "recipients": (10, 150), "units": (1, 3), "unit_value": (10, 150)},
+    "shelter":   {"weight": 4, "recipients": (1, 20), "units": (1, 1), "unit_value": (200, 2000)},
+    "other":     {"weight": 6, "recipients": (5, 80), "units": (1, 3), "unit_value": (5, 100)},
+}
+RECIPIENT_NOTES = ["Collected in person", "Delivered to home", "Collected by a relative", "Partial quantity", "Follow-up needed"]
+
+def generate_distributions(individual_ids, events, years=3, seed=0, aid_mix=None):
+    """Yield distributions rows, each followed by its distribution_recipients rows.
+
+    Events are spread evenly over the last `years` years in date order. Each
+    draws an aid type from `aid_mix` (default: the AID_PROFILES weights) and
+    a fan-out of distinct recipients from `individual_ids`. Its quantity and
+    value are the totals of what the recipients received. Events in the last
+    30 days may still be in progress; older ones are completed, a few
+    cancelled without recipients. Memory is bounded by one event's fan-out.
+    """
+    rng = random.Random(f"{seed}:distributions")
+    aid_mix = aid_mix or {aid_type: profile["weight"] for aid_type, profile in AID_PROFILES.items()}
+    aid_types, aid_weights = list(aid_mix), list(aid_mix.values())
+    today = today_date()
+    days = max(1, round(365.25 * years))
+    for event in range(events):
+        date = today - timedelta(days=days - 1 - (event * days) // events)
+        aid_type = rng.choices(aid_types, aid_weights)[0]
+        profile = AID_PROFILES[aid_type]
+        if (today - date).days <= 30 and rng.random() < 0.5:
+            status = "in_progress"
+        else:
+            status = "cancelled" if rng.random() < 0.03 else "completed"
+        distribution_id = seeded_uuid(rng)
+        recipients = []
+        if status != "cancelled":
+            fan_out = min(len(individual_ids), rng.randint(*profile["recipients"]))
+            unit_value = round(rng.uniform(*profile["unit_value"]), 2)
+            for individual_id in rng.sample(individual_ids, fan_out):
+                units = rng.randint(*profile["units"])
+                recipients.append({
+                    "table": "distribution_recipients",
+                    "id": seeded_uuid(rng),
+                    "distribution_id": distribution_id,
+                    "individual_id": individual_id,
+                    "quantity_received": units,
+                    "value_received": round(units * unit_value, 2),
+                    "notes": rng.choice(RECIPIENT_NOTES) if rng.random() < 0.1 else None,
+                })
+        yield {
+            "table": "distributions",
+            "id": distribution_id,
+            "date": date.isoformat(),
+            "aid_type": aid_type,
+            "description": f"{aid_type.capitalize()} distribution, {date:%B %Y}",
+            "quantity": sum(recipient["quantity_received"] for recipient in recipients),
+            "value": round(sum(recipient["value_received"] for recipient in recipients), 2),
+            "status": status,
+        }
+        yield from recipients
+
+def read_individual_ids(path=None, dsn=None):
+    """Individual row ids from a households rows file, or from the individuals table at `dsn`"""
+    if dsn:
+        psycopg = require_module("psycopg", "distributions --dsn", "psycopg[binary]")
+        with psycopg.connect(dsn) as conn:
+            return [str(row[0]) for row in conn.execute("SELECT id FROM individuals ORDER BY id")]
+    return [record["id"] for record in read_records(path) if record.get("table") == "individuals"]
+
+def require_module(name, feature, package=None):
+    """Import an optional dependency, exiting with an install hint if it is missing"""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        raise SystemExit(f"{feature} requires the '{name}' package (pip install {package or name})")
+
+def build_headers(token=None):
+    """Build the request headers for the API"""
+    headers = {
+        "Content-Type": "application/json",
+        # Add any authentication headers needed here
+    }
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+class TokenBucket:
+    """Token-bucket rate limiter: `rate` requests per second with bursts of up to `burst`"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate / 10)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _take(self):
+        """Take a token if one is available; otherwise return how long to wait for one"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def wait(self):
+        while (delay := self._take()) > 0:
+            time.sleep(delay)
+
+    async def acquire(self):
+        while (delay := self._take()) > 0:
+            await asyncio.sleep(delay)
+
+class AIMDController:
+    """Additive-increase/multiplicative-decrease limit on requests in flight.
+
+    Every request that finishes without congestion grows the limit by 1/limit,
+    so by about one per round of requests. A retryable error, or a latency above
+    `latency_target`, halves the limit, at most once per round trip. Without a
+    target, congestion is a latency above three times the best smoothed latency
+    seen so far.
+    """
+
+    def __init__(self, maximum, minimum=1, latency_target=None):
+        self.maximum = maximum
+        self.minimum = minimum
+        self.latency_target = latency_target
+        self.limit = float(max(minimum, min(maximum, 4)))
+        self.peak = self.limit
+        self.in_flight = 0
+        self.smoothed = None
+        self.baseline = None
+        self.last_decrease = 0.0
+        self.condition = asyncio.Condition()
+
+    async def acquire(self):
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, latency, congested):
+        async with self.condition:
+            self.in_flight -= 1
+            self.smoothed = latency if self.smoothed is None else 0.8 * self.smoothed + 0.2 * latency
+            self.baseline = self.smoothed if self.baseline is None else min(self.baseline, self.smoothed)
+            target = self.latency_target or 3 * self.baseline
+            now = time.monotonic()
+            if congested or latency > target:
+                if now - self.last_decrease > self.smoothed:
+                    self.limit = max(self.minimum, self.limit / 2)
+                    self.last_decrease = now
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+                self.peak = max(self.peak, self.limit)
+            self.condition.notify_all()
+
+# Responses worth retrying: rate limiting and an overloaded or restarting upstream
+RETRYABLE_STATUSES = {429, 502, 503, 504}
+
+def backoff_delay(attempt, base=0.5, cap=30.0):
+    """Exponential backoff with full jitter for the given retry attempt (0-based)"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+def retry_after_seconds(value):
+    """Seconds from a numeric Retry-After header, or None"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+# Statuses PostgREST answers with when a row breaks a constraint; a batch that gets one is bisected
+CONSTRAINT_STATUSES = {400, 409, 422}
+
+# SQLSTATE in a PostgREST error body for a unique violation: the record is already stored
+UNIQUE_VIOLATION = "23505"
+
+def is_already_stored(status, body):
+    """Whether an error response is a 409 for a unique violation, rather than e.g. a foreign key one (23503)"""
+    if status != 409:
+        return False
+    try:
+        return json.loads(body).get("code") == UNIQUE_VIOLATION
+    except (ValueError, AttributeError):
+        return False
+
+def post_with_retries(session, api_url, payload, headers, max_retries=0, bucket=None, counts=None):
+    """POST a JSON payload, retrying retryable failures.
+
+    429/502/503/504 responses and connection errors are retried up to
+    `max_retries` times with jittered exponential backoff (or Retry-After),
+    each retry counted in counts['retries'] when `counts` is given.
+    Returns (response, error); response is None if no response was received and
+    error is None only for a 2xx/3xx answer.
+    """
+    body = encode_json(payload)
+    for attempt in range(max_retries + 1):
+        if bucket:
+            bucket.wait()
+        try:
+            response = session.post(api_url, data=body, headers=headers)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if attempt < max_retries:
+                if counts is not None:
+                    counts["retries"] += 1
+                time.sleep(backoff_delay(attempt))
+                continue
+            return None, str(e)
+        except requests.exceptions.RequestException as e:
+            return None, str(e)
+        if response.status_code in RETRYABLE_STATUSES and attempt < max_retries:
+            if counts is not None:
+                counts["retries"] += 1
+            delay = retry_after_seconds(response.headers.get("Retry-After"))
+            time.sleep(delay if delay is not None else backoff_delay(attempt))
+            continue
+        return response, None if response.status_code < 400 else f"HTTP {response.status_code} {response.reason}"
+
+def submit_individual(individual_data, api_url, headers=None, session=None, max_retries=0, bucket=None, counts=None):
     """Submit the individual data to the API"""
     if not headers:
-        headers = {
-            "Content-Type": "application/json",
-            # Add any authentication headers needed here
-        }
+        headers = build_headers()
     
+    response, error = post_with_retries(session or requests, api_url, individual_data, headers, max_retries, bucket, counts)
+    if response is not None and is_already_stored(response.status_code, response.content):
+        # A resend after a lost acknowledgement; the record is already stored
+        return {"already_exists": True}
+    if error:
+        print(f"Error submitting individual: {error}")
+        return None
     try:
-        response = requests.post(api_url, json=individual_data, headers=headers)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Error submitting individual: {e}")
+        return response.json() if response.content else {}
+    except ValueError:
+        return {}
+
+def submit_batch(batch, api_url, headers, session=None, max_retries=0, bucket=None, counts=None):
+    """Submit records as one JSON array payload; returns one success flag per record.
+
+    If the database rejects the batch, it is split in half and each half is
+    resent, until the bad records are isolated and the rest stored.
+    """
+    response, error = post_with_retries(session or requests, api_url, batch, headers, max_retries, bucket, counts)
+    if error is None:
+        return [True] * len(batch)
+    status = response.status_code if response is not None else None
+    if status in CONSTRAINT_STATUSES and len(batch) > 1:
+        middle = len(batch) // 2
+        return (submit_batch(batch[:middle], api_url, headers, session, max_retries, bucket, counts)
+                + submit_batch(batch[middle:], api_url, headers, session, max_retries, bucket, counts))
+    if is_already_stored(status, response.content if response is not None else None):
+        return [True]  # a resend of a record that already landed
+    for individual in batch:
+        print(f"Failed to submit individual {individual['first_name']} {individual['last_name']}: {error}")
+    return [False] * len(batch)
+
+def iter_batches(records, size):
+    """Yield lists of up to `size` records"""
+    records = iter(records)
+    while batch := list(islice(records, size)):
+        yield batch
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+def print_throughput_summary(succeeded, failed, latencies, elapsed, batch_size=1):
+    """Print records/s and p50/p95/p99 latency per submission (record or batch) for a run"""
+    latencies = sorted(latencies)
+    total = succeeded + failed
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(f"\nSubmitted {succeeded} of {total} individuals in {elapsed:.2f}s ({rate:.1f} records/s, {failed} failed)")
+    label = "Latency" if batch_size == 1 else f"Batch latency ({len(latencies)} batches of up to {batch_size})"
+    summary = {
+        "records": total,
+        "succeeded": succeeded,
+        "failed": failed,
+        "seconds": round(elapsed, 4),
+        "records_per_s": round(rate, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+    print(label + ": p50 {p50_ms:.1f}ms, p95 {p95_ms:.1f}ms, p99 {p99_ms:.1f}ms".format(**summary))
+    return summary
+
+class SubmissionJournal:
+    """Append-only log of submission outcomes, keyed by id_number.
+
+    Each line is "<ok|failed>\t<id_number>" and the last line for an id wins.
+    Appends are fsynced every `sync_every` entries or `sync_interval` seconds,
+    so a crash loses at most that window of acknowledgements. Those records
+    are resent, and the API answers 409 for any that already landed.
+    """
+
+    def __init__(self, path, sync_every=100, sync_interval=1.0):
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.acknowledged = set()
+        if os.path.exists(path):
+            complete = 0
+            with open(path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break  # torn final line from a crash
+                    complete += len(line)
+                    status, _, id_number = line.decode('utf-8').rstrip('\n').partition('\t')
+                    if status == 'ok':
+                        self.acknowledged.add(id_number)
+                    elif status == 'failed':
+                        self.acknowledged.discard(id_number)
+            if complete < os.path.getsize(path):
+                # Drop the torn line, so the next entry starts a line of its own
+                os.truncate(path, complete)
+        self.file = open(path, 'a', encoding='utf-8')
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def is_acknowledged(self, id_number):
+        return str(id_number) in self.acknowledged
+
+    def record(self, id_number, ok):
+        id_number = str(id_number)
+        self.file.write(f"{'ok' if ok else 'failed'}\t{id_number}\n")
+        if ok:
+            self.acknowledged.add(id_number)
+        self.unsynced += 1
+        if self.unsynced >= self.sync_every or time.monotonic() - self.last_sync >= self.sync_interval:
+            self.sync()
+
+    def sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.unsynced = 0
+        self.last_sync = time.monotonic()
+
+    def close(self):
+        self.sync()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def skip_acknowledged(records, journal, stats):
+    """Drop records the journal has already seen acknowledged, counting them in stats['skipped']"""
+    for record in records:
+        if journal.is_acknowledged(record['id_number']):
+            stats['skipped'] += 1
+            continue
+        yield record
+
+def submit_individuals(records, api_url, headers, journal=None, max_retries=0, rate=None, batch_size=1):
+    """Submit individuals sequentially over a single keep-alive session, `batch_size` per request"""
+    succeeded = failed = 0
+    latencies = []
+    counts = {"retries": 0}
+    bucket = TokenBucket(rate) if rate else None
+    started = time.perf_counter()
+    with requests.Session() as session:
+        for batch in iter_batches(records, batch_size):
+            request_started = time.perf_counter()
+            if batch_size == 1:
+                results = [submit_individual(batch[0], api_url, headers, session, max_retries, bucket, counts) is not None]
+            else:
+                results = submit_batch(batch, api_url, headers, session, max_retries, bucket, counts)
+            latencies.append(time.perf_counter() - request_started)
+            for individual, ok in zip(batch, results):
+                if journal:
+                    journal.record(individual['id_number'], ok)
+                if ok:
+                    succeeded += 1
+                else:
+                    failed += 1
+                if batch_size == 1:
+                    outcome = "Successfully submitted" if ok else "Failed to submit"
+                    print(f"{outcome} individual: {individual['first_name']} {individual['last_name']}")
+            if batch_size > 1:
+                print(f"Submitted batch of {len(batch)}: {sum(results)} stored in {latencies[-1] * 1000:.0f}ms")
+    summary = print_throughput_summary(succeeded, failed, latencies, time.perf_counter() - started, batch_size)
+    summary["retries"] = counts["retries"]
+    if counts["retries"]:
+        print(f"Retried {counts['retries']} requests")
+    return summary
+
+async def submit_individuals_async(records, api_url, headers, concurrency, journal=None,
+                                   max_retries=0, rate=None, adaptive=False, latency_target=None, batch_size=1):
+    """Submit individuals with at most `concurrency` requests in flight, `batch_size` per request.
+
+    Records are pulled from `records` lazily by a producer thread into a
+    bounded queue, so generation never stalls the event loop (and the requests
+    in flight with it), and a slow API applies backpressure to generation
+    instead of letting it run ahead.
+    `rate` caps requests per second. Retryable failures are retried with
+    backoff. With `adaptive`, an AIMDController moves the in-flight limit
+    between 1 and `concurrency` according to latency and errors.
+    """
+    aiohttp = require_module("aiohttp", "--concurrency")
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    latencies = []
+    counts = {"succeeded": 0, "failed": 0, "retries": 0}
+    bucket = TokenBucket(rate) if rate else None
+    controller = AIMDController(concurrency, latency_target=latency_target) if adaptive else None
+
+    async def send(session, payload):
+        """POST a payload, retrying retryable failures; returns (status, response body, error)"""
+        body = encode_json(payload)
+        for attempt in range(max_retries + 1):
+            if bucket:
+                await bucket.acquire()
+            if controller:
+                await controller.acquire()
+            request_started = time.perf_counter()
+            retryable = False
+            delay = None
+            status = reply = None
+            try:
+                async with session.post(api_url, data=body) as response:
+                    reply = await response.read()
+                    status = response.status
+                    if response.status < 400:
+                        error = None
+                    else:
+                        error = f"HTTP {response.status} {response.reason}"
+                        retryable = response.status in RETRYABLE_STATUSES
+                        delay = retry_after_seconds(response.headers.get("Retry-After"))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = str(e) or type(e).__name__
+                retryable = True
+            latency = time.perf_counter() - request_started
+            if controller:
+                await controller.release(latency, congested=retryable)
+            if not retryable or attempt == max_retries:
+                return status, reply, error
+            counts["retries"] += 1
+            await asyncio.sleep(delay if delay is not None else backoff_delay(attempt))
+
+    async def submit(session, batch):
+        """Send a batch, bisecting it when the database rejects it; returns one success flag per record"""
+        status, reply, error = await send(session, batch if batch_size > 1 else batch[0])
+        if error is None:
+            return [True] * len(batch)
+        if status in CONSTRAINT_STATUSES and len(batch) > 1:
+            middle = len(batch) // 2
+            return await submit(session, batch[:middle]) + await submit(session, batch[middle:])
+        if is_already_stored(status, reply):
+            return [True]  # a resend of a record that already landed
+        for individual in batch:
+            print(f"Failed to submit individual {individual['first_name']} {individual['last_name']}: {error}")
+        return [False] * len(batch)
+
+    def produce(loop):
+        """Batch records off the event loop, blocking while the queue is full"""
+        for batch in iter_batches(records, batch_size):
+            asyncio.run_coroutine_threadsafe(queue.put(batch), loop).result()
+
+    async def worker(session):
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                queue.task_done()
+                return
+            submitted = time.perf_counter()
+            results = await submit(session, batch)
+            latencies.append(time.perf_counter() - submitted)
+            for individual, ok in zip(batch, results):
+                counts["succeeded" if ok else "failed"] += 1
+                if journal:
+                    journal.record(individual['id_number'], ok)
+            queue.task_done()
+
+    connector = aiohttp.TCPConnector(limit=concurrency, keepalive_timeout=30)
+    timeout = aiohttp.ClientTimeout(total=30)
+    started = time.perf_counter()
+    async with aiohttp.ClientSession(connector=connector, headers=headers, timeout=timeout) as session:
+        workers = [asyncio.create_task(worker(session)) for _ in range(concurrency)]
+        try:
+            await asyncio.to_thread(produce, asyncio.get_running_loop())
+        finally:
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+    summary = print_throughput_summary(counts["succeeded"], counts["failed"], latencies, time.perf_counter() - started, batch_size)
+    summary["retries"] = counts["retries"]
+    if counts["retries"]:
+        print(f"Retried {counts['retries']} requests")
+    if controller:
+        print(f"Adaptive concurrency: ended at {int(controller.limit)}, peaked at {int(controller.peak)} of {concurrency}")
+    return summary
+
+def infer_compression(path):
+    """Guess the compression of a records file from its extension"""
+    if path.endswith('.gz'):
+        return 'gzip'
+    if path.endswith(('.zst', '.zstd')):
+        return 'zstd'
+    return None
+
+def infer_format(path):
+    """Guess whether a records file is a JSON array, newline-delimited JSON or MessagePack"""
+    if path == '-':
+        return 'ndjson'
+    stem = path
+    for suffix in ('.gz', '.zst', '.zstd'):
+        if stem.endswith(suffix):
+            stem = stem[:-len(suffix)]
+    if stem.endswith('.parquet'):
+        return 'parquet'
+    if stem.endswith(('.arrow', '.feather', '.ipc')):
+        return 'arrow'
+    if stem.endswith(('.msgpack', '.mpk')):
+        return 'msgpack'
+    return 'ndjson' if stem.endswith(('.ndjson', '.jsonl')) else 'json'
+
+def open_stream(path, mode, compression=None, binary=False):
+    """Open a UTF-8 text (or `binary`) stream on a file or '-' (stdin/stdout), (de)compressing gzip or zstd"""
+    binary_mode = 'wb' if mode.startswith('w') else 'rb'
+    if path == '-':
+        # Work on a duplicate descriptor so closing the stream leaves stdin/stdout usable
+        raw = os.fdopen(os.dup((sys.stdout if binary_mode == 'wb' else sys.stdin).fileno()), binary_mode)
+    else:
+        raw = open(path, binary_mode)
+    if compression == 'gzip':
+        raw = gzip.GzipFile(fileobj=raw, mode=binary_mode)
+    elif compression == 'zstd':
+        zstandard = require_module('zstandard', 'zstd compression')
+        raw = zstandard.open(raw, binary_mode, closefd=True)
+    return raw if binary else io.TextIOWrapper(raw, encoding='utf-8', newline='\n')
+
+class RecordWriter:
+    """Stream records to a JSON array, NDJSON or MessagePack file, flushing every `chunk_size` records.
+
+    Records are encoded compactly as they arrive (see record_encoder), so only
+    the current chunk's bytes are held in memory. With NDJSON and MessagePack
+    everything up to the last flushed chunk survives a crash.
+    """
+
+    def __init__(self, path, fmt=None, compression=None, chunk_size=1000):
+        self.path = path
+        self.format = fmt or infer_format(path)
+        self.encode = record_encoder(self.format)
+        self.chunk_size = chunk_size
+        self.count = 0
+        self.buffer = []
+        self.stream = open_stream(path, 'w', compression or infer_compression(path), binary=True)
+        if self.format == 'json':
+            self.stream.write(b'[')
+
+    def write(self, record):
+        if self.format == 'ndjson':
+            self.buffer.append(self.encode(record) + b'\n')
+        elif self.format == 'msgpack':
+            self.buffer.append(self.encode(record))
+        else:
+            # One compact record per line of the array
+            self.buffer.append((b'\n' if self.count == 0 else b',\n') + self.encode(record))
+        self.count += 1
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+
+    def tee(self, records):
+        """Write each record as it passes through to the next stage"""
+        for record in records:
+            self.write(record)
+            yield record
+
+    def flush(self):
+        if self.buffer:
+            self.stream.write(b''.join(self.buffer))
+            self.buffer.clear()
+        self.stream.flush()
+
+    def close(self):
+        self.flush()
+        if self.format == 'json':
+            self.stream.write(b'\n]' if self.count else b']')
+        self.stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def iter_json_array(stream):
+    """Yield the elements of a JSON array from a binary stream.
+
+    RecordWriter puts each element on a line of its own, between a '[' line
+    and a ']' line, so those files are decoded line by line in flat memory.
+    Any other layout (pretty-printed, or the whole array on one line) is
+    decoded in one piece.
+    """
+    lines = iter(stream)
+    head = b""
+    for line in lines:
+        head += line
+        if line.strip():
+            break
+    if head.strip() != b"[":
+        yield from decode_json(head + b"".join(lines))
+        return
+    started = False
+    for line in lines:
+        element = line.strip().rstrip(b",")
+        if not element or element == b"]":
+            continue
+        try:
+            record = decode_json(element)
+        except ValueError:
+            if started:
+                raise
+            # Not one element per line: fall back to the whole array
+            yield from decode_json(head + line + b"".join(lines))
+            return
+        started = True
+        yield record
+
+def read_records(path, compression=None):
+    """Yield records from a JSON array, NDJSON or MessagePack file (or '-' for stdin), one at a time, as dicts"""
+    fmt = infer_format(path)
+    with open_stream(path, 'r', compression or infer_compression(path), binary=True) as stream:
+        if fmt == 'json':
+            yield from iter_json_array(stream)
+        elif fmt == 'msgpack':
+            yield from require_module('msgpack', 'msgpack input').Unpacker(stream, raw=False)
+        else:
+            for line in stream:
+                line = line.strip()
+                if line:
+                    yield decode_json(line)
+
+def build_text_pools(fake, size, unique=False):
+    """Synthesize `size` values for each textual field once, to be sampled by index.
+
+    With `unique`, duplicates are dropped and redrawn, giving up after 4 *
+    `size` draws for fields with fewer distinct values than that.
+    """
+    providers = {
+        "first_name_male": fake.first_name_male,
+        "first_name_female": fake.first_name_female,
+        "last_name": fake.last_name,
+        "name_male": fake.name_male,
+        "name_female": fake.name_female,
+        "phone_number": fake.phone_number,
+        "city": fake.city,
+        "address": fake.address,
+        "job": fake.job,
+        "text_50": lambda: fake.text(max_nb_chars=50),
+        "text_100": lambda: fake.text(max_nb_chars=100),
+        "text_200": lambda: fake.text(max_nb_chars=200),
+    }
+    if not unique:
+        return {name: [provider() for _ in range(size)] for name, provider in providers.items()}
+    pools = {}
+    for name, provider in providers.items():
+        values = {}
+        for _ in range(4 * size):
+            values[provider()] = None
+            if len(values) == size:
+                break
+        pools[name] = list(values)
+    return pools
+
+# Pool cache files: magic, header length, JSON header, native uint64 offsets, UTF-8 blob
+POOL_CACHE_MAGIC = b"FAKEPOOL1"
+
+def pool_cache_path(directory, locale, seed, size):
+    """Cache file of the pools for one locale, seed and pool size"""
+    return os.path.join(directory, f"pools-{locale}-{seed}-{size}.bin")
+
+def write_pool_cache(path, pools):
+    """Write pools as one string blob plus the offsets of every value in it.
+
+    The file is written under a temporary name and renamed into place, so
+    concurrent runs never see a partial cache. Offsets are in native byte
+    order; a cache is meant for the machine that built it.
+    """
+    encoded = [value.encode('utf-8') for values in pools.values() for value in values]
+    offsets = array('Q', [0])
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    header = json.dumps({"fields": {name: len(values) for name, values in pools.items()}}).encode()
+    header += b" " * (-(len(POOL_CACHE_MAGIC) + 4 + len(header)) % 8)  # keep the offsets 8-byte aligned
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'wb') as f:
+        f.write(POOL_CACHE_MAGIC)
+        f.write(len(header).to_bytes(4, 'little'))
+        f.write(header)
+        f.write(offsets.tobytes())
+        f.write(b"".join(encoded))
+    os.replace(temporary, path)
+
+class TextPools:
+    """Read-only pools backed by a memory-mapped cache file.
+
+    Opening only parses the small JSON header; values are decoded from the
+    mapped blob on access, so worker processes share the cache pages.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        start = len(POOL_CACHE_MAGIC)
+        if self.map[:start] != POOL_CACHE_MAGIC:
+            raise ValueError(f"{path} is not a pool cache file")
+        header_length = int.from_bytes(self.map[start:start + 4], 'little')
+        header = json.loads(self.map[start + 4:start + 4 + header_length])
+        self.ranges = {}
+        total = 0
+        for name, size in header["fields"].items():
+            self.ranges[name] = (total, size)
+            total += size
+        offsets_start = start + 4 + header_length
+        self.offsets = memoryview(self.map)[offsets_start:offsets_start + 8 * (total + 1)].cast('Q')
+        self.blob_start = offsets_start + 8 * (total + 1)
+
+    def size(self, name):
+        return self.ranges[name][1]
+
+    def get(self, name, index):
+        """Value `index` of pool `name`"""
+        position = self.ranges[name][0] + index
+        return self.map[self.blob_start + self.offsets[position]:self.blob_start + self.offsets[position + 1]].decode('utf-8')
+
+    def sample(self, name, rng):
+        """A value of pool `name` chosen with `rng`"""
+        return self.get(name, rng.randrange(self.ranges[name][1]))
+
+    def values(self, name):
+        return [self.get(name, index) for index in range(self.size(name))]
+
+@lru_cache(maxsize=None)
+def open_text_pools(path):
+    """Map a pool cache file once per process"""
+    return TextPools(path)
+
+def ensure_pool_cache(directory, locale, seed, size):
+    """Return the path of the pool cache for (locale, seed, size), building it on first use"""
+    path = pool_cache_path(directory, locale, seed, size)
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        pool_fake = Faker(locale)
+        pool_fake.seed_instance(f"{seed}:pools")
+        write_pool_cache(path, build_text_pools(pool_fake, size, unique=True))
+    return path
+
+class PooledFaker:
+    """Faker proxy that samples pooled text fields from TextPools by index.
+
+    Names, addresses, phone numbers, cities, jobs and the 50/100/200 character
+    texts come from the pools via `rng`; any other attribute is delegated to
+    the wrapped Faker.
+    """
+    TEXT_POOLS = {50: "text_50", 100: "text_100", 200: "text_200"}
+
+    def __init__(self, fake, pools, rng):
+        self.fake = fake
+        self.pools = pools
+        self.rng = rng
+        for name in pools.ranges:
+            if not name.startswith("text_"):
+                setattr(self, name, partial(pools.sample, name, rng))
+
+    def text(self, max_nb_chars=200):
+        pool = self.TEXT_POOLS.get(max_nb_chars)
+        if pool is None:
+            return self.fake.text(max_nb_chars=max_nb_chars)
+        return self.pools.sample(pool, self.rng)
+
+    def __getattr__(self, name):
+        return getattr(self.fake, name)
+
+def sequence_id_numbers(indices, seed, digits=ID_NUMBER_DIGITS):
+    """Vectorized sequence_id_number() for a uint64 array of indices; digits <= 14"""
+    a, b = _id_permutation(seed, digits)
+    space = np.uint64(9 * 10 ** (digits - 1))
+    count = len(indices)
+    # a * index overflows 64 bits, so multiply in 16-bit limbs of `a`, reducing as we go
+    product = np.zeros(count, dtype=np.uint64)
+    for shift in (48, 32, 16, 0):
+        product = (product << np.uint64(16)) % space
+        product = (product + np.uint64((a >> shift) & 0xFFFF) * indices % space) % space
+    return (np.uint64(10 ** (digits - 1)) + (product + np.uint64(b)) % space).astype(np.int64)
+
+def _categorical(indices, dictionary):
+    return pa.DictionaryArray.from_arrays(pa.array(indices, type=pa.int32()), dictionary)
+
+def _choice(rng, n, dictionary):
+    return _categorical(rng.integers(0, len(dictionary), n), dictionary)
+
+def _pooled(rng, n, pool, probability=1.0, offset=None):
+    """Draw from a text pool whose entry 0 is '', leaving '' with probability 1 - `probability`"""
+    size = (len(pool) - 1) // (2 if offset is not None else 1)
+    indices = 1 + rng.integers(0, size, n)
+    if offset is not None:
+        indices += offset * size
+    if probability < 1.0:
+        indices[rng.random(n) >= probability] = 0
+    return _categorical(indices, pool)
+
+def _dates(rng, n, low_days, high_days, today, present=None):
+    days = today - rng.integers(low_days, high_days + 1, n)
+    return pa.array(days.astype(np.int32), type=pa.date32(), mask=None if present is None else ~present)
+
+def _ages(rng, n, min_age, max_age, today):
+    return _dates(rng, n, int(min_age * 365.25), int(max_age * 365.25), today)
+
+def _counts(rng, n, probability, low, high):
+    counts = rng.integers(low, high + 1, n)
+    counts[rng.random(n) >= probability] = 0
+    return counts, np.concatenate([[0], np.cumsum(counts)]).astype(np.int32)
+
+def _sampled_lists(rng, n, dictionary):
+    """Vectorized random.sample(options, k=randint(0, len(options))) for n rows"""
+    width = len(dictionary)
+    sizes = rng.integers(0, width + 1, n)
+    order = np.argsort(rng.random((n, width)), axis=1)
+    values = order[np.arange(width) < sizes[:, None]]
+    offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int32)
+    return pa.ListArray.from_arrays(pa.array(offsets), _categorical(values, dictionary))
+
+def _coin(rng, n, probability=0.5):
+    return pa.array(rng.random(n) < probability)
+
+def _columnar_batch(rng, n, start, seed, pools, dictionaries, today):
+    """Generate n individuals as one Arrow table, mirroring generate_fake_individual()"""
+    d = dictionaries
+    gender = rng.integers(0, 2, n)
+
+    _, need_offsets = _counts(rng, n, 0.5, 1, 3)
+    needs_total = int(need_offsets[-1])
+    needs = pa.ListArray.from_arrays(pa.array(need_offsets), pa.StructArray.from_arrays([
+        _choice(rng, needs_total, d["need_categories"]),
+        _choice(rng, needs_total, d["need_priorities"]),
+        _pooled(rng, needs_total, pools["text_100"]),
+        _categorical(np.zeros(needs_total, dtype=np.int32), d["need_statuses"]),
+    ], names=["category", "priority", "description", "status"]))
+
+    child_counts, child_offsets = _counts(rng, n, 0.5, 1, 4)
+    children_total = int(child_offsets[-1])
+    child_gender = rng.integers(0, 2, children_total)
+    children = pa.ListArray.from_arrays(pa.array(child_offsets), pa.StructArray.from_arrays([
+        _pooled(rng, children_total, pools["first_names"], offset=child_gender),
+        _pooled(rng, children_total, pools["last_name"]),
+        _ages(rng, children_total, 1, 17, today),
+        _categorical(child_gender, d["child_genders"]),
+        _pooled(rng, children_total, pools["text_50"], 0.3),
+        _choice(rng, children_total, d["school_stages"]),
+    ], names=["first_name", "last_name", "date_of_birth", "gender", "description", "school_stage"]))
+
+    _, member_offsets = _counts(rng, n, 0.4, 1, 2)
+    members_total = int(member_offsets[-1])
+    member_gender = rng.integers(0, 2, members_total)
+    relations = member_gender * len(MALE_RELATIONS) + rng.integers(0, len(MALE_RELATIONS), members_total)
+    additional_members = pa.ListArray.from_arrays(pa.array(member_offsets), pa.StructArray.from_arrays([
+        _pooled(rng, members_total, pools["names"], offset=member_gender),
+        _ages(rng, members_total, 18, 80, today),
+        _categorical(member_gender, d["genders"]),
+        _choice(rng, members_total, d["member_roles"]),
+        _pooled(rng, members_total, pools["job"], 0.5),
+        _pooled(rng, members_total, pools["phone_number"], 0.5),
+        _categorical(relations, d["relations"]),
+    ], names=["name", "date_of_birth", "gender", "role", "job_title", "phone_number", "relation"]))
+
+    employment = rng.integers(0, len(EMPLOYMENT_STATUSES), n)
+    with_salary = employment == EMPLOYMENT_STATUSES.index("with_salary")
+    decade_start = (datetime(today_date().year // 10 * 10, 1, 1).date() - EPOCH).days
+
+    has_children = child_counts > 0
+    new_family_name = _pooled(rng, n, pools["last_name"])
+    new_family_name = _categorical(
+        np.where(has_children & (rng.random(n) < 0.5), new_family_name.indices.to_numpy(), 0),
+        pools["last_name"],
+    )
+
+    return pa.table({
+        "first_name": _pooled(rng, n, pools["first_names"], offset=gender),
+        "last_name": _pooled(rng, n, pools["last_name"]),
+        # The head slot of each record in the records stream, as UniqueNumbers(seed) issues it
+        "id_number": sequence_id_numbers(np.arange(start, start + n, dtype=np.uint64) * np.uint64(3 * len(ID_STREAMS)), seed),
+        "date_of_birth": _ages(rng, n, 18, 80, today),
+        "gender": _categorical(gender, d["genders"]),
+        "marital_status": _choice(rng, n, d["marital_statuses"]),
+        "phone": _pooled(rng, n, pools["phone_number"]),
+        "district": _pooled(rng, n, pools["city"]),
+        "family_id": pa.nulls(n, pa.string()),
+        "new_family_name": new_family_name,
+        "address": _pooled(rng, n, pools["address"]),
+        "description": _pooled(rng, n, pools["text_200"], 0.3),
+        "job": _pooled(rng, n, pools["job"], 0.5),
+        "employment_status": _categorical(employment, d["employment_statuses"]),
+        "salary": pa.array(rng.integers(500, 5001, n), type=pa.int32(), mask=~with_salary),
+        "needs": needs,
+        "additional_members": additional_members,
+        "children": children,
+        "medical_help": pa.StructArray.from_arrays([
+            _sampled_lists(rng, n, d["medical_assistance_types"]),
+            _choice(rng, n, d["medication_frequencies"]),
+            _choice(rng, n, d["treatment_cost_abilities"]),
+            _coin(rng, n),
+            _pooled(rng, n, pools["text_100"], 0.3),
+        ], names=["type_of_medical_assistance_needed", "medication_distribution_frequency",
+                  "estimated_cost_of_treatment", "health_insurance_coverage", "additional_details"]),
+        "food_assistance": pa.StructArray.from_arrays([
+            _sampled_lists(rng, n, d["food_assistance_types"]),
+            _coin(rng, n),
+        ], names=["type_of_food_assistance_needed", "food_supply_card"]),
+        "marriage_assistance": pa.StructArray.from_arrays([
+            _coin(rng, n),
+            _coin(rng, n),
+            _dates(rng, n, 0, today - decade_start, today, present=rng.random(n) < 0.5),
+            _pooled(rng, n, pools["text_100"], 0.3),
+        ], names=["marriage_support_needed", "wedding_contract_signed", "wedding_date", "specific_needs"]),
+        "debt_assistance": pa.StructArray.from_arrays([
+            _coin(rng, n),
+            pa.array(rng.integers(500, 10001, n), type=pa.int32()),
+            _coin(rng, n),
+            _coin(rng, n),
+            _coin(rng, n),
+            _coin(rng, n),
+            _coin(rng, n),
+        ], names=["needs_debt_assistance", "debt_amount", "household_appliances", "hospital_bills",
+                  "education_fees", "business_debt", "other_debt"]),
+        "education_assistance": pa.StructArray.from_arrays([
+            _choice(rng, n, d["education_levels"]),
+            _pooled(rng, n, pools["text_100"], 0.3),
+            _sampled_lists(rng, n, d["children_educational_needs"]),
+        ], names=["family_education_level", "desire_for_education", "children_educational_needs"]),
+        "shelter_assistance": pa.StructArray.from_arrays([
+            _choice(rng, n, d["housing_types"]),
+            _choice(rng, n, d["housing_conditions"]),
+            pa.array(rng.integers(1, 6, n), type=pa.int8()),
+            _sampled_lists(rng, n, d["household_appliances"]),
+        ], names=["type_of_housing", "housing_condition", "number_of_rooms", "household_appliances"]),
+    })
+
+def generate_columnar_batches(count, seed, batch_rows=65536, pool_size=2000, pool_path=None):
+    """Yield Arrow tables of up to `batch_rows` individuals.
+
+    Categorical and numeric fields are drawn a column at a time with NumPy;
+    textual fields index into pools synthesized once by Faker, or read from
+    the pool cache at `pool_path`. All string columns are dictionary-encoded
+    against those fixed pools.
+    """
+    require_module("pyarrow", "--backend columnar")
+    if pool_path:
+        cache = open_text_pools(pool_path)
+        text = {name: cache.values(name) for name in cache.ranges}
+    else:
+        fake = Faker()
+        fake.seed_instance(f"{seed}:pools")
+        text = build_text_pools(fake, pool_size)
+    pools = {name: pa.array([""] + values, type=pa.string()) for name, values in text.items()}
+    # Gendered pools are sampled as two equal halves; deduplicated pools may differ in length
+    half = min(len(text["first_name_male"]), len(text["first_name_female"]))
+    pools["first_names"] = pa.array([""] + text["first_name_male"][:half] + text["first_name_female"][:half], type=pa.string())
+    half = min(len(text["name_male"]), len(text["name_female"]))
+    pools["names"] = pa.array([""] + text["name_male"][:half] + text["name_female"][:half], type=pa.string())
+    dictionaries = {name: pa.array(values, type=pa.string()) for name, values in {
+        "genders": GENDERS,
+        "marital_statuses": MARITAL_STATUSES,
+        "employment_statuses": EMPLOYMENT_STATUSES,
+        "need_categories": NEED_CATEGORIES,
+        "need_priorities": NEED_PRIORITIES,
+        "need_statuses": ["pending"],
+        "medical_assistance_types": MEDICAL_ASSISTANCE_TYPES,
+        "medication_frequencies": MEDICATION_FREQUENCIES,
+        "treatment_cost_abilities": TREATMENT_COST_ABILITIES,
+        "food_assistance_types": FOOD_ASSISTANCE_TYPES,
+        "education_levels": EDUCATION_LEVELS,
+        "children_educational_needs": CHILDREN_EDUCATIONAL_NEEDS,
+        "housing_types": HOUSING_TYPES,
+        "housing_conditions": HOUSING_CONDITIONS,
+        "household_appliances": HOUSEHOLD_APPLIANCES,
+        "child_genders": CHILD_GENDERS,
+        "school_stages": SCHOOL_STAGES,
+        "member_roles": MEMBER_ROLES,
+        "relations": MALE_RELATIONS + FEMALE_RELATIONS,
+    }.items()}
+    rng = np.random.default_rng(seed)
+    today = (today_date() - EPOCH).days
+    for start in range(0, count, batch_rows):
+        yield _columnar_batch(rng, min(batch_rows, count - start), start, seed, pools, dictionaries, today)
+
+def write_columnar(path, fmt, batches):
+    """Write Arrow tables to a Parquet or Arrow IPC file as they arrive; returns the row count"""
+    writer = None
+    rows = 0
+    try:
+        for table in batches:
+            if writer is None:
+                if fmt == 'parquet':
+                    parquet = require_module("pyarrow.parquet", "Parquet output", "pyarrow")
+                    writer = parquet.ParquetWriter(path, table.schema, compression='zstd')
+                else:
+                    writer = pa.ipc.new_file(path, table.schema)
+            writer.write_table(table)
+            rows += table.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+# Tables in foreign-key order, with the columns the loader COPYs into each
+LOAD_COLUMNS = {
+    "families": ("id", "name", "status", "district", "phone", "address"),
+    "individuals": ("id", "first_name", "last_name", "id_number", "date_of_birth", "gender", "marital_status",
+                    "phone", "district", "family_id", "address", "description", "job", "employment_status",
+                    "salary", "list_status", "created_by"),
+    "family_members": ("family_id", "individual_id", "role"),
+    "children": ("id", "first_name", "last_name", "date_of_birth", "gender", "school_stage", "description",
+                 "parent_id", "family_id", "created_by"),
+    "distributions": ("id", "date", "aid_type", "description", "quantity", "value", "status"),
+    "distribution_recipients": ("id", "distribution_id", "individual_id", "quantity_received", "value_received", "notes"),
+}
+
+CHILD_CREATED_BY = LOAD_COLUMNS["children"].index("created_by")
+
+def normalize_record(record, member_id_numbers, created_by=None):
+    """Split one generated record into relational rows, keyed by table.
+
+    The individual becomes a household head. If it has children or additional
+    members, it also gets a families row and a 'parent' family_members link.
+    Children go to the children table. Additional members are promoted to
+    individuals rows of their own in the same family. family_members roles are
+    only 'parent' or 'child', so only a spouse is linked, as a parent; other
+    relatives belong to the family through family_id alone, as in the
+    households command. A member's id_number comes from `member_id_numbers`
+    unless the record already carries one.
+    """
+    rows = {table: [] for table in LOAD_COLUMNS}
+    head_id = uuid.uuid4()
+    children = record.get("children") or []
+    members = record.get("additional_members") or []
+    family_id = record.get("family_id")
+    if not family_id and (children or members):
+        family_id = uuid.uuid4()
+        rows["families"].append((
+            family_id, record.get("new_family_name") or record["last_name"], "green",
+            record["district"], record.get("phone") or None, record.get("address") or None,
+        ))
+
+    rows["individuals"].append((
+        head_id, record["first_name"], record["last_name"], str(record["id_number"]), record["date_of_birth"],
+        record["gender"], record["marital_status"], record.get("phone") or None, record["district"], family_id,
+        record.get("address") or None, record.get("description") or None, record.get("job") or None,
+        record["employment_status"], record.get("salary"), "whitelist", created_by,
+    ))
+    if family_id:
+        rows["family_members"].append((family_id, head_id, "parent"))
+
+    for member in members:
+        member_id = uuid.uuid4()
+        first_name, _, last_name = member["name"].partition(" ")
+        rows["individuals"].append((
+            member_id, first_name, last_name or record["last_name"],
+            str(member.get("id_number") or next(member_id_numbers)), member["date_of_birth"], member["gender"],
+            "married" if member.get("role") == "spouse" else "single", member.get("phone_number") or None,
+            record["district"], family_id, record.get("address") or None, None, member.get("job_title") or None,
+            "no_salary", None, "whitelist", created_by,
+        ))
+        if member.get("role") == "spouse":
+            rows["family_members"].append((family_id, member_id, "parent"))
+
+    for child in children:
+        rows["children"].append((
+            uuid.uuid4(), child["first_name"], child["last_name"], child["date_of_birth"], child["gender"],
+            child.get("school_stage") or None, child.get("description") or None, head_id, family_id, created_by,
+        ))
+    return rows
+
+def load_records(records, dsn, batch_size=10000, created_by=None):
+    """Bulk load records into Postgres with COPY FROM STDIN, one transaction per batch.
+
+    `records` are generated individuals, split by normalize_record(), or
+    table rows from the households and distributions commands, which are
+    copied as they are.
+
+    Returns {table: (rows, copy_seconds)}. A failing batch is rolled back and
+    aborts the load; earlier batches stay committed. children.created_by is
+    NOT NULL and COPY does not apply its auth.uid() default, so children rows
+    need `created_by` (or their own) and a batch with one that has neither
+    aborts the load before it is copied. So does an additional member without
+    an id_number: generation draws one from UniqueNumbers for every member,
+    and the loader has no way to pick one that is not issued elsewhere.
+    """
+    psycopg = require_module("psycopg", "load", "psycopg[binary]")
+    totals = {table: [0, 0.0] for table in LOAD_COLUMNS}
+    started = time.perf_counter()
+    with psycopg.connect(dsn, autocommit=True) as conn:
+        for batch_number, batch in enumerate(iter_batches(records, batch_size), 1):
+            rows = {table: [] for table in LOAD_COLUMNS}
+            for record in batch:
+                if "table" in record:
+                    # A table row from the households or distributions command, already in foreign-key order
+                    rows[record["table"]].append(tuple(
+                        (record.get(column) or created_by) if column == "created_by" else record.get(column)
+                        for column in LOAD_COLUMNS[record["table"]]))
+                    continue
+                if any(not member.get("id_number") for member in record.get("additional_members") or []):
+                    raise SystemExit(f"Batch {batch_number} has an additional member without an id_number: "
+                                     "regenerate the records, which now gives every member one")
+                for table, table_rows in normalize_record(record, iter(()), created_by).items():
+                    rows[table].extend(table_rows)
+            if any(row[CHILD_CREATED_BY] is None for row in rows["children"]):
+                raise SystemExit(f"Batch {batch_number} has children rows, whose created_by is NOT NULL: "
+                                 "pass --created-by with an auth.users id")
+            try:
+                with conn.transaction(), conn.cursor() as cursor:
+                    for table, columns in LOAD_COLUMNS.items():
+                        if not rows[table]:
+                            continue
+                        copy_started = time.perf_counter()
+                        with cursor.copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN") as copy:
+                            for row in rows[table]:
+                                copy.write_row(row)
+                        totals[table][0] += len(rows[table])
+                        totals[table][1] += time.perf_counter() - copy_started
+            except psycopg.Error as e:
+                raise SystemExit(f"Batch {batch_number} failed and was rolled back: {e}")
+            print(f"Loaded batch {batch_number} ({len(batch)} records, {time.perf_counter() - started:.1f}s elapsed)")
+    print_load_summary(totals, time.perf_counter() - started)
+    return totals
+
+def print_load_summary(totals, elapsed):
+    """Print rows and rows/s per table for a load run"""
+    print(f"\nLoad finished in {elapsed:.2f}s")
+    for table, (rows, seconds) in totals.items():
+        if not rows:
+            continue
+        rate = rows / seconds if seconds > 0 else 0.0
+        print(f"  {table:<24} {rows:>10} rows  {rate:>10.0f} rows/s")
+
+def _split_top_level(text):
+    """Split a CREATE TABLE body on commas that are outside parentheses and quotes"""
+    items, depth, quoted, current = [], 0, False, []
+    for char in text:
+        if char == "'":
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            items.append("".join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    items.append("".join(current).strip())
+    return [item for item in items if item]
+
+def _postgres_rejects(pattern):
+    """True if Postgres cannot compile the regex, e.g. a range starting at a class escape like [\\s-(]"""
+    return re.search(r"\[[^\]]*\\[sdwSDW]-[^\]]", pattern) is not None
+
+def _parse_checks(spec, table, expression):
+    """Merge the column rules a CHECK expression expresses into spec[table]"""
+    def column(name):
+        return spec[table].setdefault(name.lower(), {})
+
+    for name, values in re.findall(r"(\w+)\s+IN\s*\(([^)]*)\)", expression, re.I):
+        column(name)["choices"] = re.findall(r"'((?:[^']|'')*)'", values)
+    for name, values in re.findall(r"(\w+)\s*=\s*any\s*\(\s*array\s*\[([^\]]*)\]", expression, re.I):
+        column(name)["choices"] = re.findall(r"'((?:[^']|'')*)'", values)
+    for name, length in re.findall(r"length\s*\(\s*(\w+)\s*\)\s*=\s*(\d+)", expression, re.I):
+        column(name)["length"] = int(length)
+    for name, length in re.findall(r"length\s*\(\s*(\w+)\s*\)\s*>=\s*(\d+)", expression, re.I):
+        column(name)["min_length"] = int(length)
+    for name, operator, pattern in re.findall(r"(\w+)\s*(~\*?)\s*'((?:[^']|'')*)'", expression):
+        rules = column(name)
+        rules["pattern"] = pattern.replace("''", "'")
+        rules["ignore_case"] = operator == "~*"
+        if _postgres_rejects(rules["pattern"]):
+            rules["postgres_rejects"] = True
+    for name in re.findall(r"(\w+)\s*<=\s*CURRENT_DATE", expression, re.I):
+        column(name)["not_future"] = True
+
+def load_constraint_spec(paths=None):
+    """Derive per-column rules from the CREATE TABLE statements in SQL schema files.
+
+    Returns {table: {column: rules}}. rules may hold not_null, choices, length,
+    min_length, pattern/ignore_case, not_future and postgres_rejects (the CHECK
+    regex does not compile in Postgres, so only NULL can be inserted).
+    """
+    spec = {}
+    for path in paths or SCHEMA_FILES:
+        with open(path, encoding="utf-8") as f:
+            sql = re.sub(r"--[^\n]*", "", f.read())
+        for match in re.finditer(r"create\s+table\s+(?:if\s+not\s+exists\s+)?(?:public\.)?(\w+)\s*\((.*?)\n\s*\)\s*(?:tablespace\s+\w+\s*)?;", sql, re.I | re.S):
+            table = match.group(1).lower()
+            spec.setdefault(table, {})
+            for item in _split_top_level(match.group(2)):
+                first = re.match(r"\w+", item).group(0).lower()
+                if first in ("constraint", "check", "unique", "primary", "foreign"):
+                    checks = item
+                else:
+                    rules = spec[table].setdefault(first, {})
+                    rules["not_null"] = bool(re.search(r"\bnot\s+null\b|\bprimary\s+key\b", item, re.I))
+                    checks = item[len(first):]
+                for check in re.finditer(r"\bcheck\s*\((.*)\)", checks, re.I | re.S):
+                    _parse_checks(spec, table, check.group(1))
+    for table, columns in spec.items():
+        for name, rules in columns.items():
+            if rules.get("postgres_rejects"):
+                print(f"Warning: the {table}.{name} CHECK regex does not compile in Postgres; "
+                      f"only NULL {name} values can be inserted", file=sys.stderr)
+    return spec
+
+def check_value(value, rules):
+    """Return why `value` violates a column's rules, or None if Postgres would accept it"""
+    if value is None:
+        return "must not be null" if rules.get("not_null") else None
+    text = str(value)
+    if rules.get("postgres_rejects"):
+        return "only NULL passes this column's CHECK in Postgres"
+    if "choices" in rules and text not in rules["choices"]:
+        return f"{text!r} is not one of {rules['choices']}"
+    if "length" in rules and len(text) != rules["length"]:
+        return f"{text!r} must be {rules['length']} characters"
+    if len(text) < rules.get("min_length", 0):
+        return f"{text!r} is shorter than {rules['min_length']} characters"
+    if "pattern" in rules and not re.search(rules["pattern"], text, re.I if rules.get("ignore_case") else 0):
+        return f"{text!r} does not match {rules['pattern']}"
+    if rules.get("not_future") and text > today_date().isoformat():
+        return f"{text!r} is in the future"
+    return None
+
+def validate_individual(record, spec):
+    """List the constraint violations of a record, checked against the rows `load` would insert.
+
+    created_by is skipped: it is not part of a record. The API session fills
+    it in, and `load` takes it from --created-by, refusing children rows
+    (where it is NOT NULL) when the flag is missing.
+    """
+    errors = []
+    for table, rows in normalize_record(record, repeat("0" * 14)).items():
+        columns = LOAD_COLUMNS[table]
+        table_spec = spec.get(table, {})
+        for row in rows:
+            for name, value in zip(columns, row):
+                if name in table_spec and name != "created_by":
+                    problem = check_value(value, table_spec[name])
+                    if problem:
+                        errors.append(f"{table}.{name}: {problem}")
+    return errors
+
+def id_number_digits(rules):
+    """Width of a digits-only column, from length(col) = N or a ^[0-9]{N}$ pattern"""
+    if "length" in rules:
+        return rules["length"]
+    match = re.search(r"\{(\d+)\}\$$", rules.get("pattern", ""))
+    return int(match.group(1)) if match else None
+
+def _conform(value, rules, rng):
+    """Replace a value a column would reject with one it accepts (or NULL where allowed)"""
+    if check_value(value, rules) is None:
+        return value
+    if rules.get("postgres_rejects") and not rules.get("not_null"):
+        return None
+    if "choices" in rules:
+        return rng.choice(rules["choices"])
+    if rules.get("pattern", "").startswith("^[0-9]"):
+        length = id_number_digits(rules)
+        return "".join(rng.choice("0123456789") for _ in range(length)) if length else str(rng.randint(1, DISTRICT_CODES))
+    if "pattern" in rules:
+        # Digits-only mobile numbers satisfy every phone pattern in the schemas
+        phone = rng.choice(MOBILE_PREFIXES) + "".join(rng.choice("0123456789") for _ in range(8))
+        if check_value(phone, rules) is None:
+            return phone
+    return None if not rules.get("not_null") else value
+
+def conform_individual(individual, spec, rng, id_numbers):
+    """Rewrite the fields the schema constrains so the record's rows pass validate_individual().
+
+    `id_numbers` yields schema-shaped id_numbers: one for each additional member
+    (which `load` promotes to an individual) and one for the individual unless
+    its id_number already fits.
+    """
+    people = spec.get("individuals", {})
+    for name, aliases in VALUE_ALIASES.items():
+        if individual.get(name) in aliases:
+            individual[name] = aliases[individual[name]]
+    for name in ("gender", "marital_status", "employment_status", "district", "phone"):
+        if name in people:
+            individual[name] = _conform(individual.get(name), people[name], rng)
+    if individual["employment_status"] == "has_salary":
+        individual["salary"] = individual.get("salary") or rng.randint(500, 5000)
+    else:
+        individual["salary"] = None
+    if check_value(individual["id_number"], people.get("id_number", {})) is not None:
+        individual["id_number"] = next(id_numbers)
+    family_phone = spec.get("families", {}).get("phone")
+    if family_phone and individual["phone"] is not None and check_value(individual["phone"], family_phone):
+        individual["phone"] = None if not people.get("phone", {}).get("not_null") else individual["phone"]
+    for member in individual["additional_members"]:
+        member["id_number"] = next(id_numbers)
+        if "phone" in people:
+            member["phone_number"] = _conform(member.get("phone_number") or None, people["phone"], rng) or ""
+    children = spec.get("children", {})
+    for child in individual["children"]:
+        for name in ("gender", "school_stage"):
+            if name in children:
+                child[name] = _conform(child.get(name), children[name], rng)
+    return individual
+
+def filter_valid(records, spec, stats):
+    """Yield only records whose rows pass the spec, counting the rest in stats['invalid']"""
+    for record in records:
+        if "table" in record:
+            yield record  # households rows are conformed as they are generated
+            continue
+        errors = validate_individual(record, spec)
+        if not errors:
+            yield record
+            continue
+        stats["invalid"] += 1
+        if stats["invalid"] <= 5:
+            print(f"Skipping invalid record {record.get('id_number')}: {'; '.join(errors)}", file=sys.stderr)
+
+# Top-level fields of an individual record and their JSON types, as checked by the bench mock API
+INDIVIDUAL_SHAPE = {
+    "first_name": str,
+    "last_name": str,
+    "id_number": (str, int),
+    "date_of_birth": str,
+    "gender": str,
+    "marital_status": str,
+    "phone": (str, type(None)),
+    "district": (str, int),
+    "family_id": (str, type(None)),
+    "address": str,
+    "employment_status": str,
+    "salary": (int, float, type(None)),
+    "needs": list,
+    "additional_members": list,
+    "children": list,
+    "medical_help": dict,
+    "food_assistance": dict,
+    "marriage_assistance": dict,
+    "debt_assistance": dict,
+    "education_assistance": dict,
+    "shelter_assistance": dict,
+}
+
+def check_shape(record):
+    """Return a description of the first way a record deviates from INDIVIDUAL_SHAPE, or None"""
+    if not isinstance(record, dict):
+        return f"expected an object, got {type(record).__name__}"
+    for field, types in INDIVIDUAL_SHAPE.items():
+        if field not in record:
+            return f"missing field {field}"
+        if isinstance(record[field], bool) or not isinstance(record[field], types):
+            return f"{field} has the wrong type ({type(record[field]).__name__})"
+    return None
+
+class MockAPIHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the individuals endpoint.
+
+    Each POST sleeps for the server's `latency`, fails with a 503 at its
+    `error_rate` and, if `validate` is set, answers 400 for a payload (object
+    or array) holding a record that does not match INDIVIDUAL_SHAPE.
+    """
+    protocol_version = "HTTP/1.1"  # keep-alive, like PostgREST
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if self.server.error_rate and random.random() < self.server.error_rate:
+            return self.reply(503, {"message": "injected failure"})
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return self.reply(400, {"message": "body is not JSON"})
+        if self.server.validate:
+            for record in payload if isinstance(payload, list) else [payload]:
+                problem = check_shape(record)
+                if problem:
+                    return self.reply(400, {"message": problem})
+        self.reply(201, None)
+
+    def reply(self, status, body):
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # one line per request would drown the benchmark output
+
+def start_mock_server(latency=0.0, error_rate=0.0, validate=True, port=0):
+    """Serve MockAPIHandler from a daemon thread; returns the server and its URL"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), MockAPIHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.error_rate = error_rate
+    server.validate = validate
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/individuals"
+
+def run_benchmark(count, levels, api_url=None, seed=0, workers=1, batch_size=1, max_retries=3,
+                  latency=0.0, error_rate=0.0, validate=True):
+    """Time generation, then submission at each concurrency level; returns one report row per run.
+
+    Level 0 is the sequential requests path, any other level the aiohttp pool.
+    Without `api_url` a local MockAPIHandler server is started for the run.
+    """
+    rows = []
+    started = time.perf_counter()
+    records = list(generate_individuals_parallel(count, seed, workers))
+    elapsed = time.perf_counter() - started
+    rows.append({"stage": "generate", "concurrency": workers, "batch_size": None, "records": count,
+                 "succeeded": count, "failed": 0, "seconds": round(elapsed, 4),
+                 "records_per_s": round(count / elapsed, 1) if elapsed > 0 else 0.0})
+    server = None
+    if api_url is None:
+        server, api_url = start_mock_server(latency, error_rate, validate)
+    headers = build_headers()
+    try:
+        for level in levels:
+            # Per-record and summary lines would swamp the report table
+            with redirect_stdout(io.StringIO()):
+                if level == 0:
+                    summary = submit_individuals(records, api_url, headers, max_retries=max_retries, batch_size=batch_size)
+                else:
+                    summary = asyncio.run(submit_individuals_async(records, api_url, headers, level,
+                                                                   max_retries=max_retries, batch_size=batch_size))
+            rows.append({"stage": "submit", "concurrency": level, "batch_size": batch_size, **summary})
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+    return rows
+
+BENCH_COLUMNS = ["stage", "concurrency", "batch_size", "records", "succeeded", "failed", "retries",
+                 "seconds", "records_per_s", "p50_ms", "p95_ms", "p99_ms"]
+
+def print_benchmark_report(rows):
+    """Print benchmark rows as an aligned table"""
+    print(("{:<9}{:>12}{:>7}{:>9}{:>8}{:>12}{:>10}{:>10}{:>10}").format(
+        "stage", "concurrency", "batch", "records", "failed", "records/s", "p50 ms", "p95 ms", "p99 ms"))
+    for row in rows:
+        print(("{:<9}{:>12}{:>7}{:>9}{:>8}{:>12.1f}{:>10}{:>10}{:>10}").format(
+            row["stage"], row["concurrency"], row.get("batch_size") or "-", row["records"], row["failed"],
+            row["records_per_s"], *(row.get(key, "-") for key in ("p50_ms", "p95_ms", "p99_ms"))))
+
+def write_benchmark_report(path, rows, columns=BENCH_COLUMNS):
+    """Write benchmark rows as CSV if `path` ends in .csv, otherwise as JSON"""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        if path.endswith('.csv'):
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            json.dump(rows, f, indent=2)
+
+# Columns the individuals list searches with ilike '%term%' (src/hooks/useIndividuals.ts)
+SEARCH_COLUMNS = ["first_name", "last_name", "id_number", "phone", "description"]
+SEARCH_PAGE_SIZE = 50
+
+# What staff type into the search box, with default weights: the start of a name, a whole
+# last name, a run of an id number or phone number, a word of the description, and a
+# term matching nothing (the full-scan worst case)
+SEARCH_MIX = {"name_prefix": 4, "last_name": 2, "id_fragment": 2, "phone_fragment": 1, "description_word": 1, "miss": 1}
+
+# The select of the individuals list, embeds included, for --url replays
+SEARCH_SELECT = ("*,created_by_user:users!individuals_created_by_fkey(first_name,last_name),"
+                 "family:families!individuals_family_id_fkey(id,name,status,phone,address,district),"
+                 "assistance_details(id,assistance_type,details,created_at,updated_at),"
+                 "children(id,first_name,last_name,date_of_birth,gender,school_stage,description,parent_id,family_id),"
+                 "distribution_recipients(distributions(id,date,aid_type,description,quantity,value,status,created_at))")
+
+SEARCH_FILTER = " OR ".join(f"{column} ILIKE %(pattern)s" for column in SEARCH_COLUMNS)
+
+SEARCH_REPORT_COLUMNS = ["term_class", "queries", "errors", "mean_matches", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+
+def search_term(record, term_class, rng):
+    """Draw a term of `term_class` from `record` as someone would type it, or None if the record has nothing for it"""
+    if term_class == "name_prefix":
+        name = record.get(rng.choice(["first_name", "last_name"])) or ""
+        return name[:rng.randint(2, 4)] or None
+    if term_class == "last_name":
+        return record.get("last_name") or None
+    if term_class == "id_fragment":
+        id_number = str(record.get("id_number") or "")
+        if len(id_number) < 4:
+            return None
+        length = rng.randint(4, min(6, len(id_number)))
+        start = rng.randrange(len(id_number) - length + 1)
+        return id_number[start:start + length]
+    if term_class == "phone_fragment":
+        # A run of digits as stored, since ilike matches the formatted text
+        runs = re.findall(r"\d{3,}", record.get("phone") or "")
+        if not runs:
+            return None
+        run = rng.choice(runs)
+        length = rng.randint(3, min(5, len(run)))
+        start = rng.randrange(len(run) - length + 1)
+        return run[start:start + length]
+    if term_class == "description_word":
+        words = re.findall(r"[^\W\d_]{4,}", record.get("description") or "")
+        return rng.choice(words).lower() if words else None
+    if term_class == "miss":
+        return "".join(rng.choices("bcdfghjklmnpqrstvwxz", k=8))
+    raise ValueError(f"Unknown search term class {term_class}")
+
+def read_search_sources(path=None, dsn=None, sample_size=10000, seed=0):
+    """Up to `sample_size` individuals (reservoir-sampled from a dataset file, or drawn from the table at `dsn`)"""
+    if dsn:
+        psycopg = require_module("psycopg", "search --dsn", "psycopg[binary]")
+        with psycopg.connect(dsn) as conn:
+            cursor = conn.cursor(row_factory=psycopg.rows.dict_row)
+            return cursor.execute(f"SELECT {', '.join(SEARCH_COLUMNS)} FROM individuals ORDER BY random() LIMIT %s",
+                                  (sample_size,)).fetchall()
+    rng = random.Random(seed)
+    sample = []
+    seen = 0
+    for record in read_records(path):
+        if record.get("table", "individuals") != "individuals":
+            continue
+        seen += 1
+        if len(sample) < sample_size:
+            sample.append(record)
+        elif rng.randrange(seen) < sample_size:
+            sample[rng.randrange(sample_size)] = record
+    return sample
+
+def derive_search_terms(sources, count, seed=0, mix=None):
+    """Draw `count` (term class, term) pairs from the source individuals, classes weighted by `mix`"""
+    mix = mix or SEARCH_MIX
+    rng = random.Random(f"{seed}:search")
+    classes, weights = list(mix), list(mix.values())
+    terms = []
+    while len(terms) < count:
+        term_class = rng.choices(classes, weights)[0]
+        for _ in range(20):
+            term = search_term(rng.choice(sources), term_class, rng)
+            if term:
+                terms.append((term_class, term))
+                break
+        else:
+            print(f"Warning: nothing to draw {term_class} search terms from, leaving them out")
+            index = classes.index(term_class)
+            del classes[index], weights[index]
+            if not classes:
+                raise SystemExit("No search terms could be drawn from the individuals")
+    return terms
+
+def replay_searches(terms, dsn=None, url=None, token=None, apikey=None, concurrency=8, limit=SEARCH_PAGE_SIZE):
+    """Run every search with `concurrency` threads against Postgres or PostgREST; yield (class, seconds, matches, error).
+
+    Against Postgres a search is the page query plus the exact count, as
+    PostgREST runs them for the list; against `url` it is one request with the
+    list's select, embeds included, and Prefer: count=exact.
+    """
+    local = threading.local()
+    if dsn:
+        psycopg = require_module("psycopg", "search --dsn", "psycopg[binary]")
+        page_sql = f"SELECT * FROM individuals WHERE {SEARCH_FILTER} ORDER BY created_at DESC LIMIT %(limit)s"
+        count_sql = f"SELECT count(*) FROM individuals WHERE {SEARCH_FILTER}"
+        connections = []
+
+        def run(term):
+            if not hasattr(local, "conn"):
+                local.conn = psycopg.connect(dsn, autocommit=True)
+                connections.append(local.conn)
+            parameters = {"pattern": f"%{term}%", "limit": limit}
+            local.conn.execute(page_sql, parameters).fetchall()
+            return local.conn.execute(count_sql, parameters).fetchone()[0]
+    else:
+        headers = build_headers(token)
+        headers["Prefer"] = "count=exact"
+        if apikey:
+            headers["apikey"] = apikey
+        connections = []
+
+        def run(term):
+            if not hasattr(local, "session"):
+                local.session = requests.Session()
+                connections.append(local.session)
+            # Quoted so commas and parentheses in a term stay inside the filter value
+            condition = ",".join(f'{column}.ilike."%{term}%"' for column in SEARCH_COLUMNS)
+            response = local.session.get(url, headers=headers, timeout=60, params={
+                "select": SEARCH_SELECT, "or": f"({condition})", "order": "created_at.desc", "limit": limit})
+            response.raise_for_status()
+            return int(response.headers.get("Content-Range", "*/0").rsplit("/", 1)[1].replace("*", "0"))
+
+    def timed(item):
+        term_class, term = item
+        started = time.perf_counter()
+        try:
+            matches, error = run(term), None
+        except Exception as e:
+            matches, error = 0, str(e)
+        return term_class, time.perf_counter() - started, matches, error
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            yield from executor.map(timed, terms)
+    finally:
+        for connection in connections:
+            connection.close()
+
+def summarize_searches(results):
+    """Report rows per term class, then for all searches, from replay_searches() results"""
+    groups = {}
+    for term_class, seconds, matches, error in results:
+        groups.setdefault(term_class, []).append((seconds, matches, error))
+        groups.setdefault("all", []).append((seconds, matches, error))
+    rows = []
+    for term_class in sorted(groups, key=lambda name: (name == "all", name)):
+        entries = groups[term_class]
+        latencies = sorted(seconds for seconds, _, error in entries if error is None)
+        succeeded = len(latencies)
+        rows.append({
+            "term_class": term_class,
+            "queries": len(entries),
+            "errors": len(entries) - succeeded,
+            "mean_matches": round(sum(matches for _, matches, error in entries if error is None) / succeeded, 1) if succeeded else 0,
+            **{f"p{pct}_ms": round(percentile(latencies, pct) * 1000, 2) for pct in (50, 95, 99)},
+            "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        })
+    return rows
+
+def print_search_report(rows, elapsed):
+    """Print per-class search latency percentiles and the overall query rate"""
+    total = rows[-1]["queries"] if rows else 0
+    print(f"\n{total} searches in {elapsed:.2f}s ({total / elapsed if elapsed > 0 else 0.0:.1f}/s)")
+    print("{:<18}{:>9}{:>8}{:>10}{:>10}{:>10}{:>10}{:>10}".format(
+        "term class", "queries", "errors", "matches", "p50 ms", "p95 ms", "p99 ms", "max ms"))
+    for row in rows:
+        print("{:<18}{:>9}{:>8}{:>10}{:>10}{:>10}{:>10}{:>10}".format(
+            row["term_class"], row["queries"], row["errors"], row["mean_matches"],
+            row["p50_ms"], row["p95_ms"], row["p99_ms"], row["max_ms"]))
+
+def explain_searches(dsn, terms, limit=SEARCH_PAGE_SIZE):
+    """Print the plan and execution time of the page query for the first term of each class"""
+    psycopg = require_module("psycopg", "search --explain", "psycopg[binary]")
+    first = {}
+    for term_class, term in terms:
+        first.setdefault(term_class, term)
+    with psycopg.connect(dsn) as conn:
+        for term_class, term in first.items():
+            plan = conn.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) SELECT * FROM individuals WHERE {SEARCH_FILTER} "
+                                "ORDER BY created_at DESC LIMIT %(limit)s", {"pattern": f"%{term}%", "limit": limit}).fetchone()[0][0]
+            scans = []
+            nodes = [plan["Plan"]]
+            while nodes:
+                node = nodes.pop()
+                if "Relation Name" in node or node["Node Type"].startswith("Bitmap Index"):
+                    scans.append(f"{node['Node Type']} on {node.get('Relation Name') or node.get('Index Name')}")
+                nodes.extend(node.get("Plans", []))
+            print(f"{term_class:<18} {term!r:<14} {plan['Execution Time']:>9.2f} ms  {', '.join(scans)}")
+
+# Operations of the churn workload, with default weights: the individuals list page and the
+# admins' review queue, direct inserts, list moves through the move_individual_to_* functions
+# (07_functions.sql), and the pending request cycle of src/services/pendingRequests.ts
+CHURN_MIX = {"list": 40, "queue": 10, "insert": 10, "move": 20, "submit": 8, "revise": 4, "approve": 8}
+
+LIST_STATUSES = ["whitelist", "blacklist", "waitinglist"]
+
+# Failures counted by kind rather than as errors: SQLSTATEs of lock and uniqueness conflicts,
+# 'stale' for a row another user changed first and 'skipped' when there was nothing to act on
+CHURN_SQLSTATES = {"55P03": "lock_timeout", "40P01": "deadlock", "40001": "serialization", "23505": "duplicate"}
+CHURN_OUTCOMES = ["lock_timeout", "deadlock", "serialization", "duplicate", "stale", "skipped", "error"]
+
+CHURN_REPORT_COLUMNS = ["operation", "ops", "ok", "ok_per_s", "p50_ms", "p95_ms", "p99_ms", "max_ms"] + CHURN_OUTCOMES
+
+# Records generated per seeded chunk for inserts and submissions, and kept ready ahead of them
+CHURN_RECORD_CHUNK = 100
+CHURN_RECORD_AHEAD = 1000
+CHURN_RECORD_WORKERS = 2
+
+class ChurnConflict(Exception):
+    """An operation that lost to another user or had nothing to act on; `kind` is one of CHURN_OUTCOMES"""
+
+    def __init__(self, kind, message=None):
+        super().__init__(message or kind)
+        self.kind = kind
+
+class ChurnState:
+    """Rows the virtual users share: individual ids, pending request ids and the record stream.
+
+    Moves pick among the first `hot_rows` individuals when set (the newest, as
+    listed), and approvals among the `queue_window` oldest pending requests, so
+    concurrent users meet on the same rows the way staff working one list do.
+    """
+
+    def __init__(self, seed, spec, hot_rows=0, queue_window=10):
+        self.lock = threading.Lock()
+        self.individuals = []
+        self.pending = []
+        self.hot_rows = hot_rows
+        self.queue_window = queue_window
+        # Generated ahead in worker processes, so Faker neither shows in the measured
+        # latencies nor holds the GIL the virtual users need
+        self.records = queue.Queue(maxsize=CHURN_RECORD_AHEAD)
+        self.stopped = threading.Event()
+        self.producer = threading.Thread(target=self._generate, args=(seed, spec), daemon=True)
+        self.producer.start()
+        member_numbers = UniqueNumbers(seed, stream="churn_members")
+        self.member_ids = (str(member_numbers.id_number(n)) for n in counter())
+
+    def _generate(self, seed, spec):
+        numbers = UniqueNumbers(seed, stream="churn")
+        shards = ((seed, shard, shard * CHURN_RECORD_CHUNK, CHURN_RECORD_CHUNK, spec, None, numbers) for shard in counter())
+        records = run_shards(generate_shard, shards, CHURN_RECORD_WORKERS)
+        try:
+            for record in records:
+                while not self.stopped.is_set():
+                    try:
+                        self.records.put(record, timeout=0.1)
+                        break
+                    except queue.Full:
+                        pass
+                else:
+                    return
+        finally:
+            # Shuts the worker pool down, cancelling the shards not yet started
+            records.close()
+
+    def close(self):
+        """Stop generating records and wait for the worker processes to exit"""
+        self.stopped.set()
+        self.producer.join()
+
+    def next_record(self):
+        """The next generated record; raises once the producer has died and the queue is drained"""
+        while True:
+            try:
+                return self.records.get(timeout=0.1)
+            except queue.Empty:
+                if not self.producer.is_alive():
+                    raise RuntimeError("Record generation for churn stopped; see the error above")
+
+    def wait_for_records(self, count=CHURN_RECORD_CHUNK * CHURN_RECORD_WORKERS):
+        """Block until `count` records are ready, so the first inserts do not wait on the worker start-up"""
+        while self.records.qsize() < count:
+            if not self.producer.is_alive():
+                raise SystemExit("Record generation for churn stopped; see the error above")
+            time.sleep(0.05)
+
+    def next_member_id(self):
+        with self.lock:
+            return next(self.member_ids)
+
+    def pick_individual(self, rng):
+        with self.lock:
+            if not self.individuals:
+                raise ChurnConflict("skipped", "no individuals")
+            return self.individuals[rng.randrange(min(self.hot_rows or len(self.individuals), len(self.individuals)))]
+
+    def add_individual(self, individual_id):
+        with self.lock:
+            self.individuals.insert(0, individual_id)
+
+    def pick_pending(self, rng, window=None):
+        with self.lock:
+            if not self.pending:
+                raise ChurnConflict("skipped", "no pending requests")
+            return self.pending[rng.randrange(min(window or len(self.pending), len(self.pending)))]
+
+    def add_pending(self, request_id):
+        with self.lock:
+            self.pending.append(request_id)
+
+    def remove_pending(self, request_id):
+        with self.lock:
+            if request_id in self.pending:
+                self.pending.remove(request_id)
+
+def churn_error_kind(error):
+    """Outcome of a failed operation: its ChurnConflict kind, a known SQLSTATE, or 'error'"""
+    if isinstance(error, ChurnConflict):
+        return error.kind
+    return CHURN_SQLSTATES.get(getattr(error, "sqlstate", None), "error")
+
+class PostgresChurnSession:
+    """One virtual user's connection, running each operation as the app issues it.
+
+    `lock_timeout` (seconds) makes a blocked row lock fail as lock_timeout
+    instead of waiting on the other user indefinitely.
+    """
+
+    def __init__(self, dsn, state, user_id, lock_timeout=2.0):
+        psycopg = require_module("psycopg", "churn --dsn", "psycopg[binary]")
+        self.Jsonb = importlib.import_module("psycopg.types.json").Jsonb
+        self.conn = psycopg.connect(dsn, autocommit=True)
+        if lock_timeout:
+            self.conn.execute(f"SET lock_timeout = {int(lock_timeout * 1000)}")
+        self.state = state
+        self.user_id = user_id
+
+    def close(self):
+        self.conn.close()
+
+    def _insert_rows(self, cursor, rows):
+        for table, columns in LOAD_COLUMNS.items():
+            if rows.get(table):
+                cursor.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})",
+                                   rows[table])
+
+    def list(self, rng):
+        """A page of one list, newest first, with its exact count"""
+        status = rng.choice(LIST_STATUSES)
+        self.conn.execute("SELECT * FROM individuals WHERE list_status = %s ORDER BY created_at DESC LIMIT %s",
+                          (status, SEARCH_PAGE_SIZE)).fetchall()
+        self.conn.execute("SELECT count(*) FROM individuals WHERE list_status = %s", (status,)).fetchone()
+
+    def queue(self, rng):
+        """Every pending request, newest first, as usePendingRequests loads them for an admin"""
+        self.conn.execute("SELECT * FROM pending_requests ORDER BY submitted_at DESC").fetchall()
+
+    def insert(self, rng):
+        """A new individual with its family and children, in one transaction"""
+        rows = normalize_record(self.state.next_record(), iter(self.state.next_member_id, None), self.user_id)
+        with self.conn.transaction(), self.conn.cursor() as cursor:
+            self._insert_rows(cursor, rows)
+        self.state.add_individual(rows["individuals"][0][0])
+
+    def move(self, rng):
+        """Read an individual, then move it to another list with its current data"""
+        individual_id = self.state.pick_individual(rng)
+        row = self.conn.execute("SELECT to_jsonb(i) FROM individuals i WHERE id = %s", (individual_id,)).fetchone()
+        if row is None:
+            raise ChurnConflict("stale", "individual deleted")
+        data = row[0]
+        target = rng.choice([status for status in LIST_STATUSES if status != data["list_status"]])
+        moved = self.conn.execute(f"SELECT move_individual_to_{target}(%s, %s)", (individual_id, self.Jsonb(data))).fetchone()[0]
+        if moved is None:
+            raise ChurnConflict("stale", "individual deleted")
+
+    def submit(self, rng):
+        """Check the id_number is new, then file an individual request for review"""
+        record = self.state.next_record()
+        if self.conn.execute("SELECT id FROM individuals WHERE id_number = %s", (str(record["id_number"]),)).fetchone():
+            raise ChurnConflict("duplicate", "id_number already exists")
+        request_id = self.conn.execute(
+            "INSERT INTO pending_requests (type, data, status, submitted_by) VALUES ('individual', %s, 'pending', %s) RETURNING id",
+            (self.Jsonb(record, encode_json), self.user_id)).fetchone()[0]
+        self.state.add_pending(request_id)
+
+    def revise(self, rng):
+        """Edit a pending request: the next version replaces the data, unless another edit or the approval came first"""
+        request_id = self.state.pick_pending(rng)
+        row = self.conn.execute("SELECT data, version, status FROM pending_requests WHERE id = %s", (request_id,)).fetchone()
+        if row is None or row[2] == "approved":
+            self.state.remove_pending(request_id)
+            raise ChurnConflict("stale", "request already approved")
+        data, version, _ = row
+        data["description"] = f"{data.get('description') or ''} (revision {version + 1})".strip()
+        updated = self.conn.execute(
+            "UPDATE pending_requests SET data = %s, status = 'pending', reviewed_by = NULL, reviewed_at = NULL, "
+            "admin_comment = NULL, version = version + 1, previous_version_id = id "
+            "WHERE id = %s AND version = %s AND status <> 'approved'", (self.Jsonb(data), request_id, version))
+        if updated.rowcount == 0:
+            raise ChurnConflict("stale", "request changed since it was read")
+
+    def approve(self, rng):
+        """Approve one of the oldest pending requests: create its individual and family, then mark it approved"""
+        request_id = self.state.pick_pending(rng, self.state.queue_window)
+        created = None
+        with self.conn.transaction(), self.conn.cursor() as cursor:
+            row = cursor.execute("SELECT data, status, submitted_by FROM pending_requests WHERE id = %s FOR UPDATE",
+                                 (request_id,)).fetchone()
+            if row is None or row[1] != "pending":
+                self.state.remove_pending(request_id)
+                raise ChurnConflict("stale", "request already reviewed")
+            data, _, submitted_by = row
+            if not cursor.execute("SELECT id FROM individuals WHERE id_number = %s", (str(data["id_number"]),)).fetchone():
+                rows = normalize_record(data, iter(self.state.next_member_id, None), submitted_by)
+                self._insert_rows(cursor, rows)
+                created = rows["individuals"][0][0]
+            cursor.execute("UPDATE pending_requests SET status = 'approved', reviewed_by = %s, reviewed_at = now() WHERE id = %s",
+                           (self.user_id, request_id))
+        self.state.remove_pending(request_id)
+        if created:
+            self.state.add_individual(created)
+
+def open_churn_database(dsn, state, user_id=None, sample=100000):
+    """Fill `state` from the database (newest individuals first, oldest pending requests first); returns the acting user id"""
+    psycopg = require_module("psycopg", "churn --dsn", "psycopg[binary]")
+    with psycopg.connect(dsn) as conn:
+        if user_id is None:
+            row = conn.execute("SELECT id FROM auth.users ORDER BY id LIMIT 1").fetchone()
+            if row is None:
+                raise SystemExit("No auth.users row to submit and review requests as; pass --user")
+            user_id = row[0]
+        state.individuals = [row[0] for row in conn.execute(
+            "SELECT id FROM individuals ORDER BY created_at DESC LIMIT %s", (sample,))]
+        state.pending = [row[0] for row in conn.execute(
+            "SELECT id FROM pending_requests WHERE status = 'pending' ORDER BY submitted_at")]
+    return user_id
+
+class MemoryChurnStore:
+    """In-process stand-in for the database, shared by every virtual user.
+
+    Each statement takes `latency` seconds, and a write holds its row's lock
+    for that long, so users that pick the same row queue behind each other and
+    fail with lock_timeout after `lock_timeout` seconds. id_numbers are unique
+    and request versions are checked as in Postgres. Deadlocks never occur.
+    """
+
+    def __init__(self, state, rows=1000, latency=0.002, lock_timeout=2.0):
+        self.state = state
+        self.latency = latency
+        self.lock_timeout = lock_timeout
+        self.guard = threading.Lock()
+        self.row_locks = {}
+        self.individuals = {}
+        self.id_numbers = set()
+        self.requests = {}
+        for _ in range(rows):
+            individual_id = uuid.uuid4()
+            id_number = state.next_member_id()
+            self.individuals[individual_id] = {"id_number": id_number, "list_status": "whitelist"}
+            self.id_numbers.add(id_number)
+            state.individuals.append(individual_id)
+
+    def close(self):
+        pass
+
+    def statement(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    @contextmanager
+    def locked(self, key):
+        with self.guard:
+            lock = self.row_locks.setdefault(key, threading.Lock())
+        if not lock.acquire(timeout=self.lock_timeout or -1):
+            raise ChurnConflict("lock_timeout", f"row {key} stayed locked")
+        try:
+            self.statement()
+            yield
+        finally:
+            lock.release()
+
+    def add_individual(self, id_number):
+        with self.guard:
+            if id_number in self.id_numbers:
+                raise ChurnConflict("duplicate", "id_number already exists")
+            self.id_numbers.add(id_number)
+            individual_id = uuid.uuid4()
+            self.individuals[individual_id] = {"id_number": id_number, "list_status": "whitelist"}
+        return individual_id
+
+    def list(self, rng):
+        self.statement()
+        self.statement()
+
+    def queue(self, rng):
+        self.statement()
+
+    def insert(self, rng):
+        record = self.state.next_record()
+        self.statement()
+        self.state.add_individual(self.add_individual(str(record["id_number"])))
+
+    def move(self, rng):
+        individual_id = self.state.pick_individual(rng)
+        self.statement()
+        with self.locked(individual_id):
+            row = self.individuals[individual_id]
+            row["list_status"] = rng.choice([status for status in LIST_STATUSES if status != row["list_status"]])
+
+    def submit(self, rng):
+        record = self.state.next_record()
+        self.statement()
+        if str(record["id_number"]) in self.id_numbers:
+            raise ChurnConflict("duplicate", "id_number already exists")
+        request_id = uuid.uuid4()
+        with self.locked(request_id):
+            self.requests[request_id] = {"id_number": str(record["id_number"]), "status": "pending", "version": 1}
+        self.state.add_pending(request_id)
+
+    def revise(self, rng):
+        request_id = self.state.pick_pending(rng)
+        self.statement()
+        request = self.requests[request_id]
+        version = request["version"]
+        if request["status"] == "approved":
+            self.state.remove_pending(request_id)
+            raise ChurnConflict("stale", "request already approved")
+        with self.locked(request_id):
+            if request["version"] != version or request["status"] == "approved":
+                raise ChurnConflict("stale", "request changed since it was read")
+            request["version"] += 1
+
+    def approve(self, rng):
+        request_id = self.state.pick_pending(rng, self.state.queue_window)
+        created = None
+        with self.locked(request_id):
+            request = self.requests[request_id]
+            if request["status"] != "pending":
+                self.state.remove_pending(request_id)
+                raise ChurnConflict("stale", "request already reviewed")
+            self.statement()
+            if request["id_number"] not in self.id_numbers:
+                created = self.add_individual(request["id_number"])
+            request["status"] = "approved"
+        self.state.remove_pending(request_id)
+        if created:
+            self.state.add_individual(created)
+
+def run_churn(new_session, users, mix=None, duration=30.0, operations=None, seed=0, think=0.0):
+    """Run `users` virtual users, each on its own new_session(), drawing operations from `mix`.
+
+    Stops after `duration` seconds or `operations` operations, whichever comes
+    first, or on Ctrl-C. Each user waits an exponential think time of mean
+    `think` seconds between operations. Returns the (operation, seconds,
+    outcome) results and the elapsed time.
+    """
+    mix = mix or CHURN_MIX
+    names, weights = list(mix), list(mix.values())
+    stop = threading.Event()
+    issued = counter()
+    results = []
+    errors = []
+
+    def virtual_user(number):
+        rng = random.Random(f"{seed}:churn:{number}")
+        session = new_session()
+        try:
+            while not stop.is_set():
+                if operations is not None and next(issued) >= operations:
+                    break
+                name = rng.choices(names, weights)[0]
+                started = time.perf_counter()
+                try:
+                    getattr(session, name)(rng)
+                    outcome = "ok"
+                except Exception as e:
+                    outcome = churn_error_kind(e)
+                    if outcome == "error":
+                        errors.append(f"{name}: {e}")
+                results.append((name, time.perf_counter() - started, outcome))
+                if think:
+                    stop.wait(rng.expovariate(1 / think))
+        finally:
+            session.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=virtual_user, args=(number,), daemon=True) for number in range(users)]
+    for thread in threads:
+        thread.start()
+    try:
+        deadline = started + duration if duration else None
+        for thread in threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.perf_counter()))
+    except KeyboardInterrupt:
+        print("\nStopping the virtual users...")
+    stop.set()
+    for thread in threads:
+        thread.join()
+    for message in errors[:5]:
+        print(f"Error: {message}", file=sys.stderr)
+    if len(errors) > 5:
+        print(f"... and {len(errors) - 5} more errors", file=sys.stderr)
+    return results, time.perf_counter() - started
+
+def summarize_churn(results, elapsed):
+    """Report rows per operation, then for all of them, from run_churn() results"""
+    groups = {}
+    for name, seconds, outcome in results:
+        groups.setdefault(name, []).append((seconds, outcome))
+        groups.setdefault("all", []).append((seconds, outcome))
+    rows = []
+    for name in sorted(groups, key=lambda name: (name == "all", name)):
+        entries = groups[name]
+        latencies = sorted(seconds for seconds, outcome in entries if outcome == "ok")
+        rows.append({
+            "operation": name,
+            "ops": len(entries),
+            "ok": len(latencies),
+            "ok_per_s": round(len(latencies) / elapsed, 1) if elapsed > 0 else 0.0,
+            **{f"p{pct}_ms": round(percentile(latencies, pct) * 1000, 2) for pct in (50, 95, 99)},
+            "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+            **{outcome: sum(1 for _, entry in entries if entry == outcome) for outcome in CHURN_OUTCOMES},
+        })
+    return rows
+
+def print_churn_report(rows, elapsed, users):
+    """Print throughput, latency percentiles of successful operations and failures by kind"""
+    total = rows[-1]["ops"] if rows else 0
+    print(f"\n{total} operations by {users} virtual users in {elapsed:.2f}s")
+    outcomes = [outcome for outcome in CHURN_OUTCOMES if any(row[outcome] for row in rows)]
+    header = "{:<10}{:>8}{:>8}{:>8}{:>10}{:>10}{:>10}{:>10}".format("operation", "ops", "ok", "ok/s", "p50 ms", "p95 ms", "p99 ms", "max ms")
+    print(header + "".join(f"{outcome:>14}" for outcome in outcomes))
+    for row in rows:
+        print("{:<10}{:>8}{:>8}{:>8}{:>10}{:>10}{:>10}{:>10}".format(
+            row["operation"], row["ops"], row["ok"], row["ok_per_s"], row["p50_ms"], row["p95_ms"], row["p99_ms"], row["max_ms"])
+            + "".join(f"{row[outcome]:>14}" for outcome in outcomes))
+
+def _section_name(statement):
+    """Name a top-level statement of generate_fake_individual by the variable it builds"""
+    if isinstance(statement, ast.Assign) and isinstance(statement.targets[0], ast.Name):
+        return statement.targets[0].id
+    for node in ast.walk(statement):
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == "append" \
+                and isinstance(node.func.value, ast.Name):
+            return node.func.value.id
+    for node in ast.walk(statement):
+        if isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name):
+            return node.targets[0].id
+    return "other"
+
+@lru_cache(maxsize=None)
+def profile_sites(function):
+    """Map each source line of `function` to the (section, field) it builds.
+
+    The section is the variable a top-level statement builds (medical_help,
+    children, individual); the field is the innermost dict key or assigned
+    name or struct field around the line, or the section itself.
+    """
+    source = textwrap.dedent(inspect.getsource(function))
+    offset = function.__code__.co_firstlineno - 1
+    sites = {}
+    for statement in ast.parse(source).body[0].body:
+        section = _section_name(statement)
+        for line in range(statement.lineno, statement.end_lineno + 1):
+            sites[offset + line] = (section, section)
+        # ast.walk is breadth-first, so inner keys and assignments overwrite outer ones
+        for node in ast.walk(statement):
+            if isinstance(node, ast.Dict):
+                spans = [(key.value, value) for key, value in zip(node.keys, node.values) if isinstance(key, ast.Constant)]
+            elif isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id[0].isupper():
+                spans = [(keyword.arg, keyword.value) for keyword in node.keywords]  # a record struct's fields
+            elif isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name) and node is not statement:
+                spans = [(node.targets[0].id, node.value)]
+            else:
+                continue
+            for field, value in spans:
+                for line in range(value.lineno, value.end_lineno + 1):
+                    sites[offset + line] = (section, field)
+    return sites
+
+class ProfiledProvider:
+    """Proxy charging every call on a Faker or random object to the field that made it.
+
+    `stats` maps (section, field, provider) to [calls, wall ns, CPU ns, peak
+    allocated bytes, net allocated blocks]; the allocation columns are only
+    filled while tracemalloc is tracing.
+    """
+
+    def __init__(self, target, name, stats, sites=None, code=None):
+        self.target = target
+        self.name = name
+        self.stats = stats
+        self.sites = sites if sites is not None else profile_sites(generate_fake_individual)
+        self.code = code or generate_fake_individual.__code__
+
+    def __getattr__(self, attribute):
+        value = getattr(self.target, attribute)
+        if attribute == "unique":
+            return ProfiledProvider(value, f"{self.name}.unique", self.stats, self.sites, self.code)
+        if not callable(value):
+            return value
+        provider = f"{self.name}.{attribute}"
+
+        def call(*args, **kwargs):
+            caller = sys._getframe(1)
+            if caller.f_code is self.code:
+                section, field = self.sites.get(caller.f_lineno, ("other", "other"))
+            else:
+                section, field = caller.f_code.co_name, str(caller.f_lineno)
+            tracing = tracemalloc.is_tracing()
+            if tracing:
+                current = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                blocks = sys.getallocatedblocks()
+            cpu = time.thread_time_ns()
+            wall = time.perf_counter_ns()
+            result = value(*args, **kwargs)
+            wall = time.perf_counter_ns() - wall
+            cpu = time.thread_time_ns() - cpu
+            entry = self.stats.setdefault((section, field, provider), [0, 0, 0, 0, 0])
+            entry[0] += 1
+            entry[1] += wall
+            entry[2] += cpu
+            if tracing:
+                entry[3] += tracemalloc.get_traced_memory()[1] - current
+                entry[4] += sys.getallocatedblocks() - blocks
+            return result
+
+        return call
+
+def profile_generation(count, seed=0, pool_path=None, memory=True):
+    """Generate `count` records through ProfiledProviders and return (stats, totals).
+
+    Times come from a plain pass. With `memory`, a second pass with the same
+    seed runs under tracemalloc for the allocation columns, so tracing does not
+    distort the times. `totals` holds the records, wall and CPU ns of whole
+    generate_fake_individual calls, and whether allocations were measured.
+    """
+    stats = {}
+    totals = {"records": count, "wall_ns": 0, "cpu_ns": 0, "allocations": memory}
+    for tracing in ((False, True) if memory else (False,)):
+        profile_fake = Faker()
+        profile_fake.seed_instance(seed)
+        rng = random.Random(seed)
+        source = PooledFaker(profile_fake, open_text_pools(pool_path), rng) if pool_path else profile_fake
+        pass_stats = {}
+        fake_proxy = ProfiledProvider(source, "fake", pass_stats)
+        rng_proxy = ProfiledProvider(rng, "rng", pass_stats)
+        numbers = UniqueNumbers(seed)
+        if tracing:
+            tracemalloc.start()
+        try:
+            for index in range(count):
+                cpu = time.thread_time_ns()
+                wall = time.perf_counter_ns()
+                generate_fake_individual(fake_proxy, rng_proxy, id_number=numbers.id_number(index))
+                if not tracing:
+                    totals["wall_ns"] += time.perf_counter_ns() - wall
+                    totals["cpu_ns"] += time.thread_time_ns() - cpu
+        finally:
+            if tracing:
+                tracemalloc.stop()
+        for key, (calls, wall, cpu, peak, blocks) in pass_stats.items():
+            entry = stats.setdefault(key, [0, 0, 0, 0, 0])
+            if tracing:
+                entry[3] += peak
+                entry[4] += blocks
+            else:
+                entry[:3] = [calls, wall, cpu]
+    return stats, totals
+
+def print_profile(stats, totals, top=25):
+    """Print the costliest (section, field, provider) entries by wall time, then the totals per section"""
+    total_wall = totals["wall_ns"] or 1
+    records = totals["records"] or 1
+    print(f"\nProfiled {totals['records']} records: {totals['wall_ns'] / records / 1000:.1f} µs wall, "
+          f"{totals['cpu_ns'] / records / 1000:.1f} µs CPU per record")
+    ranked = sorted(stats.items(), key=lambda item: item[1][1], reverse=True)
+    print("{:<22} {:<34} {:<30} {:>8} {:>10} {:>7} {:>10} {:>10} {:>8}".format(
+        "section", "field", "provider", "calls", "wall ms", "wall %", "cpu ms", "peak KiB", "blocks"))
+    for (section, field, provider), (calls, wall, cpu, peak, blocks) in ranked[:top]:
+        allocations = (f"{peak / 1024:.1f}", blocks) if totals["allocations"] else ("-", "-")
+        print("{:<22} {:<34} {:<30} {:>8} {:>10.1f} {:>6.1f}% {:>10.1f} {:>10} {:>8}".format(
+            section, field[:34], provider, calls, wall / 1e6, 100 * wall / total_wall, cpu / 1e6, *allocations))
+    if len(ranked) > top:
+        print(f"... {len(ranked) - top} more")
+    sections = {}
+    for (section, _, _), (calls, wall, cpu, peak, blocks) in stats.items():
+        entry = sections.setdefault(section, [0, 0, 0])
+        entry[0] += calls
+        entry[1] += wall
+        entry[2] += cpu
+    unattributed = totals["wall_ns"] - sum(entry[1] for entry in sections.values())
+    print("\n{:<22} {:>8} {:>10} {:>7} {:>10}".format("section", "calls", "wall ms", "wall %", "cpu ms"))
+    for section, (calls, wall, cpu) in sorted(sections.items(), key=lambda item: item[1][1], reverse=True):
+        print("{:<22} {:>8} {:>10.1f} {:>6.1f}% {:>10.1f}".format(section, calls, wall / 1e6, 100 * wall / total_wall, cpu / 1e6))
+    # Building the dicts and lists themselves, plus the profiler's own overhead
+    print("{:<22} {:>8} {:>10.1f} {:>6.1f}%".format("(outside providers)", "", unattributed / 1e6, 100 * unattributed / total_wall))
+
+def write_collapsed_stacks(path, stats, totals):
+    """Write wall µs as collapsed stacks (frame;frame;frame value) for flamegraph.pl, speedscope or inferno"""
+    with open(path, 'w') as f:
+        attributed = 0
+        for (section, field, provider), (calls, wall, cpu, peak, blocks) in sorted(stats.items()):
+            attributed += wall
+            f.write(f"generate_fake_individual;{section};{field};{provider} {wall // 1000}\n")
+        f.write(f"generate_fake_individual {max(0, totals['wall_ns'] - attributed) // 1000}\n")
+
+def taken_column(dsn, column):
+    """(count, values) of a non-null individuals column, streamed with a server-side cursor"""
+    psycopg = require_module("psycopg", "taken --dsn", "psycopg[binary]")
+    with psycopg.connect(dsn) as conn:
+        count = conn.execute(f"SELECT count({column}) FROM individuals").fetchone()[0]
+
+    def values():
+        with psycopg.connect(dsn) as conn, conn.cursor(name=f"taken_{column}") as cursor:
+            cursor.execute(f"SELECT {column} FROM individuals WHERE {column} IS NOT NULL")
+            for row in cursor:
+                yield row[0]
+    return count, values()
+
+def taken_lines(path):
+    """(count, values) of a one-value-per-line export, read twice: once to size the filter"""
+    with open_stream(path, 'r', infer_compression(path)) as stream:
+        count = sum(1 for line in stream if line.strip())
+
+    def values():
+        with open_stream(path, 'r', infer_compression(path)) as stream:
+            for line in stream:
+                if line.strip():
+                    yield line.strip()
+    return count, values()
+
+def unique_numbers(args, seed, parser, stream="records"):
+    """The UniqueNumbers of the --taken/--unique-phones/--id-seed/--id-offset options, or None for the default"""
+    if not (args.taken or args.unique_phones or args.id_seed is not None or args.id_offset):
         return None
+    if args.id_offset < 0:
+        parser.error('--id-offset must be non-negative')
+    if args.taken:
+        try:
+            open_taken(args.taken)
+        except (OSError, ValueError) as e:
+            parser.error(f'--taken: {e}')
+    return UniqueNumbers(seed if args.id_seed is None else args.id_seed, args.id_offset, args.taken, args.unique_phones, stream)
 
 def main():
     """Main function to generate and submit fake individuals"""
     parser = argparse.ArgumentParser(description='Generate fake individual data and submit to API')
     parser.add_argument('-n', '--number', type=int, default=1, help='Number of fake individuals to generate')
-    parser.add_argument('-o', '--output', help='Output JSON file path (if you want to save the data)')
+    parser.add_argument('-o', '--output', help="Output file path; .ndjson/.jsonl streams newline-delimited JSON, .gz/.zst compresses, '-' writes NDJSON to stdout")
+    parser.add_argument('-i', '--input', help="Read records from a JSON/NDJSON file (or '-' for stdin) instead of generating them")
     parser.add_argument('-s', '--submit', action='store_true', help='Submit data to API')
     parser.add_argument('-u', '--url', default=API_URL, help='API URL for submission')
     parser.add_argument('-t', '--token', help='JWT token for authentication')
+    parser.add_argument('-c', '--concurrency', type=int, help='Submit with up to N concurrent requests over pooled keep-alive connections (requires aiohttp)')
+    parser.add_argument('--format', choices=['json', 'ndjson', 'msgpack', 'parquet', 'arrow'], help='Output format (default: inferred from the output file name; msgpack requires msgpack)')
+    parser.add_argument('--compress', choices=['gzip', 'zstd'], help='Output compression (default: inferred from the output file name)')
+    parser.add_argument('--chunk-size', type=int, default=1000, help='Number of records buffered between output flushes')
+    parser.add_argument('-w', '--workers', type=int, help='Generate records across N processes (implies seeded generation)')
+    parser.add_argument('--seed', type=int, help='Master seed; the same seed reproduces the same records for any --workers')
+    parser.add_argument('--backend', choices=['records', 'columnar'], default='records', help='columnar draws whole NumPy/Arrow columns at once and writes Parquet/Arrow IPC (requires numpy and pyarrow)')
+    parser.add_argument('--batch-rows', type=int, default=65536, help='Rows per Arrow batch with --backend columnar')
+    parser.add_argument('--pool-size', type=int, default=2000, help='Faker values pre-generated per text field with --backend columnar or --pool-cache')
+    parser.add_argument('--pool-cache', metavar='DIR', help='Sample names, addresses, jobs and texts from deduplicated pools memory-mapped from DIR, built there on first use per locale, seed and --pool-size')
+    parser.add_argument('--strict', action='store_true', help='Generate records that satisfy the CHECK constraints in the --schema files and drop any record that still fails them')
+    parser.add_argument('--schema', action='append', help='SQL schema file the --strict constraints are read from (repeatable; default: 02_individuals.sql, 03_families.sql, childrenSchema.sql)')
+    parser.add_argument('--journal', help='Submission journal file; a rerun with the same --seed or --input skips records already acknowledged')
+    parser.add_argument('--rate', type=float, help='Cap submissions at this many requests per second')
+    parser.add_argument('--max-retries', type=int, default=5, help='Retries for 429/502/503/504 responses and connection errors, with jittered exponential backoff')
+    parser.add_argument('--adaptive', action='store_true', help='Adjust in-flight requests AIMD-style up to --concurrency based on latency and errors')
+    parser.add_argument('-b', '--batch-size', type=int, default=1, help='Records per request, sent as a JSON array; rejected batches are bisected to isolate bad records')
+    parser.add_argument('--profile', action='store_true', help='Generate -n records in-process and rank the sections, fields and Faker/random providers of generate_fake_individual by wall time, with CPU time and allocations')
+    parser.add_argument('--profile-allocations', action=argparse.BooleanOptionalAction, default=True, help='With --profile, measure allocations in a second pass under tracemalloc, which is several times slower than the timed pass (default: on)')
+    parser.add_argument('--profile-stacks', help='With --profile, also write collapsed stacks of wall µs to this file for flamegraph.pl or speedscope')
+    parser.add_argument('--latency-target', type=float, help='Latency in ms above which --adaptive backs off (default: 3x the best observed latency)')
+    parser.add_argument('--taken', help='Filter file from the taken command; id_numbers (and phones, with --unique-phones) found in it are never issued')
+    parser.add_argument('--unique-phones', action='store_true', help='Replace every phone with a distinct mobile number from a seeded permutation')
+    parser.add_argument('--id-seed', type=int, help='Key of the id_number and phone permutations (default: --seed); machines sharing it draw disjoint values at disjoint --id-offset ranges')
+    parser.add_argument('--id-offset', type=int, default=0, help='First permutation index, e.g. 0 on one machine and 1000000000 on the next')
     
-    args = parser.parse_args()
+    subparsers = parser.add_subparsers(dest='command')
+    load_parser = subparsers.add_parser('load', help='Bulk load generated records into Postgres with COPY (requires psycopg)')
+    load_parser.add_argument('input', nargs='?', default='-', help="JSON/NDJSON records file, or '-' for stdin (default)")
+    load_parser.add_argument('--dsn', default=os.environ.get('DATABASE_URL'), help='Postgres connection string (default: $DATABASE_URL)')
+    load_parser.add_argument('--batch-size', type=int, default=10000, help='Records per COPY transaction')
+    load_parser.add_argument('--created-by', help='auth.users id recorded as created_by on loaded rows; required when they include children')
+    load_parser.add_argument('--strict', action='store_true', help='Validate records against the --schema constraints and skip invalid ones instead of failing the batch')
+    load_parser.add_argument('--schema', action='append', help='SQL schema file to validate against (repeatable)')
     
-    individuals = []
-    for _ in range(args.number):
-        individual = generate_fake_individual()
-        individuals.append(individual)
-        
-        if args.submit:
-            headers = {"Content-Type": "application/json"}
-            if args.token:
-                headers["Authorization"] = f"Bearer {args.token}"
-            
-            result = submit_individual(individual, args.url, headers)
-            if result:
-                print(f"Successfully submitted individual: {individual['first_name']} {individual['last_name']}")
+    households_parser = subparsers.add_parser('households', help='Generate linked households as families, individuals, family_members and children rows for load; children rows have no created_by, so load them with --created-by')
+    households_parser.add_argument('-n', '--number', type=int, default=1, help='Number of households to generate')
+    households_parser.add_argument('-o', '--output', default='-', help="NDJSON file of table rows in foreign-key order, .gz/.zst compresses, '-' for stdout (default)")
+    households_parser.add_argument('--sizes', help="Household size distribution as size:weight pairs, e.g. '1:2,2:3,4:5' (default: {})".format(
+        ','.join(f'{size}:{weight}' for size, weight in HOUSEHOLD_SIZES.items())))
+    households_parser.add_argument('--seed', type=int, help='Master seed; the same seed reproduces the same households for any --workers')
+    households_parser.add_argument('-w', '--workers', type=int, default=1, help='Generate households across N processes')
+    households_parser.add_argument('--schema', action='append', help='SQL schema file whose constraints the rows are conformed to (repeatable)')
+    households_parser.add_argument('--pool-cache', metavar='DIR', help='Sample text fields from the pool cache in DIR, as for the main command')
+    households_parser.add_argument('--pool-size', type=int, default=2000, help='Values per text field in the pool cache')
+    households_parser.add_argument('--chunk-size', type=int, default=1000, help='Number of rows buffered between output flushes')
+    households_parser.add_argument('--taken', help='Filter file from the taken command; id_numbers (and phones, with --unique-phones) found in it are never issued')
+    households_parser.add_argument('--unique-phones', action='store_true', help='Replace every phone with a distinct mobile number from a seeded permutation')
+    households_parser.add_argument('--id-seed', type=int, help='Key of the id_number and phone permutations (default: --seed)')
+    households_parser.add_argument('--id-offset', type=int, default=0, help='First permutation index, so machines sharing --id-seed draw disjoint values')
+    
+    taken_parser = subparsers.add_parser('taken', help='Build a Bloom filter of the id_numbers and phones already in use, for --taken')
+    taken_parser.add_argument('-o', '--output', required=True, help='Filter file to write')
+    taken_parser.add_argument('--dsn', help='Read individuals.id_number and individuals.phone from this database')
+    taken_parser.add_argument('--id-numbers', help='Or read id_numbers from this export, one per line (optionally .gz/.zst)')
+    taken_parser.add_argument('--phones', help='And phones from this export, one per line')
+    taken_parser.add_argument('--error-rate', type=float, default=0.001, help='False positive rate the filters are sized for; a false positive only skips a free value')
+    
+    distributions_parser = subparsers.add_parser('distributions', help='Generate distribution history rows for existing individuals, for load')
+    distributions_parser.add_argument('-o', '--output', default='-', help="NDJSON file of distributions and distribution_recipients rows, .gz/.zst compresses, '-' for stdout (default)")
+    distributions_parser.add_argument('--individuals', help='households rows file (NDJSON/JSON, optionally compressed) whose individuals receive the aid')
+    distributions_parser.add_argument('--dsn', help='Read recipient ids from the individuals table of this database instead')
+    distributions_parser.add_argument('--events', type=int, default=1000, help='Number of distributions')
+    distributions_parser.add_argument('--years', type=float, default=3, help='History length the events are spread over')
+    distributions_parser.add_argument('--aid-mix', help="Aid type weights as type:weight pairs, e.g. 'food:5,medical:1' (default: {})".format(
+        ','.join(f"{aid_type}:{profile['weight']}" for aid_type, profile in AID_PROFILES.items())))
+    distributions_parser.add_argument('--seed', type=int, help='Seed; the same seed and individuals reproduce the same history, row ids included')
+    distributions_parser.add_argument('--chunk-size', type=int, default=10000, help='Number of rows buffered between output flushes')
+    
+    bench_parser = subparsers.add_parser('bench', help='Benchmark generation and submission against a local mock API (requires aiohttp for levels above 0)')
+    bench_parser.add_argument('-n', '--number', type=int, default=2000, help='Records generated and submitted per level')
+    bench_parser.add_argument('--levels', default='0,1,4,16,64', help='Comma-separated concurrency levels; 0 is the sequential requests path')
+    bench_parser.add_argument('-u', '--url', help='Benchmark against this API instead of the built-in mock server')
+    bench_parser.add_argument('--latency', type=float, default=5.0, help='Mock server latency per request in ms')
+    bench_parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of mock server requests answered with 503')
+    bench_parser.add_argument('--no-validate', action='store_true', help='Accept any JSON payload instead of checking the individual record shape')
+    bench_parser.add_argument('--seed', type=int, default=0, help='Seed of the generated records')
+    bench_parser.add_argument('-w', '--workers', type=int, default=1, help='Generation processes')
+    bench_parser.add_argument('-b', '--batch-size', type=int, default=1, help='Records per request')
+    bench_parser.add_argument('--max-retries', type=int, default=3, help='Retries for failed requests')
+    bench_parser.add_argument('-o', '--report', help='Write the report to this file, as CSV if it ends in .csv and JSON otherwise')
+    
+    search_parser = subparsers.add_parser('search', help="Replay the individuals list search (an ilike '%%term%%' over five columns) concurrently and report latency per term class")
+    search_parser.add_argument('-i', '--input', help='Dataset (NDJSON/JSON records or households rows, optionally compressed) the search terms are drawn from (default: sample the --dsn table)')
+    search_parser.add_argument('--dsn', help='Run the searches as SQL against this Postgres database')
+    search_parser.add_argument('-u', '--url', help='Run them through PostgREST instead, e.g. http://localhost:54321/rest/v1/individuals')
+    search_parser.add_argument('-t', '--token', help='JWT sent as the bearer token with --url')
+    search_parser.add_argument('--apikey', default=os.environ.get('SUPABASE_ANON_KEY'), help='Supabase apikey header with --url (default: $SUPABASE_ANON_KEY)')
+    search_parser.add_argument('-n', '--queries', type=int, default=1000, help='Number of searches to replay')
+    search_parser.add_argument('-c', '--concurrency', type=int, default=8, help='Searches in flight at once')
+    search_parser.add_argument('--mix', help="Term class weights as class:weight pairs, e.g. 'name_prefix:5,miss:1' (default: {})".format(
+        ','.join(f'{name}:{weight}' for name, weight in SEARCH_MIX.items())))
+    search_parser.add_argument('--limit', type=int, default=SEARCH_PAGE_SIZE, help='Rows per page, as the list requests')
+    search_parser.add_argument('--seed', type=int, default=0, help='Seed of the term sample')
+    search_parser.add_argument('--explain', action='store_true', help='With --dsn, first print the plan and execution time of one search per term class')
+    search_parser.add_argument('-o', '--report', help='Write the per-class results to this file, as CSV if it ends in .csv and JSON otherwise')
+    
+    churn_parser = subparsers.add_parser('churn', help='Run a mixed read/write workload (list pages, inserts, list moves, pending request submit/revise/approve) with concurrent virtual users')
+    churn_parser.add_argument('--dsn', help='Run against this Postgres database (default: an in-process stand-in)')
+    churn_parser.add_argument('-c', '--users', type=int, default=8, help='Concurrent virtual users, one connection each')
+    churn_parser.add_argument('-d', '--duration', type=float, default=30, help='Seconds to run')
+    churn_parser.add_argument('-n', '--operations', type=int, help='Stop after this many operations instead, if reached first')
+    churn_parser.add_argument('--mix', help="Operation weights as operation:weight pairs, e.g. 'move:5,approve:5' (default: {})".format(
+        ','.join(f'{name}:{weight}' for name, weight in CHURN_MIX.items())))
+    churn_parser.add_argument('--think', type=float, default=0.0, help='Mean think time between a user\'s operations in ms')
+    churn_parser.add_argument('--hot-rows', type=int, default=0, help='Move only among the N newest individuals, to provoke lock contention (default: all)')
+    churn_parser.add_argument('--queue-window', type=int, default=10, help='Approvals pick among the N oldest pending requests')
+    churn_parser.add_argument('--lock-timeout', type=float, default=2000, help='Ms a row lock is waited for before the operation counts as lock_timeout (0 waits forever)')
+    churn_parser.add_argument('--user', help='auth.users id that submits and reviews requests with --dsn (default: the first one)')
+    churn_parser.add_argument('--latency', type=float, default=2.0, help='Stand-in time per statement in ms')
+    churn_parser.add_argument('--rows', type=int, default=1000, help='Individuals the stand-in starts with')
+    churn_parser.add_argument('--seed', type=int, help='Seed of the operation sequence and the inserted records (default: random, so reruns insert new id_numbers)')
+    churn_parser.add_argument('--schema', action='append', help='SQL schema file whose constraints the inserted records are conformed to (repeatable)')
+    churn_parser.add_argument('-o', '--report', help='Write the per-operation results to this file, as CSV if it ends in .csv and JSON otherwise')
+    
+    args = parser.parse_args()
+    if args.command == 'taken':
+        if bool(args.dsn) == bool(args.id_numbers or args.phones):
+            taken_parser.error('give either --dsn or --id-numbers/--phones')
+        if not 0 < args.error_rate < 1:
+            taken_parser.error('--error-rate must be between 0 and 1')
+        if args.dsn:
+            sources = {column: taken_column(args.dsn, column) for column in ("id_number", "phone")}
+        else:
+            sources = {name: taken_lines(path) for name, path in (("id_number", args.id_numbers), ("phone", args.phones)) if path}
+        counts = write_taken_filters(args.output, sources, args.error_rate)
+        print(f"Saved filters of {', '.join(f'{count} {name}s' for name, count in counts.items())} "
+              f"({os.path.getsize(args.output) / 2 ** 20:.1f} MiB) to {args.output}")
+        return
+    if args.command == 'churn':
+        try:
+            mix = parse_weights(args.mix) if args.mix else None
+        except ValueError as e:
+            churn_parser.error(f'--mix: {e}')
+        if mix and set(mix) - set(CHURN_MIX):
+            churn_parser.error(f"--mix: operations must be among {', '.join(CHURN_MIX)}")
+        if args.users < 1 or args.duration < 0 or (args.operations is not None and args.operations < 1):
+            churn_parser.error('--users and --operations must be positive and --duration non-negative')
+        if not args.duration and args.operations is None:
+            churn_parser.error('--duration 0 needs --operations')
+        seed = args.seed
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+            print(f"Using seed {seed}", file=sys.stderr)
+        state = ChurnState(seed, load_constraint_spec(args.schema), args.hot_rows, args.queue_window)
+        lock_timeout = args.lock_timeout / 1000
+        try:
+            if args.dsn:
+                user_id = open_churn_database(args.dsn, state, args.user)
+                new_session = partial(PostgresChurnSession, args.dsn, state, user_id, lock_timeout)
             else:
-                print(f"Failed to submit individual: {individual['first_name']} {individual['last_name']}")
+                store = MemoryChurnStore(state, args.rows, args.latency / 1000, lock_timeout)
+                new_session = lambda: store
+            state.wait_for_records()
+            print(f"Starting {args.users} virtual users on {len(state.individuals)} individuals and {len(state.pending)} pending requests")
+            results, elapsed = run_churn(new_session, args.users, mix, args.duration, args.operations, seed, args.think / 1000)
+        finally:
+            state.close()
+        rows = summarize_churn(results, elapsed)
+        print_churn_report(rows, elapsed, args.users)
+        if args.report:
+            write_benchmark_report(args.report, rows, CHURN_REPORT_COLUMNS)
+            print(f"Saved churn report to {args.report}")
+        return
+    if args.command == 'search':
+        if bool(args.dsn) == bool(args.url):
+            search_parser.error('give exactly one of --dsn or --url')
+        if not args.input and not args.dsn:
+            search_parser.error('--input is required with --url')
+        if args.explain and not args.dsn:
+            search_parser.error('--explain needs --dsn')
+        if args.queries < 1 or args.concurrency < 1:
+            search_parser.error('--queries and --concurrency must be positive')
+        try:
+            mix = parse_weights(args.mix) if args.mix else None
+        except ValueError as e:
+            search_parser.error(f'--mix: {e}')
+        if mix and set(mix) - set(SEARCH_MIX):
+            search_parser.error(f"--mix: term classes must be among {', '.join(SEARCH_MIX)}")
+        sources = read_search_sources(args.input, None if args.input else args.dsn, seed=args.seed)
+        if not sources:
+            raise SystemExit("No individuals found to draw search terms from")
+        terms = derive_search_terms(sources, args.queries, args.seed, mix)
+        if args.explain:
+            explain_searches(args.dsn, terms, args.limit)
+        started = time.perf_counter()
+        rows = summarize_searches(replay_searches(terms, args.dsn, args.url, args.token, args.apikey,
+                                                  args.concurrency, args.limit))
+        print_search_report(rows, time.perf_counter() - started)
+        if args.report:
+            write_benchmark_report(args.report, rows, SEARCH_REPORT_COLUMNS)
+            print(f"Saved search report to {args.report}")
+        return
+    if args.command == 'households':
+        try:
+            sizes = parse_weights(args.sizes, int) if args.sizes else HOUSEHOLD_SIZES
+        except ValueError as e:
+            households_parser.error(f'--sizes: {e}')
+        if min(sizes) < 1:
+            households_parser.error('--sizes: household sizes must be at least 1')
+        if args.workers < 1:
+            households_parser.error('--workers must be at least 1')
+        seed = args.seed
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+            print(f"Using seed {seed}", file=sys.stderr)
+        pool_path = ensure_pool_cache(args.pool_cache, fake.locales[0], seed, args.pool_size) if args.pool_cache else None
+        numbers = unique_numbers(args, seed, households_parser, "households")
+        rows = generate_households(args.number, seed, sizes, load_constraint_spec(args.schema), args.workers, pool_path=pool_path, numbers=numbers)
+        with RecordWriter(args.output, 'ndjson', chunk_size=args.chunk_size) as writer:
+            for _ in writer.tee(rows):
+                pass
+        print(f"Saved {args.number} households ({writer.count} rows) to {args.output}", file=sys.stderr if args.output == '-' else sys.stdout)
+        return
+    if args.command == 'distributions':
+        if bool(args.individuals) == bool(args.dsn):
+            distributions_parser.error('give exactly one of --individuals or --dsn')
+        try:
+            aid_mix = parse_weights(args.aid_mix) if args.aid_mix else None
+        except ValueError as e:
+            distributions_parser.error(f'--aid-mix: {e}')
+        if aid_mix and set(aid_mix) - set(AID_PROFILES):
+            distributions_parser.error(f"--aid-mix: aid types must be among {', '.join(AID_PROFILES)}")
+        if args.events < 0 or args.years <= 0:
+            distributions_parser.error('--events must be non-negative and --years positive')
+        individual_ids = read_individual_ids(args.individuals, args.dsn)
+        seed = args.seed
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+            print(f"Using seed {seed}", file=sys.stderr)
+        if not individual_ids:
+            raise SystemExit("No individuals found to receive distributions")
+        with RecordWriter(args.output, 'ndjson', chunk_size=args.chunk_size) as writer:
+            for _ in writer.tee(generate_distributions(individual_ids, args.events, args.years, seed, aid_mix)):
+                pass
+        print(f"Saved {args.events} distributions ({writer.count - args.events} recipients) for {len(individual_ids)} individuals to {args.output}",
+              file=sys.stderr if args.output == '-' else sys.stdout)
+        return
+    if args.command == 'bench':
+        try:
+            levels = [int(level) for level in args.levels.split(',')]
+        except ValueError:
+            bench_parser.error('--levels must be comma-separated integers')
+        if any(level < 0 for level in levels) or args.number < 1 or args.workers < 1 or args.batch_size < 1:
+            bench_parser.error('--levels must be non-negative and --number, --workers and --batch-size positive')
+        rows = run_benchmark(args.number, levels, args.url, args.seed, args.workers, args.batch_size,
+                             args.max_retries, args.latency / 1000, args.error_rate, not args.no_validate)
+        print_benchmark_report(rows)
+        if args.report:
+            write_benchmark_report(args.report, rows)
+            print(f"Saved benchmark report to {args.report}")
+        return
+    if args.command == 'load':
+        if not args.dsn:
+            load_parser.error('--dsn or $DATABASE_URL is required')
+        records = read_records(args.input)
+        stats = {"invalid": 0}
+        if args.strict:
+            records = filter_valid(records, load_constraint_spec(args.schema), stats)
+        load_records(records, args.dsn, args.batch_size, args.created_by)
+        if stats["invalid"]:
+            print(f"Skipped {stats['invalid']} records that fail the schema constraints")
+        return
+    if args.number < 1:
+        parser.error('--number must be at least 1')
+    if args.profile:
+        if args.submit or args.output or args.input or args.backend == 'columnar':
+            parser.error('--profile only generates records; drop --submit, --output, --input and --backend columnar')
+        pool_path = None
+        if args.pool_cache:
+            pool_path = ensure_pool_cache(args.pool_cache, fake.locales[0], args.seed or 0, args.pool_size)
+        stats, totals = profile_generation(args.number, args.seed or 0, pool_path, args.profile_allocations)
+        print_profile(stats, totals)
+        if args.profile_stacks:
+            write_collapsed_stacks(args.profile_stacks, stats, totals)
+            print(f"Saved collapsed stacks to {args.profile_stacks}")
+        return
+    if args.profile_stacks or not args.profile_allocations:
+        parser.error('--profile-stacks and --no-profile-allocations need --profile')
+    if args.concurrency is not None and args.concurrency < 1:
+        parser.error('--concurrency must be at least 1')
+    if args.workers is not None and args.workers < 1:
+        parser.error('--workers must be at least 1')
+    if args.batch_size < 1:
+        parser.error('--batch-size must be at least 1')
+    if args.adaptive and not args.concurrency:
+        parser.error('--adaptive needs --concurrency as its ceiling')
+    if args.concurrency and not args.submit:
+        parser.error('--concurrency and --adaptive only apply with --submit')
+    if args.output == '-' and args.submit:
+        parser.error('cannot --submit while streaming records to stdout; pipe them into a second run with -i - instead')
+    
+    output_format = args.format or (infer_format(args.output) if args.output else None)
+    pool_path = None
+    if args.pool_cache and not args.input:
+        pool_seed = args.seed if args.seed is not None else 0
+        pool_path = ensure_pool_cache(args.pool_cache, fake.locales[0], pool_seed, args.pool_size)
+    if args.backend == 'columnar':
+        if output_format not in ('parquet', 'arrow') or args.submit or args.input or args.strict:
+            parser.error('--backend columnar writes a .parquet or .arrow --output and cannot --submit, --strict or read --input')
+        if args.taken or args.unique_phones or args.id_seed is not None or args.id_offset:
+            parser.error('--taken, --unique-phones, --id-seed and --id-offset need --backend records')
+        seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+        rows = write_columnar(args.output, output_format, generate_columnar_batches(args.number, seed, args.batch_rows, args.pool_size, pool_path))
+        print(f"Saved {rows} individuals to {args.output}")
+        return
+    if output_format in ('parquet', 'arrow'):
+        parser.error(f'{output_format} output requires --backend columnar')
     
+    if args.input and (args.taken or args.unique_phones or args.id_seed is not None or args.id_offset):
+        parser.error('--taken, --unique-phones, --id-seed and --id-offset apply to generated records, not --input')
+    spec = load_constraint_spec(args.schema) if args.strict else None
+    stats = {"invalid": 0}
+    if args.input:
+        records = read_records(args.input)
+    elif args.workers or args.seed is not None:
+        seed = args.seed
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+            print(f"Using seed {seed}", file=sys.stderr)
+        records = generate_individuals_parallel(args.number, seed, args.workers or 1, spec=spec, pool_path=pool_path,
+                                                numbers=unique_numbers(args, seed, parser))
+    else:
+        records = generate_individuals(args.number, spec, pool_path, unique_numbers(args, random.randrange(2 ** 32), parser))
+    if spec is not None:
+        records = filter_valid(records, spec, stats)
+    
+    journal = None
+    if args.journal:
+        if not args.submit:
+            parser.error('--journal only applies with --submit')
+        if not args.input and args.seed is None:
+            print("Warning: without --seed or --input a rerun generates different records, so the journal cannot resume it", file=sys.stderr)
+        journal = SubmissionJournal(args.journal)
+        stats["skipped"] = 0
+        records = skip_acknowledged(records, journal, stats)
+    
+    writer = None
     if args.output:
-        with open(args.output, 'w', encoding='utf-8') as f:
-            json.dump(individuals, f, ensure_ascii=False, indent=2)
-        print(f"Saved {len(individuals)} individuals to {args.output}")
+        writer = RecordWriter(args.output, args.format, args.compress, args.chunk_size)
+        records = writer.tee(records)
     
-    if not args.submit and not args.output:
-        # If neither submit nor output, just print the first individual
-        print(json.dumps(individuals[0], ensure_ascii=False, indent=2))
+    try:
+        if args.submit:
+            headers = build_headers(args.token)
+            if args.concurrency:
+                latency_target = args.latency_target / 1000 if args.latency_target else None
+                asyncio.run(submit_individuals_async(records, args.url, headers, args.concurrency, journal,
+                                                     args.max_retries, args.rate, args.adaptive, latency_target,
+                                                     args.batch_size))
+            else:
+                submit_individuals(records, args.url, headers, journal, args.max_retries, args.rate, args.batch_size)
+        elif writer:
+            for _ in records:
+                pass
+        else:
+            # If neither submit nor output, just print the first individual (an empty --input prints nothing)
+            first = next(iter(records), None)
+            if first is not None:
+                print(json.dumps(first, ensure_ascii=False, indent=2, default=record_fields))
+    finally:
+        if writer:
+            writer.close()
+            print(f"Saved {writer.count} individuals to {args.output}", file=sys.stderr if args.output == '-' else sys.stdout)
+        if journal:
+            journal.close()
+            print(f"Skipped {stats['skipped']} records already acknowledged in {args.journal}")
+        if stats["invalid"]:
+            print(f"Dropped {stats['invalid']} records that fail the schema constraints", file=sys.stderr)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,412 @@
+"""Tests for generate_fake_individuals.py.
+
+Run with `python -m pytest -q` from the repository root; no database or API is needed.
+"""
+import asyncio
+import json
+import re
+import threading
+from itertools import repeat
+
+import pytest
+
+import generate_fake_individuals as gfi
+
+
+@pytest.fixture(scope="module")
+def spec():
+    return gfi.load_constraint_spec()
+
+
+@pytest.fixture(scope="module")
+def strict_records(spec):
+    return gfi.generate_shard(11, 0, 0, 60, spec)
+
+
+# ----- Record structs and their encodings -----
+
+def as_dicts(records):
+    return [gfi.decode_json(gfi.encode_json(record)) for record in records]
+
+
+def test_struct_encodes_like_the_equivalent_dict():
+    records = gfi.generate_shard(7, 0, 0, 20)
+    assert all(isinstance(record, gfi.Individual) for record in records)
+    for record, plain in zip(records, as_dicts(records)):
+        assert gfi.encode_json(record) == gfi.encode_json(plain)
+        assert gfi.record_encoder("msgpack")(record) == gfi.record_encoder("msgpack")(plain)
+        assert record["first_name"] == plain["first_name"] and record.get("missing") is None
+        assert list(record.keys()) == list(plain)
+
+
+@pytest.mark.parametrize("name", ["records.json", "records.ndjson", "records.msgpack", "records.ndjson.gz"])
+def test_written_records_read_back_as_dicts(tmp_path, name):
+    records = gfi.generate_shard(7, 0, 0, 25)
+    path = str(tmp_path / name)
+    with gfi.RecordWriter(path, chunk_size=10) as writer:
+        for record in records:
+            writer.write(record)
+    assert list(gfi.read_records(path)) == as_dicts(records)
+
+
+def test_struct_and_dict_files_are_identical(tmp_path):
+    records = gfi.generate_shard(7, 0, 0, 25)
+    for fmt in ("json", "ndjson", "msgpack"):
+        paths = []
+        for label, rows in (("struct", records), ("dict", as_dicts(records))):
+            path = tmp_path / f"{label}.{fmt}"
+            with gfi.RecordWriter(str(path)) as writer:
+                for row in rows:
+                    writer.write(row)
+            paths.append(path)
+        assert paths[0].read_bytes() == paths[1].read_bytes()
+
+
+def test_empty_json_array_round_trips(tmp_path):
+    path = str(tmp_path / "empty.json")
+    gfi.RecordWriter(path).close()
+    assert list(gfi.read_records(path)) == []
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_other_json_array_layouts_are_read(tmp_path, indent):
+    records = as_dicts(gfi.generate_shard(7, 0, 0, 5))
+    path = tmp_path / "records.json"
+    path.write_text(json.dumps(records, indent=indent))
+    assert list(gfi.read_records(str(path))) == records
+
+
+def test_json_arrays_from_record_writer_stream_line_by_line():
+    def lines():
+        yield b"[\n"
+        yield b'{"first_name": "a"},\n'
+        yield b'{"first_name": "b"},\n'
+        raise AssertionError("read past the record asked for")
+
+    records = gfi.iter_json_array(lines())
+    assert next(records) == {"first_name": "a"}
+    assert next(records) == {"first_name": "b"}
+
+
+# ----- Submission -----
+
+def test_async_submission_generates_records_off_the_event_loop(capsys):
+    pytest.importorskip("aiohttp")
+    server, url = gfi.start_mock_server(validate=False)
+    threads = []
+
+    def records():
+        for index in range(20):
+            threads.append(threading.current_thread())
+            yield {"first_name": "a", "last_name": "b", "id_number": str(index)}
+
+    try:
+        summary = asyncio.run(gfi.submit_individuals_async(records(), url, {}, 4))
+    finally:
+        server.shutdown()
+    assert summary["succeeded"] == 20
+    assert threading.main_thread() not in threads
+
+
+class FakeResponse:
+    def __init__(self, status, body=b""):
+        self.status_code = status
+        self.reason = "Conflict" if status == 409 else "OK"
+        self.content = body
+        self.headers = {}
+
+
+class FakeSession:
+    """Answers like PostgREST: a 409 with the SQLSTATE of the first bad record in the payload"""
+
+    def __init__(self, codes):
+        self.codes = codes
+        self.payloads = []
+
+    def post(self, url, data=None, headers=None):
+        payload = json.loads(data)
+        self.payloads.append(payload)
+        for record in payload if isinstance(payload, list) else [payload]:
+            code = self.codes.get(record["first_name"])
+            if code:
+                return FakeResponse(409, json.dumps({"code": code, "message": "conflict"}).encode())
+        return FakeResponse(201)
+
+
+def batch_of(*names):
+    return [{"first_name": name, "last_name": "Test", "id_number": str(index)} for index, name in enumerate(names)]
+
+
+def test_submit_individual_409_needs_a_unique_violation():
+    assert gfi.submit_individual(batch_of("dup")[0], "http://api", {"h": "1"}, FakeSession({"dup": "23505"})) == {
+        "already_exists": True}
+    assert gfi.submit_individual(batch_of("fk")[0], "http://api", {"h": "1"}, FakeSession({"fk": "23503"})) is None
+
+
+def test_submit_batch_stores_a_clean_batch_in_one_request():
+    session = FakeSession({})
+    assert gfi.submit_batch(batch_of("a", "b", "c", "d"), "http://api", {}, session) == [True] * 4
+    assert len(session.payloads) == 1
+
+
+def test_submit_batch_bisects_down_to_the_bad_record(capsys):
+    session = FakeSession({"fk": "23503"})
+    results = gfi.submit_batch(batch_of("a", "b", "c", "d", "e", "fk", "g", "h"), "http://api", {}, session)
+    assert results == [True, True, True, True, True, False, True, True]
+    # 8 -> 4 + 4 -> 2 + 2 -> 1 + 1: one request per level on the bad half, plus its clean siblings
+    assert len(session.payloads) == 7
+    assert "Failed to submit individual fk Test" in capsys.readouterr().out
+
+
+def test_submit_batch_counts_only_unique_violations_as_stored():
+    session = FakeSession({"dup": "23505", "fk": "23503"})
+    assert gfi.submit_batch(batch_of("dup", "a", "fk", "b"), "http://api", {}, session) == [True, True, False, True]
+
+
+def test_retry_after_zero_retries_at_once_and_is_counted(monkeypatch):
+    class BusySession:
+        def __init__(self):
+            self.calls = 0
+
+        def post(self, url, data=None, headers=None):
+            self.calls += 1
+            response = FakeResponse(503 if self.calls == 1 else 201)
+            response.headers = {"Retry-After": "0"}
+            return response
+
+    delays = []
+    monkeypatch.setattr(gfi.time, "sleep", delays.append)
+    counts = {"retries": 0}
+    response, error = gfi.post_with_retries(BusySession(), "http://api", {"a": 1}, {}, max_retries=3, counts=counts)
+    assert error is None and response.status_code == 201
+    assert delays == [0.0] and counts == {"retries": 1}
+
+
+def test_journal_keeps_the_last_outcome_per_id(tmp_path):
+    path = str(tmp_path / "journal.log")
+    with gfi.SubmissionJournal(path) as journal:
+        journal.record("1", True)
+        journal.record(2, True)
+        journal.record("2", False)
+        journal.record("3", False)
+        journal.record("3", True)
+    journal = gfi.SubmissionJournal(path)
+    journal.close()
+    assert [journal.is_acknowledged(id_number) for id_number in ("1", "2", "3", 2)] == [True, False, True, False]
+
+
+def test_journal_ignores_a_torn_last_line(tmp_path):
+    path = tmp_path / "journal.log"
+    # The last entry was cut off mid-id, so "4" was never fully recorded
+    path.write_text("ok\t1\nok\t2\nok\t4")
+    journal = gfi.SubmissionJournal(str(path))
+    journal.record("3", True)
+    journal.close()
+    assert journal.acknowledged == {"1", "2", "3"}
+    assert gfi.SubmissionJournal(str(path)).acknowledged == {"1", "2", "3"}
+
+
+def test_rerun_skips_acknowledged_records(tmp_path):
+    path = str(tmp_path / "journal.log")
+    with gfi.SubmissionJournal(path) as journal:
+        for id_number, ok in (("0", True), ("1", False), ("2", True)):
+            journal.record(id_number, ok)
+    stats = {"skipped": 0}
+    with gfi.SubmissionJournal(path) as journal:
+        remaining = list(gfi.skip_acknowledged(batch_of("a", "b", "c", "d"), journal, stats))
+    assert [record["id_number"] for record in remaining] == ["1", "3"]
+    assert stats == {"skipped": 2}
+
+
+# ----- UniqueNumbers and the taken filter -----
+
+def test_id_numbers_are_a_bijection_of_the_space():
+    streams = [gfi.UniqueNumbers(5, stream=stream) for stream in gfi.ID_STREAMS]
+    per_stream = 900 // len(streams)
+    values = [numbers.id_number(index, 3) for numbers in streams for index in range(per_stream)]
+    assert sorted(values) == list(range(100, 1000))
+    with pytest.raises(ValueError):
+        streams[0].id_number(per_stream, 3)
+
+
+def test_id_numbers_default_to_the_schema_width():
+    numbers = gfi.UniqueNumbers(5, stream="households")
+    assert {len(str(numbers.id_number(index))) for index in range(1000)} == {gfi.ID_NUMBER_DIGITS}
+    assert numbers.id_number(42) == gfi.sequence_id_number(42 * len(gfi.ID_STREAMS) + 1, 5)
+
+
+def test_offsets_draw_disjoint_values():
+    first = {gfi.UniqueNumbers(3).id_number(index) for index in range(0, 5000)}
+    second = {gfi.UniqueNumbers(3, offset=5000).id_number(index) for index in range(5000, 10000)}
+    assert len(first) == len(second) == 5000
+    assert not first & second
+
+
+def record_id_numbers(records):
+    for record in records:
+        if record.get("table", "individuals") == "individuals":
+            yield str(record["id_number"])
+        for member in record.get("additional_members") or []:
+            yield member["id_number"]
+
+
+def test_commands_sharing_a_seed_draw_disjoint_id_numbers(spec):
+    streams = {
+        "records": list(record_id_numbers(gfi.generate_shard(5, 0, 0, 50))),
+        "strict": list(record_id_numbers(gfi.generate_shard(5, 0, 0, 50, spec))),
+        "households": list(record_id_numbers(
+            gfi.generate_household_shard(5, 0, 0, 50, gfi.HOUSEHOLD_SIZES, spec))),
+        "churn": list(record_id_numbers(
+            gfi.generate_shard(5, 0, 0, 50, spec, numbers=gfi.UniqueNumbers(5, stream="churn")))),
+    }
+    for name, values in streams.items():
+        assert len(set(values)) == len(values), name
+    assert not set(streams["strict"]) & set(streams["households"])
+    assert not set(streams["records"]) & set(streams["households"])
+    assert not set(streams["strict"]) & set(streams["churn"])
+
+
+def test_plain_records_give_members_id_numbers():
+    records = gfi.generate_shard(5, 0, 0, 30)
+    members = [member for record in records for member in record["additional_members"]]
+    assert members and all(len(member["id_number"]) == gfi.ID_NUMBER_DIGITS for member in members)
+
+
+def test_phones_are_distinct_mobile_numbers():
+    numbers = gfi.UniqueNumbers(5)
+    phones = [numbers.phone(index) for index in range(5000)]
+    assert len(set(phones)) == len(phones)
+    assert all(re.fullmatch(r"01[0125]\d{8}", phone) for phone in phones)
+
+
+def test_taken_values_are_replaced_by_spares_nobody_else_draws(tmp_path):
+    # With a filter each position has 4 candidates, so 3-digit ids run to position 225
+    positions = [gfi.sequence_id_number(position, 9, 3) for position in range(900)]
+    indices = range(225 // len(gfi.ID_STREAMS))
+    primaries = [positions[index * len(gfi.ID_STREAMS)] for index in indices]
+    taken = set(primaries[::3])
+    path = str(tmp_path / "taken.bloom")
+    gfi.write_taken_filters(path, {"id_number": (len(taken), iter(taken))})
+    numbers = gfi.UniqueNumbers(9, taken_path=path)
+    drawn = [numbers.id_number(index, 3) for index in indices]
+    assert len(set(drawn)) == len(drawn)
+    assert not set(drawn) & taken
+    for index, value in enumerate(drawn):
+        if primaries[index] in taken:
+            # A spare, from the tail of the permutation that no position reaches
+            assert value in positions[225:]
+        else:
+            assert value == primaries[index]
+    with pytest.raises(ValueError):
+        numbers.id_number(-(-225 // len(gfi.ID_STREAMS)), 3)
+
+
+def test_bloom_filter_membership():
+    bloom = gfi.BloomFilter.sized(2000, 0.01)
+    members = [f"{n:014d}" for n in range(0, 20000, 10)]
+    for key in members:
+        bloom.add(key)
+    assert all(key in bloom for key in members)
+    others = [f"{n:014d}" for n in range(1, 20000, 2)]
+    false_positives = sum(key in bloom for key in others)
+    assert false_positives / len(others) < 0.03
+
+
+def test_taken_filter_file_round_trips(tmp_path):
+    path = str(tmp_path / "taken.bloom")
+    counts = gfi.write_taken_filters(path, {"id_number": (3, iter(["12345678901234", "", None])),
+                                            "phone": (1, iter(["010-1234 5678"]))})
+    assert counts == {"id_number": 1, "phone": 1}
+    filters = gfi.open_taken(path)
+    assert "12345678901234" in filters["id_number"]
+    assert "01012345678" in filters["phone"]
+
+
+def test_records_need_an_explicit_id_number():
+    with pytest.raises(TypeError):
+        gfi.generate_fake_individual()
+
+
+# ----- Load rows against the schema -----
+
+def test_load_columns_exist_in_the_schema(spec):
+    for table in ("individuals", "families", "family_members", "children"):
+        assert set(gfi.LOAD_COLUMNS[table]) <= set(spec[table]) | {"id"}, table
+
+
+def test_normalized_rows_fill_every_not_null_column(spec, strict_records):
+    created_by = "00000000-0000-0000-0000-000000000001"
+    tables = {table: 0 for table in gfi.LOAD_COLUMNS}
+    for record in strict_records:
+        assert not gfi.validate_individual(record, spec)
+        for table, rows in gfi.normalize_record(record, iter(()), created_by).items():
+            for row in rows:
+                tables[table] += 1
+                for column, value in zip(gfi.LOAD_COLUMNS[table], row):
+                    if spec.get(table, {}).get(column, {}).get("not_null"):
+                        assert value is not None, f"{table}.{column}"
+    assert tables["individuals"] and tables["children"] and tables["family_members"]
+
+
+def test_children_rows_need_created_by(spec, strict_records):
+    assert spec["children"]["created_by"]["not_null"]
+    record = next(record for record in strict_records if record["children"])
+    rows = gfi.normalize_record(record, iter(()))["children"]
+    assert all(row[gfi.CHILD_CREATED_BY] is None for row in rows)
+
+
+def test_only_spouses_are_linked_as_parents(strict_records):
+    for record in strict_records:
+        rows = gfi.normalize_record(record, iter(()))
+        spouses = sum(member["role"] == "spouse" for member in record["additional_members"])
+        linked = rows["family_members"]
+        assert len(linked) == (1 + spouses if rows["families"] else 0)
+        assert {role for _, _, role in linked} <= {"parent"}
+        assert len(rows["individuals"]) == 1 + len(record["additional_members"])
+
+
+def test_members_without_id_numbers_draw_from_the_given_ids():
+    record = gfi.decode_json(gfi.encode_json(gfi.generate_shard(5, 0, 0, 1)[0]))
+    record["additional_members"] = [{"name": "Sam Lee", "date_of_birth": "1970-01-01", "gender": "male",
+                                     "role": "sibling", "id_number": None}]
+    rows = gfi.normalize_record(record, repeat("12345678901234"))
+    assert rows["individuals"][1][gfi.LOAD_COLUMNS["individuals"].index("id_number")] == "12345678901234"
+
+
+def test_household_rows_fill_every_not_null_column(spec):
+    rows = gfi.generate_household_shard(3, 0, 0, 40, gfi.HOUSEHOLD_SIZES, spec)
+    roles = {}
+    for row in rows:
+        table = row["table"]
+        for column in gfi.LOAD_COLUMNS[table]:
+            if spec.get(table, {}).get(column, {}).get("not_null") and column != "created_by":
+                assert row.get(column) is not None, f"{table}.{column}"
+        if table == "family_members":
+            roles.setdefault(row["family_id"], []).append(row["role"])
+    assert all(family_roles == ["parent"] * len(family_roles) and len(family_roles) <= 2
+               for family_roles in roles.values())
+
+
+# ----- Churn -----
+
+def test_churn_state_stops_its_producer(spec):
+    state = gfi.ChurnState(1, spec)
+    try:
+        assert state.next_record()["id_number"]
+    finally:
+        state.close()
+    assert not state.producer.is_alive()
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_churn_records_fail_instead_of_blocking_once_the_producer_dies():
+    # An empty spec makes generate_shard fail in the worker process
+    state = gfi.ChurnState(1, {})
+    try:
+        state.producer.join(30)
+        with pytest.raises(RuntimeError):
+            state.next_record()
+        with pytest.raises(SystemExit):
+            state.wait_for_records()
+    finally:
+        state.close()
@@ -1,20 +1,35 @@
 #!/usr/bin/env python3
+import os
+import sys
+import json
 import time
+import queue
 import random
 import argparse
+import threading
+from contextlib import contextmanager
+from functools import partial
+from itertools import count, islice, repeat
+from urllib.parse import urlsplit
 from faker import Faker
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support.ui import Select, WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.keys import Keys
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
 
 # Initialize Faker
 fake = Faker()
 
+def log(message):
+    """Print a message, prefixed with the browser worker's name when several run"""
+    name = threading.current_thread().name
+    print(message if name == "MainThread" else f"[{name}] {message}", flush=True)
+
 def human_like_typing(element, text):
     """Type text with random delays between keystrokes to mimic human typing"""
     for char in text:
@@ -55,445 +70,1066 @@ def check_checkbox(checkbox_element, should_check=True):
         checkbox_element.click()
         human_like_delay()
 
-def wait_and_find_element(driver, by, value, timeout=10, description="element"):
-    """Wait for an element to be present and visible"""
-    try:
-        # Wait for element to be present
-        element = WebDriverWait(driver, timeout).until(
-            EC.presence_of_element_located((by, value))
-        )
-        # Wait for element to be visible
-        element = WebDriverWait(driver, timeout).until(
-            EC.visibility_of_element_located((by, value))
-        )
-        # Scroll element into view
-        driver.execute_script("arguments[0].scrollIntoView(true);", element)
-        time.sleep(0.5)  # Small delay after scrolling
-        return element
-    except Exception as e:
-        print(f"Could not find {description}: {str(e)}")
-        raise e
+# Sets the value of every named field (through the native setter, so React sees it) and
+# fires the input/change events React listens to, then ticks the checkboxes given as
+# [name, value] pairs (value null for a lone boolean checkbox). A select without the
+# value gets its first non-empty option. Returns the field names and checkboxes that
+# are not on the page.
+INJECT_FORM_SCRIPT = """
+const [values, checks] = arguments;
+const missing = [[], []];
+for (let [name, value] of Object.entries(values)) {
+    const element = document.querySelector(`[name="${CSS.escape(name)}"]`);
+    if (!element) { missing[0].push(name); continue; }
+    if (element instanceof HTMLSelectElement && ![...element.options].some(o => o.value === value)) {
+        const option = [...element.options].find(o => o.value);
+        if (option) value = option.value;
+    }
+    const prototype = element instanceof HTMLSelectElement ? HTMLSelectElement.prototype
+        : element instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(prototype, 'value').set.call(element, value);
+    element.dispatchEvent(new Event('input', {bubbles: true}));
+    element.dispatchEvent(new Event('change', {bubbles: true}));
+}
+for (const [name, value] of checks) {
+    const selector = `input[type="checkbox"][name="${CSS.escape(name)}"]` + (value === null ? '' : `[value="${CSS.escape(value)}"]`);
+    const element = document.querySelector(selector);
+    if (!element) { missing[1].push([name, value]); continue; }
+    if (!element.checked) element.click();
+}
+return missing;
+"""
 
-def fill_individual_form(driver, form_url, login_details):
-    """Fill out the individual form with fake data"""
-    try:
-        # Navigate to the form URL
-        print(f"Navigating to {form_url}...")
-        driver.get(form_url)
-        
-        # Wait for page to load completely
-        WebDriverWait(driver, 20).until(
-            lambda d: d.execute_script("return document.readyState") == "complete"
-        )
-        print("Page loaded completely")
+def checkbox_selector(name, value=None):
+    """CSS selector of the checkbox registered as `name`, with `value` for one of a group"""
+    selector = f'input[type="checkbox"][name="{name}"]'
+    return selector if value is None else f'{selector}[value="{value}"]'
 
-        # Handle login first
-        try:
-            print("Attempting to log in...")
-            
-            # Try different selectors for email field
-            email_selectors = [
-                (By.ID, "email"),
-                (By.NAME, "email"),
-                (By.CSS_SELECTOR, "input[type='email']"),
-                (By.XPATH, "//input[@placeholder='Email']"),
-                (By.XPATH, "//input[contains(@class, 'email')]")
-            ]
-            
-            email_field = None
-            for by, selector in email_selectors:
-                try:
-                    email_field = wait_and_find_element(
-                        driver, by, selector,
-                        timeout=5,
-                        description=f"email field using {by}={selector}"
-                    )
-                    print(f"Found email field using {by}={selector}")
-                    break
-                except:
-                    continue
-            
-            if not email_field:
-                raise Exception("Could not find email field with any selector")
-            
-            # Try different selectors for password field
-            password_selectors = [
-                (By.ID, "password"),
-                (By.NAME, "password"),
-                (By.CSS_SELECTOR, "input[type='password']"),
-                (By.XPATH, "//input[@placeholder='Password']"),
-                (By.XPATH, "//input[contains(@class, 'password')]")
-            ]
-            
-            password_field = None
-            for by, selector in password_selectors:
-                try:
-                    password_field = wait_and_find_element(
-                        driver, by, selector,
-                        timeout=5,
-                        description=f"password field using {by}={selector}"
-                    )
-                    print(f"Found password field using {by}={selector}")
-                    break
-                except:
-                    continue
-            
-            if not password_field:
-                raise Exception("Could not find password field with any selector")
-            
-            # Clear fields first
-            email_field.clear()
-            password_field.clear()
-            
-            # Type credentials
-            print("Entering email...")
-            human_like_typing(email_field, login_details['email'])
-            print("Entering password...")
-            human_like_typing(password_field, login_details['password'])
-            
-            # Try different selectors for login button
-            button_selectors = [
-                (By.XPATH, "//button[@type='submit']"),
-                (By.XPATH, "//button[contains(text(), 'Login')]"),
-                (By.XPATH, "//button[contains(text(), 'Sign in')]"),
-                (By.CSS_SELECTOR, "button[type='submit']"),
-                (By.XPATH, "//button[contains(@class, 'login')]"),
-                (By.XPATH, "//button[contains(@class, 'submit')]")
-            ]
-            
-            login_button = None
-            for by, selector in button_selectors:
-                try:
-                    login_button = wait_and_find_element(
-                        driver, by, selector,
-                        timeout=5,
-                        description=f"login button using {by}={selector}"
-                    )
-                    print(f"Found login button using {by}={selector}")
-                    break
-                except:
-                    continue
-            
-            if not login_button:
-                raise Exception("Could not find login button with any selector")
-            
-            print("Clicking login button...")
-            login_button.click()
-            
-            print("Login submitted, waiting for page to load...")
-            time.sleep(5)  # Wait longer for login to process
-            
-            # Navigate to the form URL again after successful login
-            print(f"Navigating to {form_url} after login...")
-            driver.get(form_url)
-            
-            # Wait for page to load after navigation
-            WebDriverWait(driver, 20).until(
-                lambda d: d.execute_script("return document.readyState") == "complete"
-            )
-            print("Page loaded after login")
-            
-        except Exception as e:
-            print(f"Login failed: {e}")
-            raise e
-        
-        # Wait specifically for the Add Individual button and click it
+class HumanInteraction:
+    """Types key by key and pauses between actions like a person (the original behaviour)"""
+    name = "human"
+
+    def type(self, element, text):
+        human_like_typing(element, text)
+
+    def select(self, driver, element, value):
+        select_dropdown_option(driver, element, value)
+
+    def check(self, element):
+        check_checkbox(element, True)
+
+    def pause(self, seconds):
+        """Think time between actions; page readiness is waited on separately through the wait layer"""
+        time.sleep(seconds)
+
+    def fill(self, driver, values, checks):
+        """Fill named fields (selects included) and tick the checkboxes given as (name, value) pairs"""
+        for name, value in values.items():
+            try:
+                element = driver.find_element(By.NAME, name)
+                if element.tag_name == "select":
+                    self.select(driver, element, value)
+                else:
+                    self.type(element, value)
+            except Exception:
+                log(f"Couldn't find {name} field")
+        for name, value in checks:
+            try:
+                self.check(driver.find_element(By.CSS_SELECTOR, checkbox_selector(name, value)))
+            except Exception:
+                log(f"Couldn't find checkbox for {value or name}")
+
+class FastInteraction(HumanInteraction):
+    """Sends whole strings and selects options directly, without think time"""
+    name = "fast"
+
+    def type(self, element, text):
+        element.send_keys(text)
+
+    def select(self, driver, element, value):
+        select = Select(element)
         try:
-            print("Looking for Add Individual button...")
-            # Try multiple possible button locators
-            button_xpaths = [
-                "//button[contains(text(), 'Add Individual')]",
-                "//button[contains(., 'Add Individual')]",
-                "//button[contains(@class, 'add')]",
-                "//button[.//span[contains(text(), 'Add Individual')]]",
-                "//button[contains(@title, 'Add Individual')]",
-                "//a[contains(text(), 'Add Individual')]",
-                "//div[contains(@class, 'button') and contains(text(), 'Add Individual')]",
-                "//button[contains(@class, 'add-individual')]"
-            ]
-            
-            add_button = None
-            for xpath in button_xpaths:
-                try:
-                    add_button = wait_and_find_element(
-                        driver, By.XPATH, xpath,
-                        timeout=10,
-                        description=f"Add Individual button using {xpath}"
-                    )
+            select.select_by_value(value)
+        except NoSuchElementException:
+            # Same fallback as select_dropdown_option: the first non-empty option
+            for option in select.options:
+                if option.get_attribute("value"):
+                    option.click()
                     break
-                except:
-                    continue
-            
-            if add_button is None:
-                # Try to print all buttons on the page to help debug
-                print("\nListing all buttons found on the page:")
-                buttons = driver.find_elements(By.TAG_NAME, "button")
-                for btn in buttons:
-                    try:
-                        print(f"Button text: '{btn.text}', class: '{btn.get_attribute('class')}', type: '{btn.get_attribute('type')}'")
-                    except:
-                        pass
-                raise Exception("Could not find Add Individual button with any selector")
-                
-            print("Found Add Individual button, clicking...")
-            add_button.click()
-            print("Clicked Add Individual button")
-            time.sleep(2)  # Wait for form to open
-            
-        except Exception as e:
-            print(f"Error with Add Individual button: {e}")
-            raise e
 
-        # ----- Fill Personal Information -----
-        # First Name
-        first_name = fake.first_name()
+    def check(self, element):
+        if not element.is_selected():
+            element.click()
+
+    def pause(self, seconds):
+        pass
+
+class InjectInteraction(FastInteraction):
+    """Sets all fields in one script call that fires the events React-controlled inputs listen to"""
+    name = "inject"
+
+    def fill(self, driver, values, checks):
+        missing_fields, missing_checks = driver.execute_script(INJECT_FORM_SCRIPT, values, checks)
+        if missing_fields or missing_checks:
+            # Fields rendered in response to earlier values (salary after employment_status) need a re-render first
+            try:
+                WebDriverWait(driver, 1).until(lambda d: all(d.find_elements(By.NAME, name) for name in missing_fields))
+            except TimeoutException:
+                pass
+            missing_fields, missing_checks = driver.execute_script(
+                INJECT_FORM_SCRIPT, {name: values[name] for name in missing_fields}, missing_checks)
+        for name in missing_fields:
+            log(f"Couldn't find {name} field")
+        for name, value in missing_checks:
+            log(f"Couldn't find checkbox for {value or name}")
+
+INTERACTIONS = {profile.name: profile for profile in (HumanInteraction(), FastInteraction(), InjectInteraction())}
+
+# id_numbers of drawn records, from a UniqueNumbers permutation shared by the browsers
+_drawn_id_numbers = None
+_drawn_id_numbers_lock = threading.Lock()
+
+def next_id_number():
+    """The next id_number for a drawn record; distinct for every call in the run"""
+    global _drawn_id_numbers
+    with _drawn_id_numbers_lock:
+        if _drawn_id_numbers is None:
+            from generate_fake_individuals import UniqueNumbers
+            numbers = UniqueNumbers(random.randrange(2 ** 32))
+            _drawn_id_numbers = (str(numbers.id_number(index)) for index in count())
+        return next(_drawn_id_numbers)
+
+def build_record():
+    """Draw a fake record shaped like generate_fake_individual()'s, for runs without --dataset"""
+    employment_status = random.choice(["no_salary", "with_salary", "social_support"])
+    medical_options = ["Medical Checkup", "Lab Tests", "X-rays/Scans", "Surgeries"]
+    appliances = ["Stove", "Manual Washing Machine", "Automatic Washing Machine", "Refrigerator", "Fan"]
+    return {
+        "first_name": fake.first_name(),
+        "last_name": fake.last_name(),
+        "id_number": next_id_number(),
+        "date_of_birth": fake.date_of_birth(minimum_age=18, maximum_age=80).strftime("%Y-%m-%d"),
+        "gender": random.choice(["male", "female"]),
+        "marital_status": random.choice(["single", "married", "widowed"]),
+        "phone": fake.phone_number(),
+        "district": fake.city(),
+        "address": fake.address(),
+        "description": fake.text(max_nb_chars=100),
+        "job": fake.job(),
+        "employment_status": employment_status,
+        # Salary only if has salary
+        "salary": random.randint(500, 5000) if employment_status == "with_salary" else None,
+        "medical_help": {
+            "type_of_medical_assistance_needed": [option for option in medical_options if random.choice([True, False])],
+            "additional_details": fake.text(max_nb_chars=50),
+        },
+        "shelter_assistance": {
+            "type_of_housing": random.choice(["Owned", "New Rental", "Old Rental", ""]),
+            "housing_condition": random.choice(["Healthy", "Moderate", "Unhealthy", ""]),
+            "number_of_rooms": random.randint(1, 5),
+            "household_appliances": [option for option in appliances if random.choice([True, False])],
+        },
+    }
+
+# Dataset values whose form option or checkbox value differs, per field; None marks
+# values the form has no option for
+FORM_VALUES = {
+    "employment_status": {"with_salary": "has_salary"},
+    "medical_help.type_of_medical_assistance_needed": {
+        "Medical Checkup": "medicalCheckup", "Lab Tests": "labTests", "X-rays/Scans": "xraysAndScans",
+        "Surgeries": "surgeries",
+    },
+    "medical_help.medication_distribution_frequency": {"Monthly": "monthly", "Intermittent": "intermittent"},
+    "medical_help.estimated_cost_of_treatment": {"Able": "able", "Unable": "unable", "Partially": "partially"},
+    "food_assistance.type_of_food_assistance_needed": {"Ready-made meals": "readyMeals", "Non-ready meals": "nonReadyMeals"},
+    "education_assistance.family_education_level": {
+        "Higher Education": "universityEducation", "Intermediate Education": "intermediateEducation",
+        "Literate": "primaryEducation", "Illiterate": "noEducation",
+    },
+    "education_assistance.children_educational_needs": {
+        "Tuition Fees": "tuitionFees", "School Uniforms": "uniforms", "Supplies": "supplies", "Books": None,
+        "Tutoring": None,
+    },
+    "shelter_assistance.household_appliances": {
+        "Stove": "stove", "Automatic Washing Machine": "automaticWashingMachine", "Refrigerator": "refrigerator",
+        "Manual Washing Machine": None, "Fan": None,
+    },
+}
+
+# Top-level fields of a record that are form inputs, and the assistance sections whose
+# fields are registered as "<section>.<field>"
+PERSON_FIELDS = ["first_name", "last_name", "id_number", "date_of_birth", "gender", "marital_status", "description",
+                 "phone", "district", "address", "new_family_name", "job", "employment_status", "salary"]
+ASSISTANCE_SECTIONS = ["medical_help", "food_assistance", "marriage_assistance", "debt_assistance",
+                       "education_assistance", "shelter_assistance"]
+# Checkboxes that reveal the rest of their section; its other fields are skipped while unticked
+SECTION_SWITCHES = {"marriage_assistance": "marriage_support_needed", "debt_assistance": "needs_debt_assistance"}
+CHILD_FIELDS = ["first_name", "last_name", "date_of_birth", "gender", "school_stage", "description"]
+MEMBER_FIELDS = ["name", "date_of_birth", "gender", "relation", "job_title", "phone_number"]
+
+def form_value(name, value):
+    """The form's value for a dataset value of field `name`"""
+    return FORM_VALUES.get(name, {}).get(value, value)
+
+def named_values(source, names):
+    """{name: form value as text} for the fields of `source` in `names` that have a value"""
+    return {name: str(form_value(name, source[name])) for name in names if source.get(name) not in (None, "")}
+
+def record_form_fields(record):
+    """Turn a dataset record into ({field name: value}, [(checkbox name, value or None)])"""
+    values = named_values(record, PERSON_FIELDS)
+    if record.get("children") and "new_family_name" not in values:
+        # The form only accepts children with a family; start one named after the individual
+        values["new_family_name"] = record["last_name"]
+    checks = []
+    for section in ASSISTANCE_SECTIONS:
+        fields = record.get(section) or {}
+        switch = SECTION_SWITCHES.get(section)
+        if switch and not fields.get(switch):
+            continue
+        for field, value in fields.items():
+            name = f"{section}.{field}"
+            if isinstance(value, bool):
+                if value:
+                    checks.append((name, None))
+            elif isinstance(value, list):
+                checks.extend((name, option) for option in map(partial(form_value, name), value) if option)
+            elif value not in (None, ""):
+                values[name] = str(form_value(name, value))
+    return values, checks
+
+# Candidate locators for elements whose markup differs between app versions, in order of preference
+EMAIL_LOCATORS = [
+    (By.ID, "email"),
+    (By.NAME, "email"),
+    (By.CSS_SELECTOR, "input[type='email']"),
+    (By.XPATH, "//input[@placeholder='Email']"),
+    (By.XPATH, "//input[contains(@class, 'email')]")
+]
+PASSWORD_LOCATORS = [
+    (By.ID, "password"),
+    (By.NAME, "password"),
+    (By.CSS_SELECTOR, "input[type='password']"),
+    (By.XPATH, "//input[@placeholder='Password']"),
+    (By.XPATH, "//input[contains(@class, 'password')]")
+]
+LOGIN_BUTTON_LOCATORS = [
+    (By.XPATH, "//button[@type='submit']"),
+    (By.XPATH, "//button[contains(text(), 'Login')]"),
+    (By.XPATH, "//button[contains(text(), 'Sign in')]"),
+    (By.CSS_SELECTOR, "button[type='submit']"),
+    (By.XPATH, "//button[contains(@class, 'login')]"),
+    (By.XPATH, "//button[contains(@class, 'submit')]")
+]
+ADD_INDIVIDUAL_LOCATORS = [(By.XPATH, xpath) for xpath in [
+    "//button[contains(text(), 'Add Individual')]",
+    "//button[contains(., 'Add Individual')]",
+    "//button[contains(@class, 'add')]",
+    "//button[.//span[contains(text(), 'Add Individual')]]",
+    "//button[contains(@title, 'Add Individual')]",
+    "//a[contains(text(), 'Add Individual')]",
+    "//div[contains(@class, 'button') and contains(text(), 'Add Individual')]",
+    "//button[contains(@class, 'add-individual')]"
+]]
+
+# Checks every candidate in one round trip and returns 1 + the index of the first one
+# matching a rendered element, or 0 if none does yet
+RACE_LOCATORS_SCRIPT = """
+const candidates = arguments[0];
+for (let i = 0; i < candidates.length; i++) {
+    const [kind, selector] = candidates[i];
+    let element = null;
+    try {
+        element = kind === 'xpath'
+            ? document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue
+            : document.querySelector(selector);
+    } catch (e) {}
+    if (element && element.getClientRects().length) return i + 1;
+}
+return 0;
+"""
+
+def script_locator(by, selector):
+    """Express a Selenium locator as a ['css' | 'xpath', selector] pair for RACE_LOCATORS_SCRIPT"""
+    if by == By.ID:
+        return ["css", f'[id="{selector}"]']
+    if by == By.NAME:
+        return ["css", f'[name="{selector}"]']
+    if by == By.CSS_SELECTOR:
+        return ["css", selector]
+    if by == By.XPATH:
+        return ["xpath", selector]
+    raise ValueError(f"Unsupported locator strategy {by}")
+
+class LocatorCache:
+    """Remembers which candidate locator found each element, per page path.
+
+    Candidates are raced: every poll checks all of them in one script call,
+    the remembered winner first, so a miss costs one timeout instead of one
+    per candidate. With a `path` the winners persist between runs as JSON.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self.entries = json.load(f)
+            except ValueError:
+                log(f"Ignoring unreadable selector cache {path}")
+
+    def find(self, driver, name, candidates, timeout=10, poll=0.1):
+        """Return the first rendered element any candidate matches, raising NoSuchElementException after `timeout`"""
+        page = urlsplit(driver.current_url).path or "/"
+        with self.lock:
+            cached = self.entries.get(page, {}).get(name)
+        cached = tuple(cached) if cached else None
+        ordered = [cached] + [c for c in candidates if tuple(c) != cached] if cached else list(candidates)
+        script_locators = [script_locator(by, selector) for by, selector in ordered]
         try:
-            first_name_field = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.NAME, "first_name"))
+            index = WebDriverWait(driver, timeout, poll_frequency=poll).until(
+                lambda d: d.execute_script(RACE_LOCATORS_SCRIPT, script_locators)
             )
-            human_like_typing(first_name_field, first_name)
-        except:
-            print("Couldn't find first name field")
-        
-        # Last Name
-        last_name = fake.last_name()
-        try:
-            last_name_field = driver.find_element(By.NAME, "last_name")
-            human_like_typing(last_name_field, last_name)
-        except:
-            print("Couldn't find last name field")
-        
-        # ID Number
-        try:
-            id_field = driver.find_element(By.NAME, "id_number")
-            human_like_typing(id_field, str(fake.unique.random_number(digits=10)))
-        except:
-            print("Couldn't find ID number field")
-        
-        # Date of Birth
-        try:
-            dob_field = driver.find_element(By.NAME, "date_of_birth")
-            dob = fake.date_of_birth(minimum_age=18, maximum_age=80).strftime("%Y-%m-%d")
-            human_like_typing(dob_field, dob)
-        except:
-            print("Couldn't find date of birth field")
-        
-        # Gender
-        gender = random.choice(["male", "female"])
-        try:
-            gender_select = driver.find_element(By.NAME, "gender")
-            select_dropdown_option(driver, gender_select, gender)
-        except:
-            print("Couldn't find gender field")
-        
-        # Marital Status
-        marital_status = random.choice(["single", "married", "widowed"])
-        try:
-            marital_select = driver.find_element(By.NAME, "marital_status")
-            select_dropdown_option(driver, marital_select, marital_status)
-        except:
-            print("Couldn't find marital status field")
-        
-        # ----- Fill Contact Information -----
-        # Phone
-        try:
-            phone_field = driver.find_element(By.NAME, "phone")
-            human_like_typing(phone_field, fake.phone_number())
-        except:
-            print("Couldn't find phone field")
-        
-        # District
-        try:
-            district_field = driver.find_element(By.NAME, "district")
-            human_like_typing(district_field, fake.city())
-        except:
-            print("Couldn't find district field")
+        except TimeoutException:
+            raise NoSuchElementException(f"No candidate locator found the {name} on {page}")
+        by, selector = ordered[index - 1]
+        if (by, selector) != cached:
+            if cached:
+                log(f"Cached locator for the {name} on {page} stopped matching")
+            log(f"Found {name} using {by}={selector}")
+            self.remember(page, name, by, selector)
+        return driver.find_element(by, selector)
+
+    def remember(self, page, name, by, selector):
+        with self.lock:
+            self.entries.setdefault(page, {})[name] = [by, selector]
+            if not self.path:
+                return
+            temporary = f"{self.path}.{threading.get_ident()}.tmp"
+            with open(temporary, 'w') as f:
+                json.dump(self.entries, f, indent=2)
+            os.replace(temporary, self.path)
+
+def find_with_locators(driver, locators, name, candidates, interaction=INTERACTIONS["human"], timeout=10):
+    """Find an element through the locator cache and scroll it into view"""
+    element = locators.find(driver, name, candidates, timeout)
+    driver.execute_script("arguments[0].scrollIntoView(true);", element)
+    interaction.pause(0.5)  # Small delay after scrolling
+    return element
+
+# True once supabase-js has stored a session in localStorage (key sb-<project>-auth-token)
+AUTH_TOKEN_SCRIPT = "return Object.keys(localStorage).some(key => /^sb-.*-auth-token$/.test(key));"
+
+# Finds a password field and the Add Individual button (shown only once authenticated)
+LOGIN_FORM = (By.CSS_SELECTOR, "input[type='password']")
+ADD_INDIVIDUAL_BUTTON = (By.XPATH, "//button[contains(., 'Add Individual')]")
+
+def is_authenticated(driver):
+    """The session token is stored and the login form is gone"""
+    return driver.execute_script(AUTH_TOKEN_SCRIPT) and not driver.find_elements(*LOGIN_FORM)
+
+def login_required(driver, timeout=20):
+    """Wait until the page shows either the login form or the app; True if it is the login form"""
+    try:
+        WebDriverWait(driver, timeout).until(
+            lambda d: d.find_elements(*LOGIN_FORM) or d.find_elements(*ADD_INDIVIDUAL_BUTTON)
+        )
+    except TimeoutException:
+        pass
+    return bool(driver.find_elements(*LOGIN_FORM))
+
+def log_in(driver, login_details, interaction=INTERACTIONS["human"], timeout=20, locators=None):
+    """Log in through the login form and wait until the app holds an authenticated session"""
+    locators = locators or LocatorCache()
+    try:
+        log("Attempting to log in...")
         
-        # Address
-        try:
-            address_field = driver.find_element(By.NAME, "address")
-            human_like_typing(address_field, fake.address())
-        except:
-            print("Couldn't find address field")
+        email_field = find_with_locators(driver, locators, "email field", EMAIL_LOCATORS, interaction)
+        password_field = find_with_locators(driver, locators, "password field", PASSWORD_LOCATORS, interaction)
         
-        # Description
-        try:
-            description_field = driver.find_element(By.NAME, "description")
-            human_like_typing(description_field, fake.text(max_nb_chars=100))
-        except:
-            print("Couldn't find description field")
+        # Clear fields first
+        email_field.clear()
+        password_field.clear()
         
-        # ----- Fill Employment Information -----
-        # Job
-        try:
-            job_field = driver.find_element(By.NAME, "job")
-            human_like_typing(job_field, fake.job())
-        except:
-            print("Couldn't find job field")
+        # Type credentials
+        log("Entering email...")
+        interaction.type(email_field, login_details['email'])
+        log("Entering password...")
+        interaction.type(password_field, login_details['password'])
         
-        # Employment Status
-        employment_status = random.choice(["no_salary", "with_salary", "social_support"])
-        try:
-            employment_select = driver.find_element(By.NAME, "employment_status")
-            select_dropdown_option(driver, employment_select, employment_status)
-        except:
-            print("Couldn't find employment status field")
+        login_button = find_with_locators(driver, locators, "login button", LOGIN_BUTTON_LOCATORS, interaction)
         
-        # Salary (only if has salary)
-        if employment_status == "with_salary":
-            try:
-                salary_field = driver.find_element(By.NAME, "salary")
-                human_like_typing(salary_field, str(random.randint(500, 5000)))
-            except:
-                print("Couldn't find salary field")
+        log("Clicking login button...")
+        login_button.click()
         
-        # ----- Fill Medical Help Section -----
-        # Check random medical help checkboxes
-        medical_options = ["Medical Checkup", "Lab Tests", "X-rays/Scans", "Surgeries"]
-        for option in medical_options:
-            if random.choice([True, False]):
-                try:
-                    xpath = f"//input[@value='{option}']"
-                    checkbox = driver.find_element(By.XPATH, xpath)
-                    check_checkbox(checkbox, True)
-                except:
-                    print(f"Couldn't find medical checkbox for {option}")
+        log("Login submitted, waiting for the session...")
+        WebDriverWait(driver, timeout).until(is_authenticated)
+        log("Logged in")
         
-        # Add additional medical details
+    except Exception as e:
+        log(f"Login failed: {e}")
+        raise e
+
+def save_session(driver, path):
+    """Save the Supabase localStorage entries and cookies of a logged-in browser for --session"""
+    session = {
+        "local_storage": driver.execute_script(
+            "return Object.fromEntries(Object.entries(localStorage).filter(([key]) => key.startsWith('sb-')));"
+        ),
+        "cookies": driver.get_cookies(),
+    }
+    temporary = f"{path}.{threading.get_ident()}.tmp"
+    # The file holds access and refresh tokens
+    with open(os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as f:
+        json.dump(session, f)
+    os.replace(temporary, path)
+
+def restore_session(driver, path, form_url):
+    """Put a saved session into the browser's storage for the form's origin; False if there is none"""
+    if not os.path.exists(path):
+        return False
+    with open(path) as f:
+        session = json.load(f)
+    parts = urlsplit(form_url)
+    # localStorage and cookies can only be set on a page of the app's origin
+    driver.get(f"{parts.scheme}://{parts.netloc}/")
+    for cookie in session.get("cookies", []):
         try:
-            med_details_field = driver.find_element(By.NAME, "medical_help.additional_details")
-            human_like_typing(med_details_field, fake.text(max_nb_chars=50))
-        except:
-            print("Couldn't find medical details field")
-        
-        # ----- Fill Shelter Assistance Section -----
-        # Type of Housing
-        housing_type = random.choice(["Owned", "New Rental", "Old Rental", ""])
+            driver.add_cookie(cookie)
+        except Exception as e:
+            log(f"Could not restore cookie {cookie.get('name')}: {e}")
+    driver.execute_script(
+        "for (const [key, value] of Object.entries(arguments[0])) localStorage.setItem(key, value);",
+        session.get("local_storage", {}),
+    )
+    log(f"Restored saved session from {path}")
+    return True
+
+# Counts in-flight fetch/XHR requests in window.__pendingRequests and stamps the last
+# start or finish in window.__lastRequestAt. Installed before the app's own scripts on
+# every page through CDP, or late by NETWORK_IDLE_SCRIPT when that is not available.
+NETWORK_TRACKER_SCRIPT = """
+if (window.__pendingRequests === undefined) {
+    window.__pendingRequests = 0;
+    window.__lastRequestAt = performance.now();
+    const started = () => { window.__pendingRequests++; window.__lastRequestAt = performance.now(); };
+    const finished = () => { window.__pendingRequests--; window.__lastRequestAt = performance.now(); };
+    const fetch = window.fetch;
+    window.fetch = function (...args) {
+        started();
+        return fetch.apply(this, args).finally(finished);
+    };
+    const send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function (...args) {
+        started();
+        this.addEventListener('loadend', finished, {once: true});
+        return send.apply(this, args);
+    };
+}
+"""
+
+# True once no request is in flight and none started or finished for arguments[0] ms
+NETWORK_IDLE_SCRIPT = NETWORK_TRACKER_SCRIPT + """
+return window.__pendingRequests === 0 && performance.now() - window.__lastRequestAt >= arguments[0];
+"""
+
+MODAL_FIELD = (By.NAME, "first_name")
+SAVE_BUTTON = (By.XPATH, "//button[contains(., 'Save Individual')]")
+
+# Toasts stay up for 5 seconds, so the ones already shown are marked before saving
+# and ignored by SAVE_OUTCOME_SCRIPT
+MARK_TOASTS_SCRIPT = "document.querySelectorAll('div.fixed.bg-green-50, div.fixed.bg-red-50').forEach(t => t.dataset.seen = '1');"
+
+# Returns [signal, detail] once the save has an outcome, else null: a new success toast
+# ('toast') or error toast ('error'), or, once the form has closed, a table row whose
+# id_number cell holds the submitted id_number ('row'); names are not unique, id_numbers are
+SAVE_OUTCOME_SCRIPT = """
+const [idNumber] = arguments;
+const toast = document.querySelector('div.fixed.bg-green-50:not([data-seen]), div.fixed.bg-red-50:not([data-seen])');
+if (toast) return toast.classList.contains('bg-green-50') ? ['toast', toast.innerText] : ['error', toast.innerText];
+if (document.getElementById('individualForm')) return null;
+for (const cell of document.querySelectorAll('tbody tr td')) {
+    if (cell.innerText.trim() === idNumber) return ['row', ''];
+}
+return null;
+"""
+
+def wait_for_network_idle(driver, quiet=0.3, timeout=10):
+    """Wait until no fetch/XHR has been in flight for `quiet` seconds; False on timeout"""
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            lambda d: d.execute_script(NETWORK_IDLE_SCRIPT, quiet * 1000)
+        )
+        return True
+    except TimeoutException:
+        log(f"Network still busy after {timeout}s")
+        return False
+
+def wait_for_page(driver, timeout=20):
+    """Wait for the document to load and the app's initial requests to settle"""
+    WebDriverWait(driver, timeout).until(
+        lambda d: d.execute_script("return document.readyState") == "complete"
+    )
+    wait_for_network_idle(driver, timeout=timeout)
+
+def wait_for_modal(driver, timeout=15):
+    """Wait until the Add Individual modal is open and its first field accepts input"""
+    try:
+        return WebDriverWait(driver, timeout).until(EC.element_to_be_clickable(MODAL_FIELD))
+    except TimeoutException:
+        raise Exception(f"The individual form did not open within {timeout}s")
+
+def wait_for_save(driver, values, timeout=20):
+    """Wait for proof that a submitted form was stored: (True, signal) or (False, reason)"""
+    try:
+        signal, detail = WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            lambda d: d.execute_script(SAVE_OUTCOME_SCRIPT, str(values["id_number"]))
+        )
+    except TimeoutException:
+        return False, f"no success toast or new row within {timeout}s"
+    if signal == "error":
+        return False, f"error toast: {detail.strip()}"
+    return True, signal
+
+# The individual form is a wizard: each step renders only its own fields
+NEXT_BUTTON = (By.XPATH, "//form[@id='individualForm']//button[normalize-space()='Next']")
+ADD_CHILD_BUTTON = (By.XPATH, "//form[@id='individualForm']//button[normalize-space()='Add Child']")
+ADD_ADULT_BUTTON = (By.XPATH, "//form[@id='individualForm']//button[normalize-space()='Add Adult']")
+MEMBER_ADD_BUTTON = (By.XPATH, "//div[contains(@class, 'bg-black')]//button[normalize-space()='Add']")
+FORM_STEPS = 6
+
+# Label of the step the wizard shows
+CURRENT_STEP_SCRIPT = "const step = document.querySelector('button[aria-current=\"step\"]'); return step ? step.innerText : '';"
+
+# Expands the collapsed assistance sections and, when arguments[0] is set, turns on the
+# "New Family" switch so new_family_name is rendered
+REVEAL_FIELDS_SCRIPT = """
+document.querySelectorAll('#individualForm button[aria-expanded="false"]').forEach(button => button.click());
+if (arguments[0]) {
+    const toggle = document.querySelector('#individualForm button[role="switch"][aria-checked="false"]');
+    if (toggle) toggle.click();
+}
+"""
+
+# Returns the field names and [name, value] checkboxes of arguments[0]/arguments[1] that are rendered
+RENDERED_FIELDS_SCRIPT = """
+const [names, checks] = arguments;
+const rendered = selector => { const element = document.querySelector(selector); return element && element.getClientRects().length > 0; };
+return [
+    names.filter(name => rendered(`[name="${CSS.escape(name)}"]`)),
+    checks.filter(([name, value]) => rendered(`input[type="checkbox"][name="${CSS.escape(name)}"]`
+        + (value === null ? '' : `[value="${CSS.escape(value)}"]`))),
+];
+"""
+
+def fill_step(driver, interaction, values, checks, passes=3):
+    """Fill the fields and checkboxes the current step renders, again for ones they reveal; return what is left"""
+    values, checks = dict(values), [list(check) for check in checks]
+    for _ in range(passes):
+        driver.execute_script(REVEAL_FIELDS_SCRIPT, "new_family_name" in values)
+        names, rendered_checks = driver.execute_script(RENDERED_FIELDS_SCRIPT, list(values), checks)
+        if not names and not rendered_checks:
+            break
+        interaction.fill(driver, {name: values.pop(name) for name in names}, [tuple(check) for check in rendered_checks])
+        checks = [check for check in checks if check not in rendered_checks]
+    return values, checks
+
+def next_step(driver, timeout=10):
+    """Click Next and wait for the wizard to move on, raising with the validation errors if it does not"""
+    current = driver.execute_script(CURRENT_STEP_SCRIPT)
+    WebDriverWait(driver, timeout).until(EC.element_to_be_clickable(NEXT_BUTTON)).click()
+    try:
+        WebDriverWait(driver, timeout).until(lambda d: d.execute_script(CURRENT_STEP_SCRIPT) != current)
+    except TimeoutException:
+        errors = [error.text for error in driver.find_elements(By.CSS_SELECTOR, "#individualForm [role='alert']")]
+        raise Exception(f"Could not leave the {current.strip()} step: {'; '.join(errors) or 'no error shown'}")
+
+def add_family_member(driver, interaction, opener, values, timeout=10):
+    """Open the Add Child or Add Adult modal, fill it and add the person to the form"""
+    driver.find_element(*opener).click()
+    WebDriverWait(driver, timeout).until(EC.element_to_be_clickable((By.NAME, next(iter(values)))))
+    fill_step(driver, interaction, values, [])
+    driver.find_element(*MEMBER_ADD_BUTTON).click()
+    try:
+        WebDriverWait(driver, timeout).until(EC.invisibility_of_element_located(MEMBER_ADD_BUTTON))
+    except TimeoutException:
+        raise Exception(f"The family member modal did not accept {', '.join(values.values())}")
+
+def fill_wizard(driver, interaction, record):
+    """Walk the form's steps filling every section of `record`, children and members included, up to Save"""
+    values, checks = record_form_fields(record)
+    people = [(ADD_CHILD_BUTTON, named_values(child, CHILD_FIELDS)) for child in record.get("children") or []]
+    people += [(ADD_ADULT_BUTTON, named_values(member, MEMBER_FIELDS)) for member in record.get("additional_members") or []]
+    for _ in range(FORM_STEPS):
+        values, checks = fill_step(driver, interaction, values, checks)
+        if people and driver.find_elements(*ADD_CHILD_BUTTON):
+            for opener, person in people:
+                add_family_member(driver, interaction, opener, person)
+            people = []
+        if driver.find_elements(*SAVE_BUTTON):
+            break
+        next_step(driver)
+    else:
+        raise Exception("The Save Individual button did not appear after the last step")
+    skipped = list(values) + [value or name for name, value in checks]
+    if skipped:
+        log(f"Not on the form: {', '.join(skipped)}")
+
+# Returns the page's Navigation Timing entry (once per document, after its load event) and
+# the Resource Timing entries since the last call, then clears the resource buffer, which
+# holds only 250 entries by default. Times are in ms from performance.timeOrigin.
+BROWSER_TIMING_SCRIPT = """
+const fields = entry => ({name: entry.name, type: entry.initiatorType || entry.entryType,
+    start: entry.startTime, duration: entry.duration, transfer: entry.transferSize || 0});
+let navigation = null;
+const entry = performance.getEntriesByType('navigation')[0];
+if (entry && entry.loadEventEnd > 0 && !window.__navigationReported) {
+    window.__navigationReported = true;
+    navigation = Object.assign(fields(entry), {ttfb: entry.responseStart,
+        dom_content_loaded: entry.domContentLoadedEventEnd, load: entry.loadEventEnd});
+}
+const resources = performance.getEntriesByType('resource').map(fields);
+performance.clearResourceTimings();
+return {origin: performance.timeOrigin, navigation, resources};
+"""
+
+class StepTimer:
+    """Records the steps of every form one browser fills, plus the page's own timings.
+
+    Steps, whole forms and the browser's navigation/resource entries become
+    events with an epoch start and a duration in microseconds for --trace.
+    `durations` keeps the seconds per step or browser metric for percentiles.
+    """
+
+    def __init__(self):
+        self.durations = {}
+        self.events = []
+        self.form = []
+        self.forms = 0
+        self.form_started = None
+
+    def record(self, kind, name, start, duration, **details):
+        self.events.append({
+            "type": kind,
+            "worker": threading.current_thread().name,
+            "form": self.forms + 1,
+            "name": name,
+            "start_us": round(start * 1e6),
+            "duration_us": round(duration * 1e6),
+            **details,
+        })
+
+    @contextmanager
+    def step(self, name):
+        if self.form_started is None:
+            self.form_started = time.time()
+        started_at = time.time()
+        started = time.perf_counter()
         try:
-            housing_select = driver.find_element(By.NAME, "shelter_assistance.type_of_housing")
-            select_dropdown_option(driver, housing_select, housing_type)
-        except:
-            print("Couldn't find housing type field")
-        
-        # Housing Condition
-        condition = random.choice(["Healthy", "Moderate", "Unhealthy", ""])
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.durations.setdefault(name, []).append(elapsed)
+            self.form.append((name, elapsed))
+            self.record("step", name, started_at, elapsed)
+
+    def capture_browser(self, driver):
+        """Record the Navigation and Resource Timing entries the page gathered since the last call"""
         try:
-            condition_select = driver.find_element(By.NAME, "shelter_assistance.housing_condition")
-            select_dropdown_option(driver, condition_select, condition)
-        except:
-            print("Couldn't find housing condition field")
+            timing = driver.execute_script(BROWSER_TIMING_SCRIPT)
+        except Exception as e:
+            log(f"Could not read browser timings: {e}")
+            return
+        if not timing:
+            return
+        origin = timing["origin"] / 1000
+        navigation = timing.get("navigation")
+        if navigation:
+            for metric in ("ttfb", "dom_content_loaded", "load"):
+                self.durations.setdefault(f"page {metric}", []).append(navigation[metric] / 1000)
+            self.record("navigation", navigation["name"], origin + navigation["start"] / 1000,
+                        navigation["duration"] / 1000, ttfb_ms=round(navigation["ttfb"], 1),
+                        dom_content_loaded_ms=round(navigation["dom_content_loaded"], 1),
+                        load_ms=round(navigation["load"], 1))
+        for entry in timing["resources"]:
+            # API calls (supabase fetches) are what the save and list steps wait on
+            kind = "api" if entry["type"] in ("fetch", "xmlhttprequest") else "asset"
+            self.durations.setdefault(f"{kind} request", []).append(entry["duration"] / 1000)
+            self.record("resource", entry["name"], origin + entry["start"] / 1000, entry["duration"] / 1000,
+                        initiator=entry["type"], transfer_bytes=entry["transfer"])
+
+    def end_form(self, saved=False):
+        """Record and log the form just finished and start a new one"""
+        if self.form:
+            elapsed = time.time() - self.form_started
+            self.durations.setdefault("form", []).append(elapsed)
+            self.record("form", f"form {self.forms + 1}", self.form_started, elapsed, saved=saved)
+            log("Steps: " + ", ".join(f"{name} {elapsed:.2f}s" for name, elapsed in self.form))
+        self.forms += 1
+        self.form = []
+        self.form_started = None
+
+def timing_summary(timers):
+    """Count and p50/p90/p95/p99/max in ms per step and browser metric, over the given timers"""
+    from generate_fake_individuals import percentile
+    durations = {}
+    for timer in timers:
+        for name, values in timer.durations.items():
+            durations.setdefault(name, []).extend(values)
+    summary = {}
+    for name, values in durations.items():
+        values = sorted(values)
+        summary[name] = {"count": len(values)}
+        for pct in (50, 90, 95, 99):
+            summary[name][f"p{pct}_ms"] = round(percentile(values, pct) * 1000, 1)
+        summary[name]["max_ms"] = round(values[-1] * 1000, 1)
+    return summary
+
+def write_trace(path, timers):
+    """Write every event and the percentile summary as JSON lines, or in Chrome trace format for a .json path"""
+    events = sorted((event for timer in timers for event in timer.events), key=lambda event: event["start_us"])
+    summary = timing_summary(timers)
+    with open(path, 'w') as f:
+        if not path.endswith(".json"):
+            for event in events:
+                f.write(json.dumps(event) + "\n")
+            for name, stats in summary.items():
+                f.write(json.dumps({"type": "summary", "name": name, **stats}) + "\n")
+            return
+        # Loads in chrome://tracing and Perfetto: one track per browser for the steps (pid 1)
+        # and one for what its page fetched (pid 2), so overlapping requests don't break the nesting
+        origin = events[0]["start_us"] if events else 0
+        threads = {}
+        trace = []
+        for event in events:
+            tid = threads.setdefault(event["worker"], len(threads) + 1)
+            details = {key: value for key, value in event.items()
+                       if key not in ("type", "worker", "name", "start_us", "duration_us")}
+            trace.append({"name": event["name"], "cat": event["type"], "ph": "X",
+                          "ts": event["start_us"] - origin, "dur": event["duration_us"],
+                          "pid": 2 if event["type"] in ("navigation", "resource") else 1, "tid": tid,
+                          "args": details})
+        for pid, process in ((1, "automation"), (2, "page")):
+            trace.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": process}})
+            for worker, tid in threads.items():
+                trace.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": worker}})
+        json.dump({"traceEvents": trace, "displayTimeUnit": "ms", "otherData": {"summary": summary}}, f)
+
+def fill_individual_form(driver, form_url, login_details, interaction=INTERACTIONS["human"], reload=True,
+                         session_path=None, locators=None, timer=None, record=None):
+    """Fill out the individual form with fake data using the given interaction profile.
+
+    The page is only reloaded if `reload` is set or the browser is elsewhere,
+    and the login form is only used when the app shows it. A fresh login is
+    saved to `session_path` if given. `locators` is the LocatorCache shared
+    by the browsers, `timer` a StepTimer recording each step. `record` is a
+    dataset record to enter (see record_form_fields); without one a fake
+    record is drawn. Returns True only once the app confirmed the save.
+    """
+    locators = locators or LocatorCache()
+    timer = timer or StepTimer()
+    try:
+        if reload or driver.current_url.rstrip('/') != form_url.rstrip('/'):
+            # Navigate to the form URL
+            log(f"Navigating to {form_url}...")
+            with timer.step("load"):
+                driver.get(form_url)
+                wait_for_page(driver)
+            log("Page loaded completely")
+
+        # Log in only when the app asks for it; later forms reuse the session
+        if login_required(driver):
+            with timer.step("login"):
+                log_in(driver, login_details, interaction, locators=locators)
+                if session_path:
+                    save_session(driver, session_path)
+                if driver.current_url.rstrip('/') != form_url.rstrip('/'):
+                    log(f"Navigating to {form_url} after login...")
+                    driver.get(form_url)
+                    wait_for_page(driver)
         
-        # Number of Rooms
+        # Wait specifically for the Add Individual button and click it
         try:
-            rooms_field = driver.find_element(By.NAME, "shelter_assistance.number_of_rooms")
-            human_like_typing(rooms_field, str(random.randint(1, 5)))
-        except:
-            print("Couldn't find number of rooms field")
-        
-        # Household Appliances
-        appliances = ["Stove", "Manual Washing Machine", "Automatic Washing Machine", "Refrigerator", "Fan"]
-        for appliance in appliances:
-            if random.choice([True, False]):
+            with timer.step("open"):
+                log("Looking for Add Individual button...")
                 try:
-                    xpath = f"//input[@value='{appliance}']"
-                    checkbox = driver.find_element(By.XPATH, xpath)
-                    check_checkbox(checkbox, True)
-                except:
-                    print(f"Couldn't find appliance checkbox for {appliance}")
-        
-        # ----- Scroll down to make sure Save button is visible -----
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        human_like_delay()
+                    add_button = find_with_locators(driver, locators, "Add Individual button", ADD_INDIVIDUAL_LOCATORS,
+                                                    interaction, timeout=15)
+                except NoSuchElementException:
+                    # Try to print all buttons on the page to help debug
+                    log("\nListing all buttons found on the page:")
+                    buttons = driver.find_elements(By.TAG_NAME, "button")
+                    for btn in buttons:
+                        try:
+                            log(f"Button text: '{btn.text}', class: '{btn.get_attribute('class')}', type: '{btn.get_attribute('type')}'")
+                        except:
+                            pass
+                    raise Exception("Could not find Add Individual button with any selector")
+                    
+                log("Found Add Individual button, clicking...")
+                add_button.click()
+                log("Clicked Add Individual button")
+                wait_for_modal(driver)
+            
+        except Exception as e:
+            log(f"Error with Add Individual button: {e}")
+            raise e
+
+        # ----- Fill the form -----
+        values = record or build_record()
+        with timer.step("fill"):
+            fill_wizard(driver, interaction, values)
+            
+            # ----- Scroll down to make sure Save button is visible -----
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            interaction.pause(random.uniform(0.5, 2))
         
         # ----- Click Save Individual button -----
+        saved = False
         try:
-            save_button = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Save Individual')]"))
-            )
+            save_button = WebDriverWait(driver, 10).until(EC.element_to_be_clickable(SAVE_BUTTON))
             
             # Scroll to the button to make sure it's in view
             driver.execute_script("arguments[0].scrollIntoView(true);", save_button)
-            time.sleep(1)
+            interaction.pause(1)
             
             # Click the button
-            save_button.click()
-            print(f"Submitted form for individual: {first_name} {last_name}")
-            
-            # Wait for submission to complete
-            time.sleep(3)
-            
-            return True
+            driver.execute_script(MARK_TOASTS_SCRIPT)
+            with timer.step("save"):
+                save_button.click()
+                log(f"Submitted form for individual: {values['first_name']} {values['last_name']}")
+                saved, signal = wait_for_save(driver, values)
         except Exception as e:
-            print(f"Couldn't click Save Individual button: {e}")
+            log(f"Couldn't click Save Individual button: {e}")
             return False
+        finally:
+            timer.capture_browser(driver)
+            timer.end_form(saved)
+
+        if saved:
+            log(f"Save confirmed by {signal}")
+        else:
+            log(f"Save not confirmed: {signal}")
+        return saved
     
     except Exception as e:
-        print(f"Error filling form: {e}")
+        log(f"Error filling form: {e}")
+        timer.capture_browser(driver)
+        timer.end_form()
         return False
 
-def main():
-    parser = argparse.ArgumentParser(description='Automate form filling')
-    parser.add_argument('--url', default='http://localhost:5173/individuals', help='URL of the form to fill')
-    parser.add_argument('--count', type=int, default=1, help='Number of forms to fill')
-    parser.add_argument('--email', default='admin@example.com', help='Login email')
-    parser.add_argument('--password', default='pass1234', help='Login password')
-    args = parser.parse_args()
-
-    # Configure Chrome options
+def create_driver(driver_path, headless=False):
+    """Start a Chrome WebDriver session"""
     chrome_options = Options()
     chrome_options.add_argument('--no-sandbox')
     chrome_options.add_argument('--disable-dev-shm-usage')
     chrome_options.add_argument('--ignore-certificate-errors')
     chrome_options.add_argument('--ignore-ssl-errors')
-    chrome_options.add_argument('--start-maximized')
     chrome_options.add_argument('--disable-web-security')
     chrome_options.add_argument('--allow-insecure-localhost')
+    if headless:
+        chrome_options.add_argument('--headless=new')
+        chrome_options.add_argument('--window-size=1920,1080')
+    else:
+        chrome_options.add_argument('--start-maximized')
     
     # Disable logging
     chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
     
-    try:
-        print("Initializing Chrome WebDriver...")
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        
-        # Set longer timeout for local development
-        driver.set_page_load_timeout(60)
-        
-        # Setup login details
-        login_details = {
-            'email': args.email,
-            'password': args.password
-        }
-        
-        successful_submissions = 0
-        for i in range(args.count):
-            print(f"\nFilling form {i + 1} of {args.count}...")
-            try:
-                if fill_individual_form(driver, args.url, login_details):
-                    successful_submissions += 1
-                    print(f"Successfully completed form {i + 1}")
-                time.sleep(2)  # Wait between submissions
-            except Exception as e:
-                print(f"Error filling form: {str(e)}")
-                continue
-
-        print(f"\nCompleted {successful_submissions} out of {args.count} submissions")
-        
-        # Keep the browser open and wait for user input
-        print("\nBrowser will remain open. Press Enter to close it...")
-        input()
+    driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+    # Set longer timeout for local development
+    driver.set_page_load_timeout(60)
+    # Count the app's requests from the first script on every page, for wait_for_network_idle
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": NETWORK_TRACKER_SCRIPT})
+    return driver
+
+class BrowserWorker(threading.Thread):
+    """One WebDriver session filling forms from a shared job queue until it runs out or is stopped"""
 
+    def __init__(self, number, jobs, stop, driver_path, args, login_details, locators):
+        super().__init__(name=f"browser-{number}")
+        self.locators = locators
+        self.jobs = jobs
+        self.stop = stop
+        self.driver_path = driver_path
+        self.args = args
+        self.login_details = login_details
+        self.driver = None
+        self.timer = StepTimer()
+        self.succeeded = 0
+        self.failed = 0
+        self.elapsed = 0.0
+
+    def run(self):
+        started = time.perf_counter()
+        try:
+            self.driver = create_driver(self.driver_path, self.args.headless)
+            if self.args.session:
+                restore_session(self.driver, self.args.session, self.args.url)
+            reload = True
+            while not self.stop.is_set():
+                try:
+                    job = self.jobs.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                if job is None:
+                    break
+                job, record = job
+                log(f"Filling form {job + 1}" + (f" of {self.args.count}..." if self.args.count else "..."))
+                try:
+                    saved = fill_individual_form(self.driver, self.args.url, self.login_details,
+                                                 INTERACTIONS[self.args.interaction], reload, self.args.session,
+                                                 self.locators, self.timer, record)
+                except Exception as e:
+                    saved = False
+                    log(f"Error filling form: {str(e)}")
+                if saved:
+                    self.succeeded += 1
+                    log(f"Successfully completed form {job + 1}")
+                else:
+                    self.failed += 1
+                # After a saved form the page is back on the list; after a failure start from a fresh load
+                reload = not saved
+                if self.args.pause:
+                    self.stop.wait(self.args.pause)
+        except Exception as e:
+            log(f"Fatal error: {str(e)}")
+        finally:
+            self.elapsed = time.perf_counter() - started
+            if self.driver and not self.args.keep_open:
+                try:
+                    self.driver.quit()
+                except Exception:
+                    pass
+
+    @property
+    def forms_per_minute(self):
+        return self.succeeded / self.elapsed * 60 if self.elapsed > 0 else 0.0
+
+def put_until_stopped(jobs, item, stop):
+    """Put `item` on the bounded job queue, giving up (False) once `stop` is set"""
+    while not stop.is_set():
+        try:
+            jobs.put(item, timeout=0.5)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def feed_jobs(jobs, records, stop, browsers):
+    """Queue (number, record) jobs as the browsers take them, then one None per browser to end"""
+    try:
+        for job in enumerate(records):
+            if not put_until_stopped(jobs, job, stop):
+                return
     except Exception as e:
-        print(f"Fatal error: {str(e)}")
+        log(f"Could not read the dataset: {e}")
+    for _ in range(browsers):
+        put_until_stopped(jobs, None, stop)
+
+def dataset_records(path):
+    """Individual records from a generate_fake_individuals.py output file, streamed; households rows are skipped"""
+    from generate_fake_individuals import read_records
+    return (record for record in read_records(path) if "table" not in record)
+
+def print_worker_report(workers, elapsed):
+    """Print forms/minute per browser and in total, then percentiles per step and browser metric"""
+    print("\nBrowser      saved  failed  forms/min")
+    for worker in workers:
+        print(f"{worker.name:<12}{worker.succeeded:>6}{worker.failed:>8}{worker.forms_per_minute:>11.1f}")
+    succeeded = sum(worker.succeeded for worker in workers)
+    failed = sum(worker.failed for worker in workers)
+    rate = succeeded / elapsed * 60 if elapsed > 0 else 0.0
+    print(f"{'total':<12}{succeeded:>6}{failed:>8}{rate:>11.1f}")
+    summary = timing_summary(worker.timer for worker in workers)
+    if summary:
+        print("\nStep                      count   p50 ms   p95 ms   p99 ms   max ms")
+        for name, stats in summary.items():
+            print(f"{name:<24}{stats['count']:>7}{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}"
+                  f"{stats['p99_ms']:>9.1f}{stats['max_ms']:>9.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Automate form filling')
+    parser.add_argument('--url', default='http://localhost:5173/individuals', help='URL of the form to fill')
+    parser.add_argument('--count', type=int, help='Number of forms to fill (default: 1, or every record of --dataset)')
+    parser.add_argument('--dataset', help="Records written by generate_fake_individuals.py (NDJSON or JSON, .gz/.zst, '-' for stdin) to fill the forms with, streamed; without it each form gets freshly drawn fake values")
+    parser.add_argument('--email', default='admin@example.com', help='Login email')
+    parser.add_argument('--password', default='pass1234', help='Login password')
+    parser.add_argument('--session', help='File holding a saved Supabase session (localStorage entries and cookies); restored into each browser and rewritten after a fresh login')
+    parser.add_argument('--selector-cache', help='JSON file remembering which fallback locator matched each element, per page, between runs')
+    parser.add_argument('--browsers', type=int, default=1, help='Number of browser sessions filling forms from a shared queue')
+    parser.add_argument('--headless', action='store_true', help='Run the browsers without a window')
+    parser.add_argument('--pause', type=float, help='Seconds each browser waits between submissions (default: 2 with --interaction human, otherwise 0)')
+    parser.add_argument('--interaction', choices=list(INTERACTIONS), default='human', help='human types key by key with pauses; fast sends whole values and only waits on page signals; inject sets all fields in one JavaScript call')
+    parser.add_argument('--trace', help='Write per-step and browser timing events with percentiles to this file: JSON lines, or Chrome trace format if it ends in .json')
+    parser.add_argument('--keep-open', action='store_true', help='Leave the browsers open at the end until Enter is pressed (default when a single visible browser runs from a terminal)')
+    args = parser.parse_args()
+    if args.browsers < 1:
+        parser.error('--browsers must be at least 1')
+    if args.count is None and not args.dataset:
+        args.count = 1
+    if args.pause is None:
+        args.pause = 2.0 if args.interaction == 'human' else 0.0
+    # Waiting on Enter only makes sense when someone is watching a single window
+    args.keep_open = args.keep_open or (args.browsers == 1 and not args.headless and sys.stdin.isatty())
+
+    # Setup login details
+    login_details = {
+        'email': args.email,
+        'password': args.password
+    }
+    
+    print("Initializing Chrome WebDriver...")
+    driver_path = ChromeDriverManager().install()
+    
+    records = dataset_records(args.dataset) if args.dataset else repeat(None)
+    if args.count is not None:
+        records = islice(records, args.count)
+    browsers = args.browsers if args.count is None else min(args.browsers, max(args.count, 1))
+    # Records are read ahead only as far as the browsers need them
+    jobs = queue.Queue(maxsize=2 * browsers)
+    stop = threading.Event()
+    locators = LocatorCache(args.selector_cache)
+    workers = [BrowserWorker(number, jobs, stop, driver_path, args, login_details, locators)
+               for number in range(1, browsers + 1)]
+    started = time.perf_counter()
+    threading.Thread(target=feed_jobs, args=(jobs, records, stop, browsers), name="dataset", daemon=True).start()
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            while worker.is_alive():
+                worker.join(0.5)
+    except KeyboardInterrupt:
+        print("\nInterrupted, letting the browsers finish their current form...")
+        stop.set()
+        for worker in workers:
+            worker.join()
+    elapsed = time.perf_counter() - started
+
+    succeeded = sum(worker.succeeded for worker in workers)
+    attempted = succeeded + sum(worker.failed for worker in workers)
+    print(f"\nCompleted {succeeded} out of {args.count or attempted} submissions")
+    print_worker_report(workers, elapsed)
+    if args.trace:
+        write_trace(args.trace, [worker.timer for worker in workers])
+        print(f"Wrote timing trace to {args.trace}")
+    
+    if args.keep_open:
+        # Keep the browser open and wait for user input
         print("\nBrowser will remain open. Press Enter to close it...")
-        input()
-    finally:
         try:
-            if 'driver' in locals():
-                driver.quit()
-        except:
+            input()
+        except EOFError:
             pass
+        for worker in workers:
+            try:
+                if worker.driver:
+                    worker.driver.quit()
+            except Exception:
+                pass
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file